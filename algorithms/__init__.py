@@ -3,4 +3,63 @@
 This package contains various algorithm implementations for
 factorial, fibonacci, and prime number calculations with different
 performance characteristics.
+
+Importing the package loads nothing else. Submodules and registered
+implementations are loaded on first attribute access, so
+``algorithms.fib_fast_doubling(100)`` imports only what that call needs.
 """
+
+# No typing import here: it alone takes several times longer to import
+# than the rest of the package
+import importlib
+import os
+
+_SUBMODULES = (
+    "batch",
+    "bench",
+    "cache",
+    "combinatorics",
+    "compare",
+    "complexity",
+    "differential",
+    "dispatch",
+    "factorial",
+    "fibonacci",
+    "golden",
+    "history",
+    "instrument",
+    "output",
+    "primes",
+    "profiling",
+    "registry",
+)
+
+
+def __getattr__(name: str) -> object:
+    """Load a submodule, or a registered implementation, on first use."""
+    if name in _SUBMODULES:
+        return importlib.import_module(f"algorithms.{name}")
+    if not name.startswith("_"):
+        from algorithms import registry
+
+        try:
+            impl = registry.get(name)
+        except KeyError:
+            pass
+        else:
+            return impl.resolve()
+    raise AttributeError(f"module 'algorithms' has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    """List the submodules and implementations along with the loaded names."""
+    from algorithms import registry
+
+    names = {impl.name for impl in registry.implementations()}
+    return sorted(set(globals()) | set(_SUBMODULES) | names)
+
+
+if os.environ.get("ALGORITHMS_INSTRUMENT"):
+    from algorithms import instrument
+
+    instrument.enable_from_env()
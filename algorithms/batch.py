@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Batch execution of a registered implementation over many arguments
+
+map() applies an implementation, named as in the registry, to every input
+on a pool of worker processes and streams the results back:
+
+    from algorithms import batch
+    flags = list(batch.map("is_prime_optimized", range(10**7)))
+
+Workers receive the module and function name rather than the function,
+so every registered implementation pickles cleanly, and an instrumented
+or otherwise wrapped function is resolved the same way in every worker.
+
+With chunksize="auto" the first inputs are run in this process until
+about a tenth of a second has passed. A batch that finishes in that time
+never pays for starting a pool; otherwise the measured cost per item sets
+the chunk size, aiming at chunks of about 50 ms.
+
+Chunks cross the process boundary in compact form: a range as its bounds,
+an array as its buffer, and results that are all booleans, or integers
+that fit in 64 bits, as byte buffers that are only turned back into
+Python objects as they are yielded. Anything else, such as the big
+integers of fib_iterative, travels as a list.
+"""
+import builtins
+import importlib
+import itertools
+import os
+import time
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from algorithms.registry import get
+
+# Inputs are run in this process for this long before a pool is started
+_SERIAL_SECONDS = 0.1
+
+# Auto-sized chunks aim to keep a worker busy for this long: long enough
+# to amortise the round trip, short enough to balance the load
+DEFAULT_CHUNK_SECONDS = 0.05
+
+_MAX_CHUNK = 1 << 18
+
+# Chunks queued per worker, which bounds the memory used by results that
+# wait for an earlier chunk
+_CHUNKS_PER_WORKER = 2
+
+# A chunk as sent between processes: ("range", (start, stop, step)), (an
+# array typecode such as "q", the array's bytes), ("?", one byte per boolean)
+# or ("", a list of arbitrary objects)
+Packed = Tuple[str, Any]
+
+
+def _pack(values: Union[List[Any], range, array]) -> Packed:
+    """Encode a chunk of values in the most compact form that holds them all."""
+    if isinstance(values, range):
+        return "range", (values.start, values.stop, values.step)
+    if isinstance(values, array):
+        return values.typecode, values.tobytes()
+    if all(type(v) is bool for v in values):
+        return "?", bytes(values)
+    try:
+        return "q", array("q", values).tobytes()
+    except (TypeError, OverflowError):
+        return "", values
+
+
+def _unpack(packed: Packed) -> Iterable[Any]:
+    """Decode a chunk encoded by _pack(), boxing values only as they are iterated."""
+    kind, payload = packed
+    if kind == "range":
+        return range(*payload)
+    if kind == "?":
+        return builtins.map(bool, payload)
+    if kind:
+        values = array(kind)
+        values.frombytes(payload)
+        return values
+    objects: List[Any] = payload
+    return objects
+
+
+def _run_chunk(module: str, name: str, packed: Packed) -> Packed:
+    """Worker task: apply module.name to every value of a packed chunk."""
+    func = getattr(importlib.import_module(module), name)
+    return _pack([func(value) for value in _unpack(packed)])
+
+
+def _chunks(values: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    """Split what is left of an iterator into lists of at most size values."""
+    while True:
+        chunk = list(itertools.islice(values, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map(
+    func_name: str,
+    inputs: Iterable[Any],
+    workers: Optional[int] = None,
+    chunksize: Union[int, str] = "auto",
+    ordered: bool = True,
+) -> Iterator[Any]:
+    """
+    Apply a registered implementation to every input on worker processes.
+
+    Inputs are consumed lazily, with at most a couple of chunks per worker
+    in flight, so a generator of any length can be streamed.
+
+    Args:
+        func_name: Registered implementation name, e.g. "is_prime_optimized"
+        inputs: Arguments to call it with; a range or an array is sliced
+            without boxing its values
+        workers: Number of worker processes (defaults to os.cpu_count())
+        chunksize: Inputs per task, or "auto" to size chunks from the
+            measured cost of the first inputs
+        ordered: Yield results in input order; otherwise yield
+            (index, result) pairs as chunks complete
+
+    Yields:
+        func(x) for every input x, or (index, func(x)) if not ordered
+
+    Raises:
+        KeyError: If no implementation has that name
+        ValueError: If workers or chunksize is invalid
+    """
+    impl = get(func_name)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Worker count must be positive")
+    if chunksize != "auto" and (not isinstance(chunksize, int) or chunksize < 1):
+        raise ValueError("Chunk size must be a positive integer or 'auto'")
+    return _map(impl.module, impl.name, inputs, workers, chunksize, ordered)
+
+
+def _map(
+    module: str,
+    name: str,
+    inputs: Iterable[Any],
+    workers: int,
+    chunksize: Union[int, str],
+    ordered: bool,
+) -> Iterator[Any]:
+    index = 0
+    values = iter(inputs)
+    if isinstance(chunksize, int):
+        size = chunksize
+    else:
+        func = getattr(importlib.import_module(module), name)
+        start = time.perf_counter()
+        elapsed = 0.0
+        for value in values:
+            result = func(value)
+            yield result if ordered else (index, result)
+            index += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= _SERIAL_SECONDS:
+                break
+        else:
+            return
+        size = max(1, min(_MAX_CHUNK, int(DEFAULT_CHUNK_SECONDS * index / elapsed)))
+
+    chunks: Iterator[Any]
+    if isinstance(inputs, (range, array)):
+        # Slices keep the compact form, so the values are never boxed here
+        chunks = (inputs[i : i + size] for i in range(index, len(inputs), size))
+    else:
+        chunks = _chunks(values, size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            if ordered:
+                yield from _ordered(pool, module, name, chunks, workers)
+            else:
+                yield from _unordered(pool, module, name, chunks, workers, index)
+        finally:
+            # Also reached when the caller stops iterating early
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _ordered(
+    pool: ProcessPoolExecutor, module: str, name: str, chunks: Iterator[Any], workers: int
+) -> Iterator[Any]:
+    pending: Deque[Future] = deque()
+    for chunk in itertools.chain(chunks, [None]):
+        if chunk is not None:
+            pending.append(pool.submit(_run_chunk, module, name, _pack(chunk)))
+        # Top up the queue before blocking on its oldest chunk
+        while pending and (chunk is None or len(pending) >= workers * _CHUNKS_PER_WORKER):
+            yield from _unpack(pending.popleft().result())
+
+
+def _unordered(
+    pool: ProcessPoolExecutor,
+    module: str,
+    name: str,
+    chunks: Iterator[Any],
+    workers: int,
+    index: int,
+) -> Iterator[Tuple[int, Any]]:
+    pending: Set[Future] = set()
+    starts = {}
+    for chunk in itertools.chain(chunks, [None]):
+        if chunk is not None:
+            future = pool.submit(_run_chunk, module, name, _pack(chunk))
+            starts[future] = index
+            index += len(chunk)
+            pending.add(future)
+        while pending and (chunk is None or len(pending) >= workers * _CHUNKS_PER_WORKER):
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from enumerate(_unpack(future.result()), start=starts.pop(future))
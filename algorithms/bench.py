@@ -0,0 +1,1143 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the registered implementations
+
+measure() times a function with time.perf_counter_ns. It makes warmup
+calls first, then picks enough loops per sample to stay well above the
+timer resolution and enough samples to fill a time budget. The garbage
+collector is paused while it runs. Each result reports the median,
+interquartile range and minimum. A run over the registry is reported as
+JSON together with the machine and commit it ran on.
+
+Run every registered implementation with:
+
+    python -m algorithms.bench [--problem fib] [--json results.json]
+
+and check every documented complexity (exit status 1 if one is exceeded)
+with:
+
+    python -m algorithms.bench --scaling
+
+--memory adds tracemalloc peaks, net allocations and the RSS growth of a
+fresh subprocess to the report. --memory-scaling fits peak memory against
+the declared space classes and projects the n at which each implementation
+reaches the 1G container limit (--plot draws the curves as SVG).
+
+--instrument-overhead times every implementation at its smallest size
+with algorithms.instrument off, on, and off again.
+"""
+import argparse
+import gc
+import html
+import importlib
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from algorithms import instrument
+from algorithms.complexity import DEFAULT_TOLERANCE, Fit, fit_complexity, format_fits
+from algorithms.registry import PROBLEMS, Implementation, get, implementations
+
+REPORT_VERSION = 1
+
+# Loops per sample are chosen so that a sample lasts at least this long,
+# which keeps timer resolution and loop overhead below 0.1% of a sample
+_MIN_SAMPLE_NS = 100_000
+
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_MIN_REPEAT = 5
+DEFAULT_MAX_REPEAT = 1000
+
+# An implementation whose single call takes longer than this many seconds
+# is not run at the larger sizes of the same problem
+DEFAULT_TIME_LIMIT = 1.0
+
+DEFAULT_SIZES: Dict[str, Sequence[int]] = {
+    "fib": (10, 1000, 100000),
+    "factorial": (10, 1000, 100000),
+    "primes": (1000, 100000, 1000000),
+    "is_prime": (10**3, 10**9, 10**18),
+}
+
+
+def geometric_sizes(lo: int, hi: int, per_decade: int = 2) -> List[int]:
+    """
+    Return sizes from lo to hi spaced evenly on a log scale.
+
+    Args:
+        lo: Smallest size
+        hi: Largest size
+        per_decade: Sizes per factor of ten
+
+    Returns:
+        Distinct rounded sizes in increasing order
+    """
+    steps = round(math.log10(hi / lo) * per_decade)
+    sizes = {round(lo * 10 ** (k / per_decade)) for k in range(steps + 1)}
+    return sorted(sizes)
+
+
+# Sizes of the scaling mode; fib starts low and dense enough to give the
+# exponential recursive version a few points below its limit of 30
+SCALING_SIZES: Dict[str, Sequence[int]] = {
+    "fib": geometric_sizes(10, 10**6, per_decade=5),
+    "factorial": geometric_sizes(100, 10**6),
+    "primes": geometric_sizes(1000, 10**7),
+    "is_prime": geometric_sizes(1000, 10**18),
+}
+
+# Timings below this are dominated by call overhead and left out of fits
+_SCALING_FLOOR_NS = 2_000
+
+# Containers are capped at 1G in docker-compose.yml
+DEFAULT_MEMORY_LIMIT = 1 << 30
+
+# Memory scaling stops growing n for an implementation past this traced
+# peak, or once a traced call (slowed down by tracemalloc) takes this long
+DEFAULT_MEMORY_CAP = 256 << 20
+DEFAULT_MEMORY_TIME_LIMIT = 10.0
+
+# Peaks below this are interpreter noise rather than the algorithm's footprint
+_MEMORY_FLOOR_BYTES = 64 << 10
+
+
+@dataclass
+class Measurement:
+    """
+    Timings of one function at one argument.
+
+    Attributes:
+        name: Implementation name
+        n: Argument the function was called with
+        loops: Calls per timed sample
+        samples: Time per call of each sample, in nanoseconds
+        problem: Registry problem, if the function is registered
+    """
+
+    name: str
+    n: int
+    loops: int
+    samples: List[float] = field(repr=False)
+    problem: str = ""
+
+    @property
+    def minimum(self) -> float:
+        """Fastest time per call, in nanoseconds."""
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        """Median time per call, in nanoseconds."""
+        return statistics.median(self.samples)
+
+    @property
+    def quartiles(self) -> List[float]:
+        """First and third quartiles of the time per call, in nanoseconds."""
+        if len(self.samples) < 2:
+            return [self.samples[0]] * 2
+        q1, _, q3 = statistics.quantiles(self.samples, n=4, method="inclusive")
+        return [q1, q3]
+
+    @property
+    def iqr(self) -> float:
+        """Interquartile range of the time per call, in nanoseconds."""
+        q1, q3 = self.quartiles
+        return q3 - q1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable summary including the raw samples."""
+        return {
+            "name": self.name,
+            "problem": self.problem,
+            "n": self.n,
+            "loops": self.loops,
+            "repeat": len(self.samples),
+            "median_ns": self.median,
+            "iqr_ns": self.iqr,
+            "min_ns": self.minimum,
+            "samples_ns": self.samples,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Measurement":
+        """Rebuild a measurement from to_dict() output."""
+        return cls(data["name"], data["n"], data["loops"], data["samples_ns"], data["problem"])
+
+
+def measure(
+    func: Callable[[Any], object],
+    arg: Any,
+    *,
+    name: Optional[str] = None,
+    warmup: int = 1,
+    min_time: float = DEFAULT_MIN_TIME,
+    min_repeat: int = DEFAULT_MIN_REPEAT,
+    max_repeat: int = DEFAULT_MAX_REPEAT,
+    disable_gc: bool = True,
+    setup: Optional[Callable[[], object]] = None,
+) -> Measurement:
+    """
+    Time func(arg).
+
+    The warmup calls also estimate the cost of one call. Fast functions are
+    looped so that each sample lasts at least 100 microseconds. Samples are
+    repeated until about min_time seconds have been spent, bounded by
+    min_repeat and max_repeat. A function slower than min_time is not
+    repeated: the estimating call is reported as the only sample.
+
+    setup runs untimed before every sample and forces one call per sample.
+    For memoized functions it defaults to cache_clear, so the cold cost is
+    measured rather than a cache hit.
+
+    Args:
+        func: Function to time
+        arg: Its argument
+        name: Label for the result, func.__name__ by default
+        warmup: Untimed calls before measuring (at least one is made)
+        min_time: Time budget for the samples, in seconds
+        min_repeat: Fewest samples for functions faster than min_time
+        max_repeat: Most samples
+        disable_gc: Pause the garbage collector while timing
+        setup: Untimed callable run before every sample
+
+    Returns:
+        The measurement
+    """
+    label = name or str(getattr(func, "__name__", repr(func)))
+    if setup is None:
+        setup = getattr(func, "cache_clear", None)
+    perf = time.perf_counter_ns
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    if disable_gc:
+        gc.disable()
+    try:
+        estimate = math.inf
+        for _ in range(max(warmup, 1)):
+            if setup is not None:
+                setup()
+            start = perf()
+            func(arg)
+            estimate = min(estimate, perf() - start)
+        estimate = max(estimate, 1)
+
+        loops = 1 if setup is not None else max(1, int(-(-_MIN_SAMPLE_NS // estimate)))
+        sample_ns = estimate * loops
+        budget_ns = min_time * 1e9
+        if sample_ns >= budget_ns:
+            # Warmup hardly matters at this cost, so the call is not repeated
+            return Measurement(label, arg, 1, [estimate])
+        repeat = min(max_repeat, max(min_repeat, int(budget_ns // sample_ns)))
+
+        samples = []
+        iterations = range(loops)
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            start = perf()
+            for _ in iterations:
+                func(arg)
+            samples.append((perf() - start) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return Measurement(label, arg, loops, samples)
+
+
+def argument(problem: str, size: int) -> int:
+    """
+    Return the argument used to time a problem at a given size.
+
+    Primality tests are timed on their worst case, the first prime at or
+    above size; the other problems take the size itself.
+    """
+    if problem != "is_prime":
+        return size
+    from algorithms.primes import is_prime_miller_rabin
+
+    while not is_prime_miller_rabin(size):
+        size += 1
+    return size
+
+
+def _reference_workload(size: int) -> int:
+    """Fixed mix of interpreter loop work and big-integer multiplication."""
+    total = 0
+    for i in range(size):
+        total += i * i
+    big: int = 3 ** (size // 2)
+    return total + (big * big).bit_length()
+
+
+def calibration_ns(min_time: float = DEFAULT_MIN_TIME) -> float:
+    """
+    Time a fixed reference workload on this machine.
+
+    Reports store this figure so that timings from different machines, or
+    from one machine under different load, can be compared after dividing
+    out the ratio of their calibrations.
+
+    Args:
+        min_time: Time budget for the measurement, in seconds
+
+    Returns:
+        Median time of the reference workload, in nanoseconds
+    """
+    return measure(_reference_workload, 20000, name="calibration", min_time=min_time).median
+
+
+def run(
+    problems: Iterable[str] = PROBLEMS,
+    sizes: Optional[Sequence[int]] = None,
+    names: Optional[Iterable[str]] = None,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    on_result: Optional[Callable[[Measurement], None]] = None,
+    **options: Any,
+) -> List[Measurement]:
+    """
+    Benchmark registered implementations.
+
+    Each implementation is timed at every size inside its declared range,
+    smallest first. It is dropped from the larger sizes once a call takes
+    longer than time_limit.
+
+    Args:
+        problems: Problems to benchmark
+        sizes: Sizes to time, DEFAULT_SIZES for each problem by default
+        names: Only benchmark implementations with these names
+        time_limit: Slowest call, in seconds, before larger sizes are skipped
+        on_result: Called with each measurement as soon as it is taken
+        **options: Passed on to measure()
+
+    Returns:
+        Measurements in problem, implementation and size order
+    """
+    selected = set(names) if names is not None else None
+    results = []
+    for problem in problems:
+        for impl in implementations(problem):
+            if selected is not None and impl.name not in selected:
+                continue
+            for size in sorted(sizes or DEFAULT_SIZES[problem]):
+                arg = argument(problem, size)
+                if not impl.supports(arg):
+                    continue
+                result = measure(impl.resolve(), arg, name=impl.name, **options)
+                result.problem = problem
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+                if result.minimum > time_limit * 1e9:
+                    break
+    return results
+
+
+@dataclass
+class Overhead:
+    """
+    Cost of instrumentation on one implementation.
+
+    Attributes:
+        name: Implementation name
+        problem: Problem it solves
+        n: Argument it was timed at
+        plain: Median call time, in nanoseconds, before instrumentation
+        enabled: Median call time while instrumented
+        disabled: Median call time after instrumentation was switched off again
+    """
+
+    name: str
+    problem: str
+    n: int
+    plain: float
+    enabled: float
+    disabled: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable dictionary."""
+        return {
+            "name": self.name,
+            "problem": self.problem,
+            "n": self.n,
+            "plain_ns": self.plain,
+            "enabled_ns": self.enabled,
+            "disabled_ns": self.disabled,
+            "enabled_overhead_ns": self.enabled - self.plain,
+            "disabled_overhead_ns": self.disabled - self.plain,
+        }
+
+
+def instrumentation_overhead(
+    problems: Iterable[str] = PROBLEMS,
+    names: Optional[Iterable[str]] = None,
+    on_result: Optional[Callable[[Overhead], None]] = None,
+    **options: Any,
+) -> List[Overhead]:
+    """
+    Measure what instrument.enable() costs per call, and what is left after disable().
+
+    Each implementation is timed at its smallest default size, where the
+    fixed cost of the wrapper weighs most, three times: uninstrumented,
+    instrumented, and after instrumentation was switched off again. The
+    last should match the first, since disable() removes the wrapper.
+
+    Args:
+        problems: Problems to measure
+        names: Only measure implementations with these names
+        on_result: Called with each result as soon as it is taken
+        **options: Passed on to measure()
+
+    Returns:
+        Results in problem and implementation order
+    """
+    selected = set(names) if names is not None else None
+    results = []
+    for problem in problems:
+        for impl in implementations(problem):
+            if selected is not None and impl.name not in selected:
+                continue
+            args = [argument(problem, s) for s in sorted(DEFAULT_SIZES[problem])]
+            arg = next((a for a in args if impl.supports(a)), None)
+            if arg is None:
+                continue
+            was_enabled = instrument.enabled(impl.name)
+            instrument.disable([impl.name])
+            try:
+                medians = []
+                for state in ("plain", "enabled", "disabled"):
+                    if state == "enabled":
+                        instrument.enable([impl.name])
+                    elif state == "disabled":
+                        instrument.disable([impl.name])
+                    medians.append(measure(impl.resolve(), arg, name=impl.name, **options).median)
+            finally:
+                if was_enabled:
+                    instrument.enable([impl.name])
+            result = Overhead(impl.name, problem, arg, *medians)
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return results
+
+
+def format_overhead(results: Iterable[Overhead]) -> str:
+    """
+    Format instrumentation overhead as an aligned text table.
+
+    Args:
+        results: Results from instrumentation_overhead()
+
+    Returns:
+        Table with one row per implementation
+    """
+    lines = [
+        f"{'implementation':<26} {'n':>20} {'plain':>12} {'enabled':>12} {'disabled':>12}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.name:<26} {r.n:>20} {format_time(r.plain):>12} "
+            f"{format_time(r.enabled):>12} {format_time(r.disabled):>12}"
+        )
+    return "\n".join(lines)
+
+
+def scaling(
+    problems: Iterable[str] = PROBLEMS,
+    names: Optional[Iterable[str]] = None,
+    sizes: Optional[Sequence[int]] = None,
+    tolerance: float = DEFAULT_TOLERANCE,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    on_result: Optional[Callable[[Measurement], None]] = None,
+    **options: Any,
+) -> Tuple[List[Measurement], List[Fit]]:
+    """
+    Time implementations over geometric sizes and check their complexity.
+
+    Each implementation runs over SCALING_SIZES (or sizes) until a call
+    exceeds time_limit. Its median timings are then fitted against the
+    complexity declared in the registry, ignoring timings under 2
+    microseconds, which measure call overhead rather than the algorithm.
+
+    Args:
+        problems: Problems to check
+        names: Only check implementations with these names
+        sizes: Sizes to time, SCALING_SIZES for each problem by default
+        tolerance: Allowed excess of the fitted log-log slope
+        time_limit: Slowest call, in seconds, before larger sizes are skipped
+        on_result: Called with each measurement as soon as it is taken
+        **options: Passed on to measure(); min_time defaults to 0.05
+
+    Returns:
+        The measurements and one fit per implementation
+    """
+    options.setdefault("min_time", 0.05)
+    measurements = []
+    for problem in problems:
+        measurements += run(
+            [problem],
+            sizes=sizes or SCALING_SIZES[problem],
+            names=names,
+            time_limit=time_limit,
+            on_result=on_result,
+            **options,
+        )
+
+    by_name: Dict[str, List[Measurement]] = {}
+    for m in measurements:
+        by_name.setdefault(m.name, []).append(m)
+    fits = []
+    for name, results in by_name.items():
+        usable = [m for m in results if m.median >= _SCALING_FLOOR_NS]
+        fits.append(
+            fit_complexity(
+                name,
+                get(name).complexity,
+                [m.n for m in usable],
+                [m.median for m in usable],
+                tolerance,
+            )
+        )
+    return measurements, fits
+
+
+@dataclass
+class MemoryMeasurement:
+    """
+    Memory use of one call of an implementation.
+
+    Attributes:
+        name: Implementation name
+        n: Argument the function was called with
+        peak_bytes: tracemalloc peak during the call, above the level before it
+        net_bytes: Memory still allocated after the call while its result
+            is alive (the result plus anything cached)
+        rss_delta_bytes: Growth of the peak resident set size of a fresh
+            subprocess making the same call, or None if not measured
+        seconds: Duration of the traced call (tracemalloc slows it down)
+        problem: Registry problem
+    """
+
+    name: str
+    n: int
+    peak_bytes: int
+    net_bytes: int
+    rss_delta_bytes: Optional[int]
+    seconds: float
+    problem: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable summary."""
+        return {
+            "name": self.name,
+            "problem": self.problem,
+            "n": self.n,
+            "peak_bytes": self.peak_bytes,
+            "net_bytes": self.net_bytes,
+            "rss_delta_bytes": self.rss_delta_bytes,
+            "seconds": self.seconds,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MemoryMeasurement":
+        """Rebuild a measurement from to_dict() output."""
+        return cls(
+            data["name"],
+            data["n"],
+            data["peak_bytes"],
+            data["net_bytes"],
+            data["rss_delta_bytes"],
+            data["seconds"],
+            data["problem"],
+        )
+
+
+def _max_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    # Linux carries ru_maxrss over from the parent across fork and exec, so
+    # a child would start at the parent's peak; VmHWM belongs to the new
+    # address space
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _rss_child(module: str, name: str, arg: int) -> None:
+    """Subprocess side of _rss_delta(): make one call and print the growth."""
+    func = getattr(importlib.import_module(module), name)
+    gc.collect()
+    before = _max_rss_bytes()
+    result = func(arg)
+    print(json.dumps({"rss_delta": _max_rss_bytes() - before}))
+    del result
+
+
+def _rss_delta(impl: Implementation, arg: int, timeout: float) -> Optional[int]:
+    """
+    Measure the peak RSS growth of impl(arg) in a fresh interpreter.
+
+    A new process starts with no caches or freed-but-retained arenas from
+    earlier calls, so its peak RSS growth is what the call itself costs the
+    operating system. Returns None where the resource module is missing or
+    the child fails (for example because it ran out of memory).
+    """
+    if not os.path.exists("/proc/self/status"):
+        try:
+            import resource  # noqa: F401
+        except ImportError:
+            return None
+    root = str(Path(__file__).resolve().parent.parent)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    code = (
+        "from algorithms.bench import _rss_child; "
+        f"_rss_child({impl.module!r}, {impl.name!r}, {arg!r})"
+    )
+    try:
+        child = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return None
+    if child.returncode != 0:
+        return None
+    return int(json.loads(child.stdout.strip().splitlines()[-1])["rss_delta"])
+
+
+def measure_memory(
+    impl: Implementation, arg: int, rss: bool = True, timeout: float = 600.0
+) -> MemoryMeasurement:
+    """
+    Record the memory use of a registered implementation at one argument.
+
+    The traced peak and net allocation come from tracemalloc in this
+    process; memoized caches are cleared first so they count. The RSS
+    delta comes from a fresh subprocess, which also sees memory that
+    tracemalloc cannot, such as allocator overhead and fragmentation.
+
+    Args:
+        impl: Registered implementation
+        arg: Its argument
+        rss: Also measure RSS in a subprocess
+        timeout: Seconds the subprocess may run
+
+    Returns:
+        The measurement
+    """
+    func = impl.resolve()
+    clear = getattr(func, "cache_clear", None)
+    if clear is not None:
+        clear()
+    gc.collect()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        result = func(arg)
+        seconds = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    if clear is not None:
+        clear()
+    rss_delta = _rss_delta(impl, arg, timeout) if rss else None
+    return MemoryMeasurement(
+        impl.name, arg, peak - before, current - before, rss_delta, seconds, impl.problem
+    )
+
+
+def memory_run(
+    problems: Iterable[str] = PROBLEMS,
+    sizes: Optional[Sequence[int]] = None,
+    names: Optional[Iterable[str]] = None,
+    rss: bool = True,
+    cap: int = DEFAULT_MEMORY_CAP,
+    time_limit: float = DEFAULT_MEMORY_TIME_LIMIT,
+    on_result: Optional[Callable[[MemoryMeasurement], None]] = None,
+) -> List[MemoryMeasurement]:
+    """
+    Record memory use of registered implementations.
+
+    Sizes are handled as in run(). An implementation stops growing n once
+    its traced peak exceeds cap bytes or a traced call takes longer than
+    time_limit seconds.
+
+    Args:
+        problems: Problems to measure
+        sizes: Sizes to use, DEFAULT_SIZES for each problem by default
+        names: Only measure implementations with these names
+        rss: Also measure RSS in a fresh subprocess for every call
+        cap: Largest traced peak, in bytes, before larger sizes are skipped
+        time_limit: Slowest traced call, in seconds, before larger sizes
+            are skipped
+        on_result: Called with each measurement as soon as it is taken
+
+    Returns:
+        Measurements in problem, implementation and size order
+    """
+    selected = set(names) if names is not None else None
+    results = []
+    for problem in problems:
+        for impl in implementations(problem):
+            if selected is not None and impl.name not in selected:
+                continue
+            for size in sorted(sizes or DEFAULT_SIZES[problem]):
+                arg = argument(problem, size)
+                if not impl.supports(arg):
+                    continue
+                result = measure_memory(impl, arg, rss=rss)
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+                if result.peak_bytes > cap or result.seconds > time_limit:
+                    break
+    return results
+
+
+def memory_scaling(
+    problems: Iterable[str] = PROBLEMS,
+    names: Optional[Iterable[str]] = None,
+    sizes: Optional[Sequence[int]] = None,
+    tolerance: float = DEFAULT_TOLERANCE,
+    **options: Any,
+) -> Tuple[List[MemoryMeasurement], List[Fit]]:
+    """
+    Measure memory over geometric sizes and fit it against the registry.
+
+    Traced peaks under 64 KiB are left out of the fits. The fits check
+    each implementation's declared space class. They can also be solved
+    for the n at which an implementation reaches a memory limit, as
+    format_memory_fits() does.
+
+    Args:
+        problems: Problems to measure
+        names: Only measure implementations with these names
+        sizes: Sizes to use, SCALING_SIZES for each problem by default
+        tolerance: Allowed excess of the fitted log-log slope
+        **options: Passed on to memory_run()
+
+    Returns:
+        The measurements and one fit of peak bytes per implementation
+    """
+    measurements = []
+    for problem in problems:
+        measurements += memory_run(
+            [problem], sizes=sizes or SCALING_SIZES[problem], names=names, **options
+        )
+    by_name: Dict[str, List[MemoryMeasurement]] = {}
+    for m in measurements:
+        by_name.setdefault(m.name, []).append(m)
+    fits = []
+    for name, results in by_name.items():
+        usable = [m for m in results if m.peak_bytes >= _MEMORY_FLOOR_BYTES]
+        fits.append(
+            fit_complexity(
+                name,
+                get(name).space,
+                [m.n for m in usable],
+                [float(m.peak_bytes) for m in usable],
+                tolerance,
+                unit="bytes",
+            )
+        )
+    return measurements, fits
+
+
+def format_bytes(size: Optional[float]) -> str:
+    """Format a byte count with a binary unit."""
+    if size is None:
+        return "-"
+    for unit, scale in (("GiB", 1 << 30), ("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if abs(size) >= scale:
+            return f"{size / scale:.1f} {unit}"
+    return f"{size:.0f} B"
+
+
+def format_memory_table(measurements: Iterable[MemoryMeasurement]) -> str:
+    """
+    Format memory measurements as an aligned text table.
+
+    Args:
+        measurements: Results to show
+
+    Returns:
+        Table with one row per measurement
+    """
+    lines = [f"{'implementation':<26} {'n':>20} {'peak':>12} {'net':>12} {'rss delta':>12}"]
+    for m in measurements:
+        lines.append(
+            f"{m.name:<26} {m.n:>20} {format_bytes(m.peak_bytes):>12} "
+            f"{format_bytes(m.net_bytes):>12} {format_bytes(m.rss_delta_bytes):>12}"
+        )
+    return "\n".join(lines)
+
+
+def format_memory_fits(fits: Iterable[Fit], limit: int = DEFAULT_MEMORY_LIMIT) -> str:
+    """
+    Format memory fits with the projected n at which each reaches limit.
+
+    Args:
+        fits: Fits from memory_scaling()
+        limit: Memory limit, in bytes
+
+    Returns:
+        Table with one row per implementation
+    """
+    lines = [
+        f"{'implementation':<26} {'space':<16} {'fitted':<22} {'status':<13} "
+        f"{'n at ' + format_bytes(limit):>14}"
+    ]
+    for f in fits:
+        crossing = f.solve(limit)
+        at_limit = "never" if crossing is None else f"{crossing:.3g}"
+        if f.fitted is None:
+            at_limit = "-"
+        lines.append(
+            f"{f.name:<26} {f.documented:<16} {f.describe():<22} {f.status:<13} {at_limit:>14}"
+        )
+    return "\n".join(lines)
+
+
+def plot_memory_svg(
+    measurements: Iterable[MemoryMeasurement],
+    limit: int = DEFAULT_MEMORY_LIMIT,
+    width: int = 720,
+    height: int = 480,
+) -> str:
+    """
+    Plot traced peak memory against n on log-log axes as an SVG document.
+
+    Each implementation is one line, and the memory limit is a dashed
+    horizontal rule.
+
+    Args:
+        measurements: Results to plot
+        limit: Memory limit drawn on the plot, in bytes
+        width: Image width in pixels
+        height: Image height in pixels
+
+    Returns:
+        SVG source
+    """
+    series: Dict[str, List[Tuple[float, float]]] = {}
+    for m in measurements:
+        if m.peak_bytes > 0:
+            series.setdefault(m.name, []).append((math.log10(m.n), math.log10(m.peak_bytes)))
+    xs = [x for points in series.values() for x, _ in points] or [0.0, 1.0]
+    ys = [y for points in series.values() for _, y in points] + [math.log10(limit)]
+    x_lo, x_hi = math.floor(min(xs)), math.ceil(max(xs))
+    y_lo, y_hi = math.floor(min(ys)), math.ceil(max(ys))
+    x_hi, y_hi = max(x_hi, x_lo + 1), max(y_hi, y_lo + 1)
+    left, right, top, bottom = 70, 200, 20, 50
+    plot_w, plot_h = width - left - right, height - top - bottom
+
+    def px(x: float) -> float:
+        return left + (x - x_lo) / (x_hi - x_lo) * plot_w
+
+    def py(y: float) -> float:
+        return top + (y_hi - y) / (y_hi - y_lo) * plot_h
+
+    palette = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b", "#e377c2"]
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        'font-family="sans-serif" font-size="12">',
+        f'<rect x="{left}" y="{top}" width="{plot_w}" height="{plot_h}" '
+        'fill="none" stroke="#999"/>',
+    ]
+    for x in range(x_lo, x_hi + 1):
+        parts.append(
+            f'<text x="{px(x):.1f}" y="{height - bottom + 18}" text-anchor="middle">1e{x}</text>'
+        )
+    for y in range(y_lo, y_hi + 1):
+        parts.append(
+            f'<text x="{left - 6}" y="{py(y) + 4:.1f}" text-anchor="end">'
+            f"{format_bytes(10**y)}</text>"
+        )
+    parts.append(f'<text x="{left + plot_w / 2}" y="{height - 8}" text-anchor="middle">n</text>')
+    limit_y = py(math.log10(limit))
+    parts.append(
+        f'<line x1="{left}" y1="{limit_y:.1f}" x2="{left + plot_w}" y2="{limit_y:.1f}" '
+        'stroke="#000" stroke-dasharray="6,4"/>'
+    )
+    parts.append(
+        f'<text x="{left + plot_w - 4}" y="{limit_y - 4:.1f}" text-anchor="end">'
+        f"limit {format_bytes(limit)}</text>"
+    )
+    for i, (name, points) in enumerate(series.items()):
+        color = palette[i % len(palette)]
+        path = " ".join(f"{px(x):.1f},{py(y):.1f}" for x, y in points)
+        parts.append(f'<polyline points="{path}" fill="none" stroke="{color}" stroke-width="2"/>')
+        label_y = top + 16 * (i + 1)
+        parts.append(
+            f'<line x1="{width - right + 10}" y1="{label_y - 4}" x2="{width - right + 30}" '
+            f'y2="{label_y - 4}" stroke="{color}" stroke-width="2"/>'
+        )
+        parts.append(f'<text x="{width - right + 36}" y="{label_y}">{html.escape(name)}</text>')
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def _cpu_model() -> str:
+    """Best available description of the CPU."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def _git(*args: str) -> Optional[str]:
+    """Run git in the package checkout, returning None if that fails."""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Describe the machine, interpreter and source revision of a run.
+
+    Returns:
+        Dictionary with Python, platform, CPU and git commit details
+    """
+    commit = _git("rev-parse", "HEAD")
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "compiler": platform.python_compiler(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu": _cpu_model(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")) if commit else None,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def report(
+    measurements: Iterable[Measurement],
+    fits: Optional[Iterable[Fit]] = None,
+    memory: Optional[Iterable[MemoryMeasurement]] = None,
+    memory_fits: Optional[Iterable[Fit]] = None,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    overhead: Optional[Iterable[Overhead]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the JSON report of a run.
+
+    Args:
+        measurements: Results to include
+        fits: Complexity fits from scaling(), if any
+        memory: Memory measurements, if any
+        memory_fits: Space fits from memory_scaling(), if any
+        memory_limit: Limit, in bytes, that memory fits are projected to
+        overhead: Instrumentation overhead results, if any
+
+    Returns:
+        Dictionary with the report version, environment, machine
+        calibration and results
+    """
+    data: Dict[str, Any] = {
+        "version": REPORT_VERSION,
+        "environment": environment(),
+        "calibration_ns": calibration_ns(),
+        "results": [m.to_dict() for m in measurements],
+    }
+    if fits is not None:
+        data["scaling"] = [f.to_dict() for f in fits]
+    if memory is not None:
+        data["memory"] = [m.to_dict() for m in memory]
+    if memory_fits is not None:
+        data["memory_limit_bytes"] = memory_limit
+        data["memory_scaling"] = [
+            dict(f.to_dict(), n_at_limit=f.solve(memory_limit)) for f in memory_fits
+        ]
+    if overhead is not None:
+        data["instrumentation"] = [r.to_dict() for r in overhead]
+    return data
+
+
+def format_time(ns: float) -> str:
+    """Format a duration in nanoseconds with a readable unit."""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.3f} {unit}"
+    return f"{ns:.1f} ns"
+
+
+def format_table(measurements: Iterable[Measurement]) -> str:
+    """
+    Format measurements as an aligned text table.
+
+    Args:
+        measurements: Results to show
+
+    Returns:
+        Table with one row per measurement
+    """
+    lines = [
+        f"{'implementation':<26} {'n':>20} {'median':>12} {'iqr':>12} {'min':>12} {'runs':>10}"
+    ]
+    for m in measurements:
+        runs = f"{len(m.samples)}x{m.loops}"
+        lines.append(
+            f"{m.name:<26} {m.n:>20} {format_time(m.median):>12} {format_time(m.iqr):>12} "
+            f"{format_time(m.minimum):>12} {runs:>10}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_bytes(text: str) -> int:
+    """Parse a size such as 1G, 512M or 1048576 (binary units)."""
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+    text = text.strip().upper().removesuffix("IB").removesuffix("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point: benchmark the registry and report."""
+    parser = argparse.ArgumentParser(
+        prog="python -m algorithms.bench", description="Benchmark registered implementations"
+    )
+    parser.add_argument("--problem", action="append", choices=PROBLEMS, help="problem to run")
+    parser.add_argument("--impl", action="append", help="implementation name to run")
+    parser.add_argument("--sizes", type=int, nargs="+", help="argument sizes to time")
+    parser.add_argument("--min-time", type=float, help="seconds per measurement")
+    parser.add_argument("--time-limit", type=float, default=DEFAULT_TIME_LIMIT)
+    parser.add_argument("--keep-gc", action="store_true", help="leave the GC running")
+    parser.add_argument(
+        "--scaling", action="store_true", help="time geometric sizes and check complexity"
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--memory", action="store_true", help="also record memory at every timed size"
+    )
+    parser.add_argument(
+        "--memory-scaling",
+        action="store_true",
+        help="measure memory over geometric sizes and project it to the limit",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=_parse_bytes,
+        default=DEFAULT_MEMORY_LIMIT,
+        help="memory limit for projections, e.g. 1G (default: the container limit)",
+    )
+    parser.add_argument("--no-rss", action="store_true", help="skip the RSS subprocesses")
+    parser.add_argument(
+        "--instrument-overhead",
+        action="store_true",
+        help="also time each implementation with instrumentation on and off",
+    )
+    parser.add_argument("--plot", metavar="SVG", help="write the memory-scaling plot")
+    parser.add_argument("--json", metavar="PATH", help="write the JSON report ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    to_stdout = args.json == "-"
+    log = sys.stderr if to_stdout else sys.stdout
+    problems = args.problem or PROBLEMS
+    results: List[Measurement] = []
+    fits = memory = memory_fits = overhead = None
+
+    if args.memory_scaling:
+        print(format_memory_table([]), file=log)
+        memory, memory_fits = memory_scaling(
+            problems,
+            names=args.impl,
+            sizes=args.sizes,
+            tolerance=args.tolerance,
+            rss=not args.no_rss,
+            on_result=lambda m: print(format_memory_table([m]).splitlines()[1], file=log),
+        )
+        print(file=log)
+        print(format_memory_fits(memory_fits, args.memory_limit), file=log)
+        if args.plot:
+            Path(args.plot).write_text(plot_memory_svg(memory, args.memory_limit) + "\n")
+    else:
+        options: Dict[str, Any] = {"disable_gc": not args.keep_gc}
+        if args.min_time is not None:
+            options["min_time"] = args.min_time
+        print(format_table([]), file=log)
+        common = dict(
+            names=args.impl,
+            sizes=args.sizes,
+            time_limit=args.time_limit,
+            on_result=lambda m: print(format_table([m]).splitlines()[1], file=log, flush=True),
+            **options,
+        )
+        if args.scaling:
+            results, fits = scaling(problems, tolerance=args.tolerance, **common)
+            print(file=log)
+            print(format_fits(fits), file=log)
+        else:
+            results = run(problems, **common)
+        if args.memory:
+            # The same (implementation, n) pairs that were timed
+            memory = []
+            for m in results:
+                memory.append(measure_memory(get(m.name), m.n, rss=not args.no_rss))
+            print(file=log)
+            print(format_memory_table(memory), file=log)
+        if args.instrument_overhead:
+            print(file=log)
+            print(format_overhead([]), file=log)
+            overhead = instrumentation_overhead(
+                problems,
+                names=args.impl,
+                on_result=lambda r: print(format_overhead([r]).splitlines()[1], file=log),
+                **options,
+            )
+
+    if args.json:
+        data = json.dumps(
+            report(results, fits, memory, memory_fits, args.memory_limit, overhead), indent=2
+        )
+        if to_stdout:
+            print(data)
+        else:
+            Path(args.json).write_text(data + "\n")
+    checked = (fits or []) + (memory_fits or [])
+    return 1 if any(f.flagged for f in checked) else 0
+
+
+if __name__ == "__main__":
+    from algorithms import profiling
+
+    with profiling.from_argv("bench") as argv:
+        sys.exit(main(argv))
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Persistent memo store for expensive results
+
+Results such as F(10^7) or 10^6! take long enough that recomputing them in
+every process hurts. Functions decorated with @persistent look their
+result up in a SQLite file shared by every process on the machine, and
+store it after computing it. The store is opt-in: it lives at
+$ALGORITHMS_CACHE, and while that is unset the decorators only call
+through. The dispatcher entry points fib(), factorial() and primes() use
+it for large arguments.
+
+Entries are keyed by function and arguments and carry the version given
+to the decorator; bumping the version invalidates the old entries. Values
+are stored compactly:
+
+    int          raw little-endian two's complement bytes
+    bool         one byte
+    list of int  zlib-compressed int64 deltas (prime lists compress well)
+
+Every value has a CRC-32. An entry whose version, checksum or encoding
+does not match is deleted and recomputed. Once the values exceed the
+size cap, least recently used entries are evicted. The database runs in
+WAL mode, so readers do not block each other or wait for a writer, and
+writers wait for one another up to a timeout. A hit records its use only
+when the entry's last use is more than a minute old, so repeated hits on
+the same entries stay read-only.
+
+    python -m algorithms.cache stats
+    python -m algorithms.cache clear [--func algorithms.dispatch.fib]
+"""
+import argparse
+import functools
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import warnings
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, TypeVar
+
+CACHE_ENV = "ALGORITHMS_CACHE"
+MAX_BYTES_ENV = "ALGORITHMS_CACHE_MAX_BYTES"
+SCHEMA_VERSION = 1
+
+DEFAULT_MAX_BYTES = 256 << 20
+
+# Seconds a writer waits for another process's transaction to finish
+_BUSY_TIMEOUT = 30.0
+
+# A hit refreshes an entry's last use only once it is this many seconds
+# old; eviction order is coarsened to this granularity
+_TOUCH_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    func TEXT NOT NULL,
+    key TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    data BLOB NOT NULL,
+    crc INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (func, key)
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used);
+"""
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def cache_path() -> Optional[Path]:
+    """Return the store the decorators use, None while caching is off."""
+    override = os.environ.get(CACHE_ENV)
+    return Path(override) if override else None
+
+
+def encode(value: Any) -> Optional[Tuple[str, bytes]]:
+    """
+    Encode a value for the store.
+
+    Returns:
+        (kind, data), or None for values the store does not hold
+    """
+    if isinstance(value, bool):
+        return "bool", bytes([value])
+    if isinstance(value, int):
+        return "int", value.to_bytes(value.bit_length() // 8 + 1, "little", signed=True)
+    if isinstance(value, list) and all(type(v) is int for v in value):
+        deltas = [b - a for a, b in zip(itertools.chain([0], value), value)]
+        try:
+            return "ints", zlib.compress(array("q", deltas).tobytes())
+        except OverflowError:
+            return None
+    return None
+
+
+def decode(kind: str, data: bytes) -> Any:
+    """
+    Decode a value written by encode().
+
+    Raises:
+        ValueError: If the kind is unknown or the data is malformed
+    """
+    if kind == "bool":
+        return data == b"\x01"
+    if kind == "int":
+        return int.from_bytes(data, "little", signed=True)
+    if kind == "ints":
+        deltas = array("q")
+        try:
+            deltas.frombytes(zlib.decompress(data))
+        except zlib.error as e:
+            raise ValueError(f"Corrupt compressed array: {e}") from None
+        return list(itertools.accumulate(deltas))
+    raise ValueError(f"Unknown value kind {kind!r}")
+
+
+class Store:
+    """
+    SQLite-backed memo store shared between processes.
+
+    A Store may be used from several threads. After a fork the child opens
+    its own connection, since SQLite connections cannot cross processes.
+
+    Attributes:
+        path: Database file
+        max_bytes: Cap on the total size of the stored values
+    """
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=_BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                # A cache from another schema is dropped rather than migrated
+                if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    conn.execute("DROP TABLE IF EXISTS entries")
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                for statement in _SCHEMA.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, func: str, version: int, key: str) -> Tuple[bool, Any]:
+        """
+        Look a result up.
+
+        An entry with another version, a bad checksum or undecodable data
+        is deleted and reported as a miss. A hit takes the write lock only
+        to refresh a last use older than a minute.
+
+        Returns:
+            (True, value) on a hit, (False, None) on a miss
+        """
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT version, kind, data, crc, last_used FROM entries "
+                "WHERE func = ? AND key = ?",
+                (func, key),
+            ).fetchone()
+            if row is None:
+                return False, None
+            stored_version, kind, data, crc, last_used = row
+            value = None
+            valid = stored_version == version and zlib.crc32(data) == crc
+            if valid:
+                try:
+                    value = decode(kind, data)
+                except ValueError:
+                    valid = False
+            if not valid:
+                conn.execute("DELETE FROM entries WHERE func = ? AND key = ?", (func, key))
+                return False, None
+            now = time.time()
+            if now - last_used >= _TOUCH_SECONDS:
+                conn.execute(
+                    "UPDATE entries SET last_used = ? WHERE func = ? AND key = ?",
+                    (now, func, key),
+                )
+            return True, value
+
+    def put(self, func: str, version: int, key: str, value: Any) -> bool:
+        """
+        Store a result, evicting least recently used entries over the cap.
+
+        Returns:
+            Whether the value was stored; values of other types, or larger
+            than the cap on their own, are not
+        """
+        encoded = encode(value)
+        if encoded is None or len(encoded[1]) > self.max_bytes:
+            return False
+        kind, data = encoded
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (func, key, version, kind, data, zlib.crc32(data), len(data), time.time()),
+                )
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                rows = conn.execute("SELECT func, key, size FROM entries ORDER BY last_used")
+                evict = []
+                for old_func, old_key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    evict.append((old_func, old_key))
+                    total -= size
+                conn.executemany("DELETE FROM entries WHERE func = ? AND key = ?", evict)
+        return True
+
+    def clear(self, func: Optional[str] = None) -> int:
+        """
+        Delete the entries of one function, or every entry.
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._lock:
+            conn = self._connection()
+            if func is None:
+                return conn.execute("DELETE FROM entries").rowcount
+            return conn.execute("DELETE FROM entries WHERE func = ?", (func,)).rowcount
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return the entry count and stored bytes per function."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT func, COUNT(*), SUM(size) FROM entries GROUP BY func ORDER BY func"
+            ).fetchall()
+        return {func: {"entries": count, "bytes": size} for func, count, size in rows}
+
+    def close(self) -> None:
+        """Close this process's connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+_stores: Dict[Path, Store] = {}
+
+
+def store() -> Optional[Store]:
+    """Return the store at $ALGORITHMS_CACHE, None while caching is off."""
+    path = cache_path()
+    if path is None:
+        return None
+    found = _stores.get(path)
+    if found is None:
+        max_bytes = int(os.environ.get(MAX_BYTES_ENV) or DEFAULT_MAX_BYTES)
+        found = _stores.setdefault(path, Store(path, max_bytes))
+    return found
+
+
+def persistent(version: int = 1, min_n: int = 0) -> Callable[[F], F]:
+    """
+    Memoize a function in the persistent store.
+
+    Args:
+        version: Bump it whenever the function's results change, so stale
+            entries are invalidated
+        min_n: Smallest first argument worth a lookup; smaller calls only
+            pay for one comparison
+
+    Returns:
+        Decorator
+    """
+
+    def decorate(func: F) -> F:
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if args and args[0] < min_n:
+                return func(*args, **kwargs)
+            cache = store()
+            if cache is None:
+                return func(*args, **kwargs)
+            key = json.dumps([args, kwargs], sort_keys=True, default=str)
+            try:
+                hit, value = cache.get(name, version, key)
+            except sqlite3.Error as e:
+                # An unreadable store must not break the function it caches
+                warnings.warn(f"Persistent cache {cache.path} unavailable: {e}", RuntimeWarning)
+                return func(*args, **kwargs)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            try:
+                cache.put(name, version, key, value)
+            except sqlite3.Error as e:
+                warnings.warn(f"Persistent cache {cache.path} unavailable: {e}", RuntimeWarning)
+            return value
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point: inspect or clear the store."""
+    parser = argparse.ArgumentParser(
+        prog="python -m algorithms.cache", description="Persistent result cache"
+    )
+    parser.add_argument("--db", type=Path, help=f"database file (default: ${CACHE_ENV})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="entries and bytes per function")
+    clear = commands.add_parser("clear", help="delete entries")
+    clear.add_argument("--func", help="only this function's entries")
+    args = parser.parse_args(argv)
+
+    path = args.db or cache_path()
+    if path is None:
+        print(f"No cache configured; set ${CACHE_ENV} or pass --db", file=sys.stderr)
+        return 1
+    cache = Store(path)
+    if args.command == "clear":
+        print(f"Deleted {cache.clear(args.func)} entries")
+        return 0
+    stats = cache.stats()
+    for func, entry in stats.items():
+        print(f"{func:<40} {entry['entries']:>8} entries {entry['bytes']:>14} bytes")
+    if not stats:
+        print("Cache is empty")
+    return 0
+
+
+if __name__ == "__main__":
+    from algorithms import profiling
+
+    with profiling.from_argv("cache") as argv:
+        sys.exit(main(argv))
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Combinatorics built on the factorial and prime modules
+
+This module provides binomial-style counting functions that avoid
+computing full factorials: exact binomials and multinomials assembled from
+their prime factorisation, vectorised log-binomials for statistics code,
+and precomputed factorial tables modulo a prime for O(1) queries.
+"""
+import math
+import mmap
+import struct
+from array import array
+from typing import Any, Iterable, List, Optional, Union
+
+from algorithms.factorial import log_factorial, sequence_product, valuation
+from algorithms.primes import sieve_of_eratosthenes
+
+
+def _prime_power_product(n: int, ks: List[int]) -> int:
+    """
+    Return n! / (k1! ... km!) for ks summing to n, via prime exponents.
+
+    For each prime p <= n the exponent is v_p(n!) - sum v_p(ki!). Primes
+    above sqrt(n) appear at most once in each factorial, so their exponent
+    is a single quotient difference. The prime powers are multiplied with
+    a balanced product tree, so the largest operands are about half the
+    size of the result.
+    """
+    root = math.isqrt(n)
+    factors = []
+    for p in sieve_of_eratosthenes(n):
+        if p <= root:
+            exponent = valuation(n, p) - sum(valuation(k, p) for k in ks)
+        else:
+            exponent = n // p - sum(k // p for k in ks)
+        if exponent == 1:
+            factors.append(p)
+        elif exponent:
+            factors.append(p**exponent)
+    return sequence_product(factors)
+
+
+def binomial(n: int, k: int) -> int:
+    """
+    Exact binomial coefficient C(n, k) without computing any factorial.
+
+    Time complexity: O(n log log n) for the sieve plus O(M(r) log r) for the
+        product tree, where r is the size of the result
+    Space complexity: O(n) for the prime list plus O(r)
+
+    Args:
+        n: Size of the set
+        k: Size of the subset
+
+    Returns:
+        C(n, k) (0 when k < 0 or k > n)
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    if k == 0:
+        return 1
+    return _prime_power_product(n, [k, n - k])
+
+
+def multinomial(*ks: int) -> int:
+    """
+    Exact multinomial coefficient (k1 + ... + km)! / (k1! ... km!).
+
+    Time complexity: O(n log log n + m pi(n)) for n = sum(ks), plus the
+        product tree over the result
+    Space complexity: O(n) for the prime list plus the result
+
+    Args:
+        *ks: Group sizes
+
+    Returns:
+        The multinomial coefficient (1 for no groups)
+
+    Raises:
+        ValueError: If any group size is negative
+    """
+    if any(k < 0 for k in ks):
+        raise ValueError("Input must be non-negative")
+    # Empty groups contribute 0! = 1
+    groups = [k for k in ks if k > 0]
+    if len(groups) <= 1:
+        return 1
+    return _prime_power_product(sum(groups), groups)
+
+
+def log_binomial(ns: Iterable[int], ks: Iterable[int]) -> Any:
+    """
+    Return ln C(n, k) elementwise for paired arrays of n and k.
+
+    Computed as ln n! - ln k! - ln (n-k)! with log_factorial(). Pairs with
+    k < 0 or k > n give -inf (the log of a zero count). With NumPy the
+    inputs broadcast against each other and the result is a float64
+    ndarray; otherwise they are zipped and an array('d') is returned.
+
+    Time complexity: O(len(ns)), vectorised with NumPy
+    Space complexity: O(len(ns))
+
+    Args:
+        ns: Set sizes
+        ks: Subset sizes
+
+    Returns:
+        Array of ln C(n, k)
+
+    Raises:
+        ValueError: If any n is negative
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        logs = array("d")
+        for n, k in zip(ns, ks):
+            if n < 0:
+                raise ValueError("Input must be non-negative")
+            if k < 0 or k > n:
+                logs.append(-math.inf)
+            else:
+                logs.append(math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1))
+        return logs
+
+    n_values, k_values = np.broadcast_arrays(
+        np.asarray(ns, dtype=np.int64), np.asarray(ks, dtype=np.int64)
+    )
+    if (n_values < 0).any():
+        raise ValueError("Input must be non-negative")
+    valid = (k_values >= 0) & (k_values <= n_values)
+    result = np.full(n_values.shape, -np.inf)
+    n_valid, k_valid = n_values[valid], k_values[valid]
+    result[valid] = (
+        log_factorial(n_valid) - log_factorial(k_valid) - log_factorial(n_valid - k_valid)
+    )
+    return result
+
+
+class FactorialTable:
+    """
+    Factorials and inverse factorials modulo a prime, for O(1) binomials.
+
+    The table stores k! mod p and (k!)^-1 mod p for 0 <= k <= limit in two
+    compact arrays of unsigned 64-bit integers. Queries with n beyond the
+    table use Lucas' theorem when the table covers 0..p-1.
+
+    Tables can be written to disk with save() and mapped read-only by any
+    number of processes with load(), which shares the pages instead of
+    copying them.
+
+    Example:
+        >>> table = FactorialTable(1000, 1_000_000_007)
+        >>> table.binom(10, 3)
+        120
+    """
+
+    _MAGIC = b"FTAB\x00\x00\x00\x01"
+    _HEADER = struct.Struct("<8sQQ")
+
+    def __init__(self, limit: int, mod: int) -> None:
+        """
+        Precompute the table.
+
+        Time complexity: O(min(limit, mod)) plus one modular inverse
+        Space complexity: O(min(limit, mod))
+
+        Args:
+            limit: Largest n whose factorial is stored
+            mod: Prime modulus, below 2^63
+
+        Raises:
+            ValueError: If limit is negative, mod is out of range, or the
+                factorials are not invertible (mod is not prime)
+        """
+        if limit < 0:
+            raise ValueError("Input must be non-negative")
+        if not 2 <= mod < 1 << 63:
+            raise ValueError("Modulus must be a prime between 2 and 2^63")
+        # k! is 0 mod p for k >= p, so there is nothing to store past p - 1
+        size = min(limit, mod - 1) + 1
+
+        fact = array("Q", bytes(8 * size))
+        fact[0] = 1
+        for i in range(1, size):
+            fact[i] = fact[i - 1] * i % mod
+
+        inv_fact = array("Q", bytes(8 * size))
+        try:
+            inv_fact[size - 1] = pow(fact[size - 1], -1, mod)
+        except ValueError:
+            raise ValueError(f"Factorials are not invertible modulo {mod}; use a prime") from None
+        for i in range(size - 1, 0, -1):
+            inv_fact[i - 1] = inv_fact[i] * i % mod
+
+        self._init(mod, memoryview(fact), memoryview(inv_fact), None)
+
+    def _init(
+        self,
+        mod: int,
+        fact: memoryview,
+        inv_fact: memoryview,
+        mapping: Optional[mmap.mmap],
+    ) -> None:
+        self.mod = mod
+        self.size = len(fact)
+        self._fact = fact
+        self._inv_fact = inv_fact
+        self._mapping = mapping
+
+    @property
+    def limit(self) -> int:
+        """Largest n stored in the table."""
+        return self.size - 1
+
+    @property
+    def lucas(self) -> bool:
+        """Whether queries beyond the table can use Lucas' theorem."""
+        return self.size == self.mod
+
+    def factorial(self, n: int) -> int:
+        """
+        Return n! mod p.
+
+        Args:
+            n: Non-negative integer
+
+        Returns:
+            n! reduced modulo the table's prime
+        """
+        if n < 0:
+            raise ValueError("Input must be non-negative")
+        if n < self.size:
+            return self._fact[n]
+        if n >= self.mod:
+            return 0
+        raise ValueError(f"n={n} exceeds the table limit {self.limit}")
+
+    def binom(self, n: int, k: int) -> int:
+        """
+        Return the binomial coefficient C(n, k) mod p.
+
+        Time complexity: O(1) inside the table, O(log_p n) with Lucas
+        Space complexity: O(1)
+
+        Args:
+            n: Size of the set
+            k: Size of the subset
+
+        Returns:
+            C(n, k) mod p (0 when k < 0 or k > n)
+
+        Raises:
+            ValueError: If n is negative or beyond the table without Lucas
+        """
+        if n < 0:
+            raise ValueError("Input must be non-negative")
+        if k < 0 or k > n:
+            return 0
+        if n < self.size:
+            return self._fact[n] * self._inv_fact[k] % self.mod * self._inv_fact[n - k] % self.mod
+        if not self.lucas:
+            raise ValueError(f"n={n} exceeds the table limit {self.limit}")
+
+        p = self.mod
+        result = 1
+        while n:
+            n, n_digit = divmod(n, p)
+            k, k_digit = divmod(k, p)
+            if k_digit > n_digit:
+                return 0
+            result = (
+                result * self._fact[n_digit] % p * self._inv_fact[k_digit] % p
+                * self._inv_fact[n_digit - k_digit] % p
+            )
+        return result
+
+    def perm(self, n: int, k: int) -> int:
+        """
+        Return the number of k-permutations n! / (n - k)! mod p.
+
+        Time complexity: O(1)
+        Space complexity: O(1)
+
+        Args:
+            n: Size of the set
+            k: Number of ordered picks
+
+        Returns:
+            n! / (n - k)! mod p (0 when k < 0 or k > n)
+
+        Raises:
+            ValueError: If n is negative or beyond the table without Lucas
+        """
+        if n < 0:
+            raise ValueError("Input must be non-negative")
+        if k < 0 or k > n:
+            return 0
+        if n < self.size:
+            return self._fact[n] * self._inv_fact[n - k] % self.mod
+        if not self.lucas:
+            raise ValueError(f"n={n} exceeds the table limit {self.limit}")
+        # (n-k, n] either contains a multiple of p or is a run of residues
+        p = self.mod
+        if n // p != (n - k) // p:
+            return 0
+        return self._fact[n % p] * self._inv_fact[(n - k) % p] % p
+
+    def multinomial(self, *ks: int) -> int:
+        """
+        Return the multinomial coefficient (k1 + ... + km)! / (k1! ... km!) mod p.
+
+        Time complexity: O(m) inside the table, O(m log_p n) with Lucas
+        Space complexity: O(1)
+
+        Args:
+            *ks: Group sizes
+
+        Returns:
+            The multinomial coefficient modulo p
+
+        Raises:
+            ValueError: If any group size is negative or the total is
+                beyond the table without Lucas
+        """
+        if any(k < 0 for k in ks):
+            raise ValueError("Input must be non-negative")
+        n = sum(ks)
+        p = self.mod
+        if n < self.size:
+            result = self._fact[n]
+            for k in ks:
+                result = result * self._inv_fact[k] % p
+            return result
+        result, total = 1, 0
+        for k in ks:
+            total += k
+            result = result * self.binom(total, k) % p
+        return result
+
+    def save(self, path: Union[str, Any]) -> None:
+        """
+        Write the table to a file that load() can memory-map.
+
+        Args:
+            path: Destination file path
+        """
+        with open(path, "wb") as f:
+            f.write(self._HEADER.pack(self._MAGIC, self.mod, self.size))
+            f.write(self._fact.cast("B"))
+            f.write(self._inv_fact.cast("B"))
+
+    @classmethod
+    def load(cls, path: Union[str, Any]) -> "FactorialTable":
+        """
+        Memory-map a table written by save().
+
+        The mapping is read-only, so every process that loads the same
+        file shares one copy of the pages.
+
+        Args:
+            path: File written by save()
+
+        Returns:
+            A table backed by the mapped file
+
+        Raises:
+            ValueError: If the file is not a factorial table
+        """
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = cls._HEADER.size
+        if len(mapping) < header:
+            mapping.close()
+            raise ValueError(f"{path} is not a factorial table")
+        magic, mod, size = cls._HEADER.unpack_from(mapping)
+        if magic != cls._MAGIC or len(mapping) != header + 16 * size:
+            mapping.close()
+            raise ValueError(f"{path} is not a factorial table")
+
+        view = memoryview(mapping)
+        table = cls.__new__(cls)
+        table._init(
+            mod,
+            view[header : header + 8 * size].cast("Q"),
+            view[header + 8 * size :].cast("Q"),
+            mapping,
+        )
+        return table
+
+    def close(self) -> None:
+        """Release the memory mapping of a table opened with load()."""
+        if self._mapping is not None:
+            self._fact.release()
+            self._inv_fact.release()
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self) -> "FactorialTable":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"FactorialTable(limit={self.limit}, mod={self.mod})"
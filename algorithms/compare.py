@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Benchmark regression gate
+
+Compares a new benchmark report with a stored baseline. The two are
+matched on (implementation, n). New timings are first divided by the ratio
+of the reports' machine calibrations, so that a faster or busier machine
+is not mistaken for a faster or slower implementation. Each pair is then
+judged on two things. The change in median must exceed a threshold, and a
+one-sided Mann-Whitney U test on the repetitions must agree that it is not
+noise. When there are too few repetitions for the test to ever reach
+significance, as for a call slower than the time budget, which is timed
+once, a change beyond the threshold is reported as unconfirmed: a warning
+that does not fail the gate. A longer --min-time collects more
+repetitions for such calls.
+
+Usage:
+
+    python -m algorithms.compare BASELINE.json [NEW.json]
+
+Without NEW.json the implementations and sizes of the baseline are
+benchmarked afresh. The exit status is 1 if anything regressed, and
+unconfirmed changes are listed on stderr.
+"""
+import argparse
+import json
+import math
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from algorithms.bench import DEFAULT_MIN_TIME, Measurement, format_time, measure, report
+from algorithms.registry import get
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.01
+
+
+def mann_whitney_greater(x: Sequence[float], y: Sequence[float]) -> float:
+    """
+    One-sided Mann-Whitney U test that y tends to be larger than x.
+
+    Uses the normal approximation with tie and continuity corrections.
+
+    Args:
+        x: First sample
+        y: Second sample
+
+    Returns:
+        The p-value (1.0 when every value is tied)
+    """
+    nx, ny = len(x), len(y)
+    pooled = sorted([(v, 0) for v in x] + [(v, 1) for v in y])
+    total = nx + ny
+    rank_y = 0.0
+    tie_term = 0
+    i = 0
+    while i < total:
+        j = i
+        while j + 1 < total and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        # Tied values share the average of ranks i+1 .. j+1
+        rank = (i + j + 2) / 2
+        rank_y += rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 1)
+        ties = j - i + 1
+        tie_term += ties**3 - ties
+        i = j + 1
+    u = rank_y - ny * (ny + 1) / 2
+    mean = nx * ny / 2
+    variance = nx * ny / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass
+class Comparison:
+    """
+    Verdict for one (implementation, n) pair.
+
+    Attributes:
+        name: Implementation name
+        n: Argument
+        baseline: Baseline median, in nanoseconds (None if new)
+        current: New median after calibration scaling (None if missing)
+        p_slower: p-value that the new samples are slower
+        p_faster: p-value that the new samples are faster
+        verdict: "regressed", "improved", "same", "unconfirmed" (beyond the
+            threshold, with too few repetitions to test), "new" or "missing"
+    """
+
+    name: str
+    n: int
+    baseline: Optional[float]
+    current: Optional[float]
+    p_slower: Optional[float]
+    p_faster: Optional[float]
+    verdict: str
+
+    @property
+    def change(self) -> Optional[float]:
+        """Relative change of the median, e.g. 0.25 for 25% slower."""
+        if self.baseline is None or self.current is None:
+            return None
+        return self.current / self.baseline - 1
+
+
+def _testable(nx: int, ny: int, alpha: float) -> bool:
+    """Whether the smallest attainable p-value for these sample sizes is below alpha."""
+    return 1 / math.comb(nx + ny, nx) < alpha
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+    normalize: bool = True,
+) -> Tuple[List[Comparison], float]:
+    """
+    Compare two benchmark reports.
+
+    Args:
+        baseline: Stored report from algorithms.bench
+        current: New report
+        threshold: Relative slowdown of the median that counts as a regression
+        alpha: Significance level of the Mann-Whitney test
+        normalize: Scale new timings by the ratio of the calibrations
+
+    Returns:
+        One comparison per (implementation, n) pair, and the speed factor
+        the new timings were divided by
+    """
+    factor = 1.0
+    if normalize and baseline.get("calibration_ns") and current.get("calibration_ns"):
+        factor = current["calibration_ns"] / baseline["calibration_ns"]
+
+    def keyed(data: Dict[str, Any]) -> Dict[Tuple[str, int], Measurement]:
+        return {(r["name"], r["n"]): Measurement.from_dict(r) for r in data["results"]}
+
+    old, new = keyed(baseline), keyed(current)
+    comparisons = []
+    for key in list(old) + [k for k in new if k not in old]:
+        name, n = key
+        if key not in new:
+            comparisons.append(
+                Comparison(name, n, old[key].median, None, None, None, "missing")
+            )
+            continue
+        samples = [t / factor for t in new[key].samples]
+        new_median = Measurement(name, n, 1, samples).median
+        if key not in old:
+            comparisons.append(Comparison(name, n, None, new_median, None, None, "new"))
+            continue
+        before = old[key].samples
+        p_slower = mann_whitney_greater(before, samples)
+        p_faster = mann_whitney_greater(samples, before)
+        testable = _testable(len(before), len(samples), alpha)
+        base_median = old[key].median
+        slower = new_median > base_median * (1 + threshold)
+        faster = new_median * (1 + threshold) < base_median
+        verdict = "same"
+        if (slower or faster) and not testable:
+            verdict = "unconfirmed"
+        elif slower and p_slower < alpha:
+            verdict = "regressed"
+        elif faster and p_faster < alpha:
+            verdict = "improved"
+        comparisons.append(
+            Comparison(name, n, base_median, new_median, p_slower, p_faster, verdict)
+        )
+    return comparisons, factor
+
+
+def format_comparisons(comparisons: Sequence[Comparison]) -> str:
+    """
+    Format comparisons as a compact diff table.
+
+    Args:
+        comparisons: Output of compare()
+
+    Returns:
+        Table with one row per (implementation, n) pair
+    """
+    lines = [
+        f"{'implementation':<26} {'n':>12} {'baseline':>12} {'new':>12} "
+        f"{'change':>8} {'p':>8}  verdict"
+    ]
+    for c in comparisons:
+        change = "-" if c.change is None else f"{c.change:+.1%}"
+        if c.verdict == "improved" or (c.change is not None and c.change < 0):
+            p = c.p_faster
+        else:
+            p = c.p_slower
+        p_text = "-" if p is None else f"{p:.3f}"
+        baseline = "-" if c.baseline is None else format_time(c.baseline)
+        current = "-" if c.current is None else format_time(c.current)
+        lines.append(
+            f"{c.name:<26} {c.n:>12} {baseline:>12} {current:>12} "
+            f"{change:>8} {p_text:>8}  {c.verdict}"
+        )
+    return "\n".join(lines)
+
+
+def rerun(baseline: Dict[str, Any], min_time: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Benchmark the (implementation, n) pairs of a baseline again.
+
+    Args:
+        baseline: Stored report
+        min_time: Time budget per measurement, the harness default if None
+
+    Returns:
+        A new report covering the same pairs
+    """
+    if min_time is None:
+        min_time = DEFAULT_MIN_TIME
+    results = []
+    for entry in baseline["results"]:
+        impl = get(entry["name"])
+        result = measure(impl.resolve(), entry["n"], name=impl.name, min_time=min_time)
+        result.problem = impl.problem
+        results.append(result)
+    return report(results)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point: compare reports and gate on regressions."""
+    parser = argparse.ArgumentParser(
+        prog="python -m algorithms.compare",
+        description="Compare a benchmark run with a stored baseline",
+    )
+    parser.add_argument("baseline", help="baseline JSON report")
+    parser.add_argument("current", nargs="?", help="new JSON report (default: run now)")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"relative slowdown that fails the gate (default {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA)
+    parser.add_argument(
+        "--no-normalize", action="store_true", help="ignore the machine calibrations"
+    )
+    parser.add_argument("--min-time", type=float, help="seconds per measurement of a fresh run")
+    parser.add_argument("--json", metavar="PATH", help="save the fresh run's report")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    if args.current:
+        current = json.loads(Path(args.current).read_text())
+    else:
+        current = rerun(baseline, args.min_time)
+        if args.json:
+            Path(args.json).write_text(json.dumps(current, indent=2) + "\n")
+
+    if not args.no_normalize and not (
+        baseline.get("calibration_ns") and current.get("calibration_ns")
+    ):
+        print("warning: a report has no calibration; timings are not normalized", file=sys.stderr)
+    comparisons, factor = compare(
+        baseline, current, args.threshold, args.alpha, normalize=not args.no_normalize
+    )
+    if factor != 1.0:
+        print(f"New timings divided by {factor:.3f} (machine calibration ratio)")
+    print(format_comparisons(comparisons))
+    unconfirmed = [c for c in comparisons if c.verdict == "unconfirmed"]
+    for c in unconfirmed:
+        print(
+            f"warning: {c.name}({c.n}) changed by {c.change:+.1%} with too few "
+            "repetitions to test; not counted as a regression",
+            file=sys.stderr,
+        )
+    regressed = [c for c in comparisons if c.verdict == "regressed"]
+    if regressed:
+        print(f"\n{len(regressed)} regression(s) beyond {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    from algorithms import profiling
+
+    with profiling.from_argv("compare") as argv:
+        sys.exit(main(argv))
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Empirical complexity fitting
+
+Timings over a geometric series of sizes are fitted by least squares to
+
+    ln T = c + a ln n + b ln ln n        (polynomial classes)
+    ln T = c + n ln beta                 (exponential classes)
+
+and the fitted curve is compared with the class documented in the registry.
+Over a finite range the exponent and the log factor trade off against each
+other, so the comparison uses the effective log-log slope of each curve
+across the measured range rather than a and b separately. An
+implementation whose measured growth is steeper than documented by more
+than the tolerance is flagged, which catches accidental quadratic
+behaviour.
+"""
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+# Slack, in log-log slope (or log2 of the exponential base), allowed
+# between the fitted and the documented growth
+DEFAULT_TOLERANCE = 0.25
+
+_PHI = (1 + math.sqrt(5)) / 2
+
+_FACTOR = re.compile(
+    r"\s*(?:"
+    r"(?P<base>\d+(?:\.\d+)?|phi)\^n"
+    r"|n\^(?P<power>\d+(?:\.\d+)?)"
+    r"|(?P<sqrt>sqrt\(n\))"
+    r"|(?P<loglog>log log n)"
+    r"|log\^(?P<log_power>\d+(?:\.\d+)?) n"
+    r"|(?P<log>log n)"
+    r"|(?P<divlog>/ ?log n)"
+    r"|(?P<n>n)"
+    r"|(?P<one>1)"
+    r")\s*\*?"
+)
+
+
+@dataclass(frozen=True)
+class Complexity:
+    """
+    A growth class n^power (ln n)^log_power (ln ln n)^loglog_power base^n.
+
+    Attributes:
+        power: Exponent of n
+        log_power: Exponent of the log n factor
+        loglog_power: Exponent of the log log n factor
+        base: Base of an exponential factor, 1 for polynomial classes
+    """
+
+    power: float = 0.0
+    log_power: float = 0.0
+    loglog_power: float = 0.0
+    base: float = 1.0
+
+    @property
+    def exponential(self) -> bool:
+        """Whether the class grows exponentially."""
+        return self.base > 1
+
+    def log_value(self, n: float) -> float:
+        """Natural log of the growth function at n (n > e)."""
+        log_n = math.log(n)
+        return (
+            self.power * log_n
+            + self.log_power * math.log(log_n)
+            + self.loglog_power * math.log(math.log(log_n))
+            + n * math.log(self.base)
+        )
+
+    def slope(self, lo: float, hi: float) -> float:
+        """Average log-log slope of the growth function between lo and hi."""
+        return (self.log_value(hi) - self.log_value(lo)) / math.log(hi / lo)
+
+
+def parse_complexity(text: str) -> Complexity:
+    """
+    Parse a big-O string such as "O(n log log n)" or "O(log^3 n)".
+
+    Supported factors, multiplied together: 1, n, n^k, sqrt(n), log n,
+    log^k n, log log n, and exponentials k^n or phi^n. A trailing
+    "/ log n" divides by log n.
+
+    Args:
+        text: Complexity in big-O notation
+
+    Returns:
+        The parsed growth class
+
+    Raises:
+        ValueError: If the string is not understood
+    """
+    match = re.fullmatch(r"\s*O\((.*)\)\s*", text)
+    if not match:
+        raise ValueError(f"Not a big-O expression: {text!r}")
+    body = match.group(1)
+    power = log_power = loglog_power = 0.0
+    base = 1.0
+    pos = 0
+    while pos < len(body):
+        factor = _FACTOR.match(body, pos)
+        if not factor or factor.end() == pos:
+            raise ValueError(f"Cannot parse complexity {text!r} at {body[pos:]!r}")
+        pos = factor.end()
+        if factor.group("base"):
+            value = factor.group("base")
+            base *= _PHI if value == "phi" else float(value)
+        elif factor.group("power"):
+            power += float(factor.group("power"))
+        elif factor.group("sqrt"):
+            power += 0.5
+        elif factor.group("loglog"):
+            loglog_power += 1
+        elif factor.group("log_power"):
+            log_power += float(factor.group("log_power"))
+        elif factor.group("log"):
+            log_power += 1
+        elif factor.group("divlog"):
+            log_power -= 1
+        elif factor.group("n"):
+            power += 1
+    return Complexity(power, log_power, loglog_power, base)
+
+
+def _least_squares(rows: List[List[float]], ys: List[float]) -> List[float]:
+    """Solve min ||A x - y|| through the normal equations."""
+    k = len(rows[0])
+    # Augmented normal matrix [A^T A | A^T y]
+    m = [
+        [sum(r[i] * r[j] for r in rows) for j in range(k)]
+        + [sum(r[i] * y for r, y in zip(rows, ys))]
+        for i in range(k)
+    ]
+    for col in range(k):
+        pivot = max(range(col, k), key=lambda r: abs(m[r][col]))
+        if abs(m[pivot][col]) < 1e-12:
+            raise ValueError("Singular least-squares system")
+        m[col], m[pivot] = m[pivot], m[col]
+        for r in range(k):
+            if r != col:
+                ratio = m[r][col] / m[col][col]
+                m[r] = [a - ratio * b for a, b in zip(m[r], m[col])]
+    return [m[i][k] / m[i][i] for i in range(k)]
+
+
+@dataclass
+class Fit:
+    """
+    Least-squares fit of a measured cost (time or memory) against input size.
+
+    Attributes:
+        name: Implementation name
+        documented: Documented complexity string
+        sizes: Input sizes used in the fit
+        values: Measured cost at each size, in unit
+        fitted: Fitted growth class (its constant factor is dropped)
+        slope: Effective log-log slope of the fitted curve (log2 of the
+            fitted base for exponential classes)
+        expected: The same quantity for the documented class
+        status: "ok", "above" when growth is steeper than documented,
+            "below" when the documented class is a loose bound, or
+            "insufficient" with fewer than two usable sizes
+        tolerance: Slack allowed before flagging
+        intercept: Natural log of the fitted constant factor
+        unit: Unit of values, "ns" for timings or "bytes" for memory
+    """
+
+    name: str
+    documented: str
+    sizes: List[int]
+    values: List[float]
+    fitted: Optional[Complexity]
+    slope: float
+    expected: float
+    status: str
+    tolerance: float = DEFAULT_TOLERANCE
+    intercept: float = 0.0
+    unit: str = "ns"
+
+    def predict(self, n: float) -> float:
+        """Value of the fitted curve at n, in the unit of the values."""
+        if self.fitted is None:
+            raise ValueError("No fitted curve")
+        return math.exp(self.intercept + self.fitted.log_value(n))
+
+    def solve(self, value: float, upper: float = 1e30) -> Optional[float]:
+        """
+        Return the n at which the fitted curve reaches value.
+
+        Extrapolates beyond the measured sizes by bisection on log n.
+
+        Args:
+            value: Target, in the unit of the values
+            upper: Largest n considered
+
+        Returns:
+            The crossing point, the smallest measured size if the curve is
+            already above value there, or None if it stays below up to upper
+        """
+        fitted = self.fitted
+        if fitted is None:
+            return None
+        lo, hi = math.log(self.sizes[0]), math.log(upper)
+        target = math.log(value) - self.intercept
+
+        def excess(x: float) -> float:
+            return fitted.log_value(math.exp(x)) - target
+
+        if excess(lo) >= 0:
+            return self.sizes[0]
+        if excess(hi) < 0:
+            return None
+        for _ in range(200):
+            mid = (lo + hi) / 2
+            if excess(mid) < 0:
+                lo = mid
+            else:
+                hi = mid
+        return math.exp(hi)
+
+    @property
+    def flagged(self) -> bool:
+        """Whether the measured growth exceeds the documented class."""
+        return self.status == "above"
+
+    def describe(self) -> str:
+        """Short text form of the fitted class."""
+        if self.fitted is None:
+            return "-"
+        if self.fitted.exponential:
+            return f"{self.fitted.base:.3f}^n"
+        text = f"n^{self.fitted.power:.2f}"
+        if abs(self.fitted.log_power) >= 0.05:
+            text += f" log^{self.fitted.log_power:.2f} n"
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable summary."""
+        fitted = None
+        if self.fitted is not None:
+            fitted = {
+                "power": self.fitted.power,
+                "log_power": self.fitted.log_power,
+                "base": self.fitted.base,
+            }
+        return {
+            "name": self.name,
+            "documented": self.documented,
+            "sizes": self.sizes,
+            "values": self.values,
+            "unit": self.unit,
+            "fitted": fitted,
+            "slope": self.slope,
+            "expected_slope": self.expected,
+            "status": self.status,
+            "tolerance": self.tolerance,
+            "intercept": self.intercept,
+        }
+
+
+def fit_complexity(
+    name: str,
+    documented: str,
+    sizes: Sequence[int],
+    values: Sequence[float],
+    tolerance: float = DEFAULT_TOLERANCE,
+    unit: str = "ns",
+) -> Fit:
+    """
+    Fit measured costs to a growth class and compare it with the documented one.
+
+    Polynomial classes fit ln T = c + a ln n + b ln ln n when there are at
+    least four sizes (only a with fewer). Exponential classes fit
+    ln T = c + n ln beta. Sizes must exceed e so that ln ln n is defined.
+
+    Args:
+        name: Implementation name
+        documented: Documented complexity, e.g. "O(n log n)"
+        sizes: Input sizes
+        values: Cost at each size, such as time per call or peak bytes
+        tolerance: Allowed excess of the fitted slope over the documented one
+        unit: Unit of values, recorded in the fit
+
+    Returns:
+        The fit and its verdict
+    """
+    doc = parse_complexity(documented)
+    points = sorted(zip(sizes, values))
+    sizes = [n for n, _ in points]
+    values = [v for _, v in points]
+    if len(points) < 2 or sizes[0] == sizes[-1]:
+        return Fit(
+            name,
+            documented,
+            sizes,
+            values,
+            None,
+            math.nan,
+            math.nan,
+            "insufficient",
+            tolerance,
+            unit=unit,
+        )
+
+    lo, hi = sizes[0], sizes[-1]
+    ys = [math.log(v) for v in values]
+    if doc.exponential:
+        intercept, log_base = _least_squares([[1.0, float(n)] for n in sizes], ys)
+        fitted = Complexity(base=math.exp(log_base))
+        slope = log_base / math.log(2)
+        expected = math.log2(doc.base)
+    else:
+        if len(points) >= 4:
+            rows = [[1.0, math.log(n), math.log(math.log(n))] for n in sizes]
+            intercept, a, b = _least_squares(rows, ys)
+        else:
+            intercept, a = _least_squares([[1.0, math.log(n)] for n in sizes], ys)
+            b = 0.0
+        fitted = Complexity(power=a, log_power=b)
+        slope = fitted.slope(lo, hi)
+        expected = doc.slope(lo, hi)
+
+    if slope > expected + tolerance:
+        status = "above"
+    elif slope < expected - tolerance:
+        status = "below"
+    else:
+        status = "ok"
+    return Fit(
+        name, documented, sizes, values, fitted, slope, expected, status, tolerance, intercept, unit
+    )
+
+
+def format_fits(fits: Sequence[Fit]) -> str:
+    """
+    Format fits as an aligned text table.
+
+    Args:
+        fits: Fits to show
+
+    Returns:
+        Table with one row per implementation
+    """
+    lines = [
+        f"{'implementation':<26} {'documented':<24} {'fitted':<22} "
+        f"{'slope':>7} {'expected':>9} {'sizes':>15}  status"
+    ]
+    for f in fits:
+        span = f"{f.sizes[0]:.0e}-{f.sizes[-1]:.0e}" if f.sizes else "-"
+        lines.append(
+            f"{f.name:<26} {f.documented:<24} {f.describe():<22} "
+            f"{f.slope:>7.2f} {f.expected:>9.2f} {span:>15}  {f.status}"
+        )
+    return "\n".join(lines)
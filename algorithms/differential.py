@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Differential testing across the registered implementations
+
+Every implementation of a problem should give the same answer. This engine
+draws arguments for each problem and runs every registered implementation
+that supports them in parallel worker processes. It then reports any
+argument on which they disagree. There are two kinds of argument:
+
+- a few log-uniform draws from every decade up to a maximum size, so large
+  inputs are covered as well as small ones
+- boundary values where implementations tend to break: 0, 1, 2, perfect
+  squares and their neighbours, powers of two, the segment edges of
+  segmented_sieve, pseudoprimes and the internal thresholds of the
+  factorial kernels
+
+Each call runs under a timeout. An implementation that times out is
+skipped at every larger argument, so slow references such as
+primes_up_to only cover the range they can. Workers send back a digest of
+each result rather than the result itself. A disagreement is shrunk to
+the smallest argument found that still shows it.
+
+    python -m algorithms.differential [--problem primes] [--max-n 10000000]
+
+The exit status is 1 if any disagreement was found.
+"""
+import argparse
+import hashlib
+import math
+import multiprocessing
+import os
+import random
+import signal
+import sys
+import time
+from array import array
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from algorithms.factorial import _PARALLEL_MIN_N, _PRODUCT_TREE_LEAF
+from algorithms.registry import PROBLEMS, Implementation, implementations
+
+# Largest argument drawn per problem by default
+DEFAULT_MAX_N: Dict[str, int] = {
+    "fib": 10**5,
+    "factorial": 3 * 10**4,
+    "primes": 10**7,
+    "is_prime": 10**18,
+}
+DEFAULT_PER_STRATUM = 3
+DEFAULT_TIMEOUT = 2.0
+
+# Segment length of segmented_sieve's default argument
+_SEGMENT = 10000
+
+# Carmichael numbers and strong pseudoprimes to the first few prime bases,
+# which fool weak primality tests
+_PSEUDOPRIMES = (
+    561,
+    1105,
+    1729,
+    2047,
+    3277,
+    4033,
+    4681,
+    8321,
+    25326001,
+    3215031751,
+    2152302898747,
+    3474749660383,
+    341550071728321,
+    3825123056546413051,
+)
+
+TIMEOUT = "timeout"
+
+
+def strata(max_n: int, per_stratum: int, rng: random.Random) -> List[int]:
+    """
+    Draw arguments log-uniformly from every decade up to max_n.
+
+    Args:
+        max_n: Largest argument
+        per_stratum: Draws per decade
+        rng: Random source
+
+    Returns:
+        The drawn arguments
+    """
+    values = []
+    top = math.log10(max_n) if max_n > 1 else 0.0
+    decade = 0
+    while decade < top:
+        lo, hi = decade, min(decade + 1, top)
+        for _ in range(per_stratum):
+            values.append(int(10 ** rng.uniform(lo, hi)))
+        decade += 1
+    return values
+
+
+def boundaries(problem: str, max_n: int) -> List[int]:
+    """
+    Return boundary arguments for a problem up to max_n.
+
+    Args:
+        problem: One of PROBLEMS
+        max_n: Largest argument
+
+    Returns:
+        Arguments near edges where implementations change behaviour
+    """
+    values: Set[int] = {0, 1, 2, 3, 4, 5}
+    k = 1
+    while k * k <= max_n:
+        values.update((k * k - 1, k * k, k * k + 1))
+        k = k * 2 if k >= 64 else k + 1
+    for bits in range(1, max_n.bit_length()):
+        values.update(((1 << bits) - 1, 1 << bits, (1 << bits) + 1))
+    if problem == "primes":
+        # The first segment starts just above isqrt(n); a segment edge
+        # falls on n when n - isqrt(n) is a multiple of the segment length
+        for edge in (_SEGMENT, 2 * _SEGMENT, 10 * _SEGMENT, 100 * _SEGMENT):
+            n = edge
+            while n - math.isqrt(n) < edge:
+                n += 1
+            values.update((n - 1, n, n + 1))
+    elif problem == "is_prime":
+        values.update(_PSEUDOPRIMES)
+        values.update(p * p for p in (10007, 65521, 999983, 2147483647))
+        values.update((2**31 - 1, 2**61 - 1, 2**61 + 1))
+    elif problem == "factorial":
+        for edge in (_PRODUCT_TREE_LEAF, 2 * _PRODUCT_TREE_LEAF, _PARALLEL_MIN_N):
+            values.update((edge - 1, edge, edge + 1))
+    return sorted(v for v in values if 0 <= v <= max_n)
+
+
+def generate(
+    problem: str,
+    max_n: Optional[int] = None,
+    per_stratum: int = DEFAULT_PER_STRATUM,
+    seed: Optional[int] = None,
+) -> List[int]:
+    """
+    Return the sorted arguments to test for a problem.
+
+    Args:
+        problem: One of PROBLEMS
+        max_n: Largest argument, DEFAULT_MAX_N for the problem if None
+        per_stratum: Random draws per decade
+        seed: Seed for the draws
+
+    Returns:
+        Boundary values and stratified draws, without duplicates
+    """
+    max_n = DEFAULT_MAX_N[problem] if max_n is None else max_n
+    rng = random.Random(seed)
+    return sorted(set(boundaries(problem, max_n)) | set(strata(max_n, per_stratum, rng)))
+
+
+def digest(value: Any) -> str:
+    """
+    Summarise a result compactly enough to send between processes.
+
+    Small integers and booleans are kept as they are. Large integers and
+    lists are reduced to their size and a SHA-256 prefix.
+    """
+    if isinstance(value, bool) or (isinstance(value, int) and value.bit_length() <= 64):
+        return repr(value)
+    if isinstance(value, int):
+        data = value.to_bytes(value.bit_length() // 8 + 1, "little", signed=True)
+        return f"int[{value.bit_length()} bits] {hashlib.sha256(data).hexdigest()[:16]}"
+    if isinstance(value, list):
+        try:
+            data = array("q", value).tobytes()
+        except (OverflowError, TypeError):
+            data = repr(value).encode()
+        return f"list[{len(value)}] {hashlib.sha256(data).hexdigest()[:16]}"
+    return repr(value)
+
+
+def _outcome(impl: Implementation, n: int) -> str:
+    """Call impl(n) and return the digest of the result or of the error."""
+    try:
+        return digest(impl.resolve()(n))
+    except Exception as exc:  # noqa: BLE001 - every failure is an outcome
+        return f"raised {type(exc).__name__}"
+
+
+def _serve(conn: Connection) -> None:
+    """Worker loop: evaluate (implementation, n) tasks until sent None."""
+    # A process group of its own lets _stop() take down any pool an
+    # implementation such as factorial_parallel starts
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    while True:
+        task = conn.recv()
+        if task is None:
+            return
+        conn.send(_outcome(*task))
+
+
+Task = Tuple[Implementation, int]
+
+
+def _stop(process: Any) -> None:
+    """Terminate a worker together with any processes it started."""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    process.terminate()
+    process.join()
+
+
+class _Pool:
+    """
+    Worker processes that each run one task at a time under a deadline.
+
+    A worker that overruns is terminated and replaced, which a
+    concurrent.futures pool cannot do for a single call. Workers are not
+    daemonic, since a daemonic process may not start children and
+    factorial_parallel does; close() stops them instead.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self._context = multiprocessing.get_context()
+        self._workers = [self._spawn() for _ in range(workers)]
+
+    def _spawn(self) -> Tuple[Any, Connection]:
+        parent, child = self._context.Pipe()
+        process = self._context.Process(target=_serve, args=(child,))
+        process.start()
+        child.close()
+        return process, parent
+
+    def close(self) -> None:
+        """Stop every worker."""
+        for process, conn in self._workers:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            process.join(1)
+            if process.is_alive():
+                _stop(process)
+            conn.close()
+
+    def map(self, tasks: Sequence[Task], timeout: float) -> Dict[Task, str]:
+        """
+        Evaluate tasks in parallel, skipping after timeouts.
+
+        Tasks of one implementation should be in increasing n. Once one
+        times out, that implementation's later tasks are skipped and left
+        out of the result.
+
+        Args:
+            tasks: (implementation, n) pairs
+            timeout: Seconds allowed per call
+
+        Returns:
+            Digest, error or TIMEOUT per evaluated task
+        """
+        pending = list(tasks)
+        pending.reverse()
+        results: Dict[Task, str] = {}
+        timed_out: Dict[str, int] = {}
+        running: Dict[int, Tuple[Task, float]] = {}
+        while pending or running:
+            for slot in range(len(self._workers)):
+                if slot in running:
+                    continue
+                while pending:
+                    task = pending.pop()
+                    impl, n = task
+                    if impl.name not in timed_out or n < timed_out[impl.name]:
+                        self._workers[slot][1].send(task)
+                        running[slot] = (task, time.monotonic() + timeout)
+                        break
+            if not running:
+                break
+            deadline = min(end for _, end in running.values())
+            ready = wait(
+                [self._workers[slot][1] for slot in running],
+                max(0.0, deadline - time.monotonic()),
+            )
+            now = time.monotonic()
+            for slot, (task, end) in list(running.items()):
+                process, conn = self._workers[slot]
+                if conn in ready:
+                    results[task] = conn.recv()
+                elif now >= end:
+                    _stop(process)
+                    conn.close()
+                    self._workers[slot] = self._spawn()
+                    results[task] = TIMEOUT
+                    impl, n = task
+                    timed_out[impl.name] = min(n, timed_out.get(impl.name, n))
+                else:
+                    continue
+                del running[slot]
+        return results
+
+
+@dataclass
+class Disagreement:
+    """
+    An argument on which implementations give different answers.
+
+    Attributes:
+        problem: Problem name
+        n: Smallest argument found that still shows the disagreement
+        original_n: Argument it was first seen at
+        outcomes: Implementation names per distinct result digest
+        detail: First differing element of list results, if found
+    """
+
+    problem: str
+    n: int
+    original_n: int
+    outcomes: Dict[str, List[str]]
+    detail: str = ""
+
+
+@dataclass
+class Summary:
+    """
+    Result of a differential run over one problem.
+
+    Attributes:
+        problem: Problem name
+        arguments: Number of arguments tested
+        calls: Number of implementation calls made
+        timeouts: First argument at which each implementation timed out
+        disagreements: Disagreements found, minimized
+    """
+
+    problem: str
+    arguments: int
+    calls: int
+    timeouts: Dict[str, int] = field(default_factory=dict)
+    disagreements: List[Disagreement] = field(default_factory=list)
+
+
+def _group(outcomes: Dict[str, str]) -> Dict[str, List[str]]:
+    """Group implementation names by outcome, leaving out timeouts."""
+    groups: Dict[str, List[str]] = {}
+    for name, outcome in outcomes.items():
+        if outcome != TIMEOUT:
+            groups.setdefault(outcome, []).append(name)
+    return groups
+
+
+def _first_difference(impls: Sequence[Implementation], n: int) -> str:
+    """Describe the first index where list results differ, computed in this process."""
+    values = [impl.resolve()(n) for impl in impls]
+    lists = [v for v in values if isinstance(v, list)]
+    if len(lists) != len(values):
+        return ""
+    reference = lists[0]
+    for impl, value in zip(impls[1:], lists[1:]):
+        for i, (a, b) in enumerate(zip(reference, value)):
+            if a != b:
+                return (
+                    f"first difference at index {i}: "
+                    f"{impls[0].name} has {a}, {impl.name} has {b}"
+                )
+        if len(reference) != len(value):
+            return (
+                f"{impls[0].name} returns {len(reference)} elements, "
+                f"{impl.name} {len(value)}; the shorter is a prefix"
+            )
+    return ""
+
+
+def minimize(
+    pool: _Pool, impls: Sequence[Implementation], n: int, timeout: float
+) -> Tuple[int, Dict[str, List[str]]]:
+    """
+    Shrink an argument on which impls disagree.
+
+    Steps down from n by decreasing powers of two, keeping every step that
+    still disagrees. When the disagreement persists for all larger
+    arguments, as it does for a list of primes, this finds the smallest
+    failing argument exactly. Otherwise it stops at a local minimum.
+
+    Args:
+        pool: Workers to evaluate on
+        impls: Implementations that disagree at n
+        n: Failing argument
+        timeout: Seconds allowed per call
+
+    Returns:
+        The smallest failing argument found and its outcome groups
+    """
+
+    def groups_at(m: int) -> Dict[str, List[str]]:
+        active = [impl for impl in impls if impl.supports(m)]
+        results = pool.map([(impl, m) for impl in active], timeout)
+        return _group({impl.name: results.get((impl, m), TIMEOUT) for impl in active})
+
+    best = groups_at(n)
+    step = 1 << n.bit_length()
+    while step:
+        candidate = n - step
+        if candidate >= 0:
+            groups = groups_at(candidate)
+            if len(groups) > 1:
+                n, best = candidate, groups
+                continue
+        step >>= 1
+    return n, best
+
+
+def run(
+    problems: Iterable[str] = PROBLEMS,
+    max_n: Optional[int] = None,
+    per_stratum: int = DEFAULT_PER_STRATUM,
+    names: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    seed: Optional[int] = None,
+    impls: Optional[Sequence[Implementation]] = None,
+) -> List[Summary]:
+    """
+    Cross-check the implementations of each problem.
+
+    Args:
+        problems: Problems to test
+        max_n: Largest argument, DEFAULT_MAX_N per problem if None
+        per_stratum: Random draws per decade
+        names: Restrict to these implementations (at least two per problem)
+        workers: Worker processes, os.cpu_count() if None
+        timeout: Seconds allowed per call
+        seed: Seed for the random draws
+        impls: Implementations to use instead of the registry
+
+    Returns:
+        One summary per problem
+    """
+    pool = _Pool(workers or multiprocessing.cpu_count())
+    summaries = []
+    try:
+        for problem in problems:
+            candidates = [
+                impl
+                for impl in (impls if impls is not None else implementations(problem))
+                if impl.problem == problem and (not names or impl.name in names)
+            ]
+            arguments = generate(problem, max_n, per_stratum, seed)
+            tasks = [(impl, n) for impl in candidates for n in arguments if impl.supports(n)]
+            results = pool.map(tasks, timeout)
+            summary = Summary(problem, len(arguments), len(results))
+            # A bug usually shows at every argument above some size; each
+            # split of the implementations is minimized only once
+            seen: Set[FrozenSet[FrozenSet[str]]] = set()
+            for (impl, n), outcome in results.items():
+                if outcome == TIMEOUT:
+                    summary.timeouts[impl.name] = n
+            for n in arguments:
+                outcomes = {
+                    impl.name: results[(impl, n)] for impl in candidates if (impl, n) in results
+                }
+                groups = _group(outcomes)
+                split = frozenset(frozenset(group) for group in groups.values())
+                if len(groups) < 2 or split in seen:
+                    continue
+                seen.add(split)
+                involved = [impl for impl in candidates if impl.name in outcomes]
+                small, groups = minimize(pool, involved, n, timeout)
+                detail = ""
+                if small <= 10**6:
+                    detail = _first_difference(
+                        [impl for impl in involved if impl.supports(small)], small
+                    )
+                summary.disagreements.append(Disagreement(problem, small, n, groups, detail))
+            summaries.append(summary)
+    finally:
+        pool.close()
+    return summaries
+
+
+def format_summaries(summaries: Sequence[Summary]) -> str:
+    """
+    Format differential results as text.
+
+    Args:
+        summaries: Output of run()
+
+    Returns:
+        One block per problem
+    """
+    lines = []
+    for s in summaries:
+        status = "ok" if not s.disagreements else f"{len(s.disagreements)} disagreement(s)"
+        lines.append(f"{s.problem}: {s.arguments} arguments, {s.calls} calls, {status}")
+        for name, n in sorted(s.timeouts.items()):
+            lines.append(f"  {name} timed out at n={n}; skipped above it")
+        for d in s.disagreements:
+            lines.append(f"  n={d.n} (first seen at n={d.original_n}):")
+            for outcome, impl_names in d.outcomes.items():
+                lines.append(f"    {', '.join(impl_names)}: {outcome}")
+            if d.detail:
+                lines.append(f"    {d.detail}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point: cross-check implementations."""
+    parser = argparse.ArgumentParser(
+        prog="python -m algorithms.differential",
+        description="Cross-check every registered implementation",
+    )
+    parser.add_argument("--problem", action="append", choices=PROBLEMS, help="problem to test")
+    parser.add_argument("--impl", action="append", help="implementation to include")
+    parser.add_argument("--max-n", type=int, help="largest argument (default: per problem)")
+    parser.add_argument("--per-stratum", type=int, default=DEFAULT_PER_STRATUM)
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per call")
+    parser.add_argument("--seed", type=int, help="seed for the random draws")
+    args = parser.parse_args(argv)
+
+    summaries = run(
+        args.problem or PROBLEMS,
+        max_n=args.max_n,
+        per_stratum=args.per_stratum,
+        names=args.impl,
+        workers=args.workers,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    print(format_summaries(summaries))
+    return 1 if any(s.disagreements for s in summaries) else 0
+
+
+if __name__ == "__main__":
+    from algorithms import profiling
+
+    with profiling.from_argv("differential") as argv:
+        sys.exit(main(argv))
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Auto-selecting entry points for each problem
+
+fib(), factorial(), primes() and is_prime() pick the fastest registered
+implementation for the size of their argument. The choice follows a plan
+per problem: a list of (upper bound, implementation) pairs, read in order,
+where the first entry whose bound exceeds n wins.
+
+Plans come from calibrate(), which times every implementation on this
+machine and stores the crossover points as JSON. The file is looked up in
+$ALGORITHMS_CALIBRATION, falling back to ~/.cache/isolated-pymcp/. Until a
+calibration exists the built-in DEFAULT_PLANS are used.
+
+Large results of fib(), factorial() and primes() are kept in the
+persistent store of algorithms.cache when $ALGORITHMS_CACHE is set.
+"""
+import json
+import math
+import os
+import platform
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, cast
+
+from algorithms.bench import argument, measure
+from algorithms.cache import persistent
+from algorithms.registry import PROBLEMS, Implementation, get, implementations
+
+CALIBRATION_ENV = "ALGORITHMS_CALIBRATION"
+CALIBRATION_VERSION = 1
+
+Plan = List[Tuple[Optional[int], str]]
+
+# Crossovers measured on a 64-bit Linux machine with CPython 3.11
+DEFAULT_PLANS: Dict[str, Plan] = {
+    "fib": [(17, "fib_iterative"), (None, "fib_fast_doubling")],
+    "factorial": [(17320, "factorial_math"), (None, "factorial_prime_swing")],
+    "primes": [(None, "sieve_of_eratosthenes")],
+    "is_prime": [(316227, "is_prime_optimized"), (None, "is_prime_miller_rabin")],
+}
+
+# Argument sizes timed by calibrate(); implementations drop out once a single
+# call exceeds the time limit, so the large sizes only see the fast ones.
+CALIBRATION_SIZES: Dict[str, Sequence[int]] = {
+    "fib": [10**k for k in range(1, 7)] + [3 * 10**k for k in range(1, 6)],
+    "factorial": [10**k for k in range(1, 6)] + [3 * 10**k for k in range(1, 5)],
+    "primes": [10**k for k in range(1, 7)] + [3 * 10**k for k in range(1, 6)],
+    "is_prime": [10**k for k in range(1, 19)],
+}
+
+_plans: Optional[Dict[str, Plan]] = None
+
+
+def calibration_path() -> Path:
+    """Return the file calibrate() writes and the dispatcher reads."""
+    override = os.environ.get(CALIBRATION_ENV)
+    if override:
+        return Path(override)
+    return Path.home() / ".cache" / "isolated-pymcp" / "calibration.json"
+
+
+def _machine() -> Dict[str, Any]:
+    """Fingerprint of the machine a calibration is valid for."""
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+    }
+
+
+def _load_plans() -> Dict[str, Plan]:
+    """Read the calibration file, falling back to DEFAULT_PLANS."""
+    plans = {problem: list(plan) for problem, plan in DEFAULT_PLANS.items()}
+    try:
+        with open(calibration_path()) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return plans
+    # A calibration from another machine or interpreter says nothing about this one
+    if data.get("version") != CALIBRATION_VERSION or data.get("machine") != _machine():
+        return plans
+    for problem, plan in data.get("plans", {}).items():
+        if problem in plans:
+            plans[problem] = [(upper, name) for upper, name in plan]
+    return plans
+
+
+def plans() -> Dict[str, Plan]:
+    """Return the plans in use, loading the calibration file on first use."""
+    global _plans
+    if _plans is None:
+        _plans = _load_plans()
+    return _plans
+
+
+def reset() -> None:
+    """Forget the loaded plans so the calibration file is read again."""
+    global _plans
+    _plans = None
+
+
+def choose(problem: str, n: int) -> Implementation:
+    """
+    Return the implementation the dispatcher uses for argument n.
+
+    The plan entry covering n is used if that implementation supports n;
+    otherwise the last registered implementation that does. Arguments no
+    implementation supports (such as negative n) go to the last registered
+    one, which raises its own error.
+
+    Args:
+        problem: One of PROBLEMS
+        n: Argument of the call
+
+    Returns:
+        The selected implementation
+
+    Raises:
+        ValueError: If the problem is unknown
+    """
+    if problem not in PROBLEMS:
+        raise ValueError(f"Unknown problem {problem!r}; expected one of {', '.join(PROBLEMS)}")
+    for upper, name in plans()[problem]:
+        if upper is None or n < upper:
+            impl = get(name)
+            if impl.supports(n):
+                return impl
+            break
+    candidates = implementations(problem)
+    for impl in reversed(candidates):
+        if impl.supports(n):
+            return impl
+    return candidates[-1]
+
+
+@persistent(min_n=10**5)
+def fib(n: int) -> int:
+    """
+    Return the nth Fibonacci number with the fastest implementation for n.
+
+    Args:
+        n: Position in the Fibonacci sequence (0-indexed)
+
+    Returns:
+        The nth Fibonacci number
+    """
+    return cast(int, choose("fib", n).resolve()(n))
+
+
+@persistent(min_n=10**4)
+def factorial(n: int) -> int:
+    """
+    Return n! with the fastest implementation for n.
+
+    Args:
+        n: Non-negative integer
+
+    Returns:
+        The factorial of n
+    """
+    return cast(int, choose("factorial", n).resolve()(n))
+
+
+@persistent(min_n=10**5)
+def primes(n: int) -> List[int]:
+    """
+    Return all primes up to n with the fastest implementation for n.
+
+    Args:
+        n: Upper limit
+
+    Returns:
+        List of primes up to n
+    """
+    return cast(List[int], choose("primes", n).resolve()(n))
+
+
+def is_prime(n: int) -> bool:
+    """
+    Return whether n is prime with the fastest implementation for n.
+
+    Args:
+        n: Number to check
+
+    Returns:
+        True if n is prime, False otherwise
+    """
+    return cast(bool, choose("is_prime", n).resolve()(n))
+
+
+def _build_plan(winners: List[Tuple[int, str]]) -> Plan:
+    """
+    Compress (size, fastest implementation) pairs into plan entries.
+
+    Each crossover is placed at the geometric mean of the two sizes on
+    either side of it.
+    """
+    plan: Plan = []
+    for (size, name), (next_size, next_name) in zip(winners, winners[1:]):
+        if name != next_name:
+            plan.append((math.isqrt(size * next_size), name))
+    plan.append((None, winners[-1][1]))
+    return plan
+
+
+def calibrate(
+    problems: Iterable[str] = PROBLEMS,
+    path: Optional[Path] = None,
+    time_limit: float = 0.25,
+    budget: float = 0.02,
+) -> Dict[str, Plan]:
+    """
+    Measure crossover points on this machine and store them.
+
+    Each implementation is timed at the CALIBRATION_SIZES inside its range
+    until a single call takes longer than time_limit; the fastest one at
+    each size goes into the plan. The result is written as JSON and used by
+    the dispatcher from then on.
+
+    Args:
+        problems: Problems to calibrate; the others keep their current plans
+        path: Output file, calibration_path() by default
+        time_limit: Slowest single call, in seconds, before an
+            implementation stops being timed at larger sizes
+        budget: Time spent repeating each measurement, in seconds
+
+    Returns:
+        The plans now in use for every problem
+    """
+    measured = dict(plans())
+    for problem in problems:
+        active = implementations(problem)
+        winners: List[Tuple[int, str]] = []
+        for size in sorted(CALIBRATION_SIZES[problem]):
+            arg = argument(problem, size)
+            timings = {}
+            for impl in active:
+                if not impl.supports(arg):
+                    continue
+                timing = measure(impl.resolve(), arg, min_time=budget, min_repeat=1)
+                timings[impl.name] = timing.minimum / 1e9
+            if not timings:
+                break
+            winners.append((size, min(timings, key=timings.__getitem__)))
+            active = [impl for impl in active if timings.get(impl.name, 0.0) <= time_limit]
+        if winners:
+            measured[problem] = _build_plan(winners)
+
+    path = path or calibration_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "version": CALIBRATION_VERSION,
+                "machine": _machine(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "plans": measured,
+            },
+            f,
+            indent=2,
+        )
+    reset()
+    return measured
+
+
+if __name__ == "__main__":
+    from algorithms import profiling
+
+    with profiling.from_argv("dispatch"):
+        print(f"Calibrating dispatcher, writing {calibration_path()}")
+        for problem, plan in calibrate().items():
+            print(f"\n{problem}:")
+            lower = 0
+            for upper, name in plan:
+                span = f"n >= {lower}" if upper is None else f"{lower} <= n < {upper}"
+                print(f"  {span:<28} {name}")
+                if upper is not None:
+                    lower = upper
@@ -6,8 +6,57 @@ This module provides various implementations of the factorial function
 to demonstrate different approaches and their performance characteristics.
 """
 import math
-import time
-from functools import lru_cache
+import os
+from array import array
+from bisect import bisect_right
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Sequence, Tuple
+
+from algorithms.primes import sieve_of_eratosthenes
+
+# decimal and concurrent.futures are imported by the functions that use
+# them; together they would make up most of this module's import time
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+    from algorithms.bench import Measurement
+
+# Ranges shorter than this are multiplied directly instead of split further
+_PRODUCT_TREE_LEAF = 16
+
+# Below this n a process pool costs more than it saves
+_PARALLEL_MIN_N = 20000
+
+# Ranges of at least this length use the O(sqrt(n) log n) modular product
+_MOD_PRODUCT_SQRT_THRESHOLD = 1 << 15
+
+# log(k!) for k up to this cutoff comes from a cumulative sum of logs; above
+# it the Stirling series (what lgamma evaluates) is accurate to double precision
+_LOG_FACTORIAL_CUTOFF = 256
+_HALF_LOG_2PI = 0.5 * math.log(2 * math.pi)
+
+# Last non-zero digit of 0! .. 4!, and of 2^e for e >= 1 indexed by e mod 4
+_LAST_NONZERO_SMALL = (1, 1, 2, 6, 4)
+_LAST_DIGIT_POW2 = (6, 2, 4, 8)
+
+# Below this n, n! is cheap enough to compute exactly; above it the
+# log-scale helpers switch to Stirling's series.
+_EXACT_DIGITS_LIMIT = 1000
+
+# Bernoulli numbers B_2 .. B_20 for the Stirling series of ln(n!), as
+# (numerator, denominator)
+_BERNOULLI = (
+    (1, 6),
+    (-1, 30),
+    (1, 42),
+    (-1, 30),
+    (5, 66),
+    (-691, 2730),
+    (7, 6),
+    (-3617, 510),
+    (43867, 798),
+    (-174611, 330),
+)
 
 
 def factorial_recursive(n: int) -> int:
@@ -98,51 +147,1002 @@ def factorial_math(n: int) -> int:
     return math.factorial(n)
 
 
-def benchmark_factorial(n: int) -> None:
+def sequence_product(values: Sequence[int], lo: int = 0, hi: int = -1) -> int:
+    """
+    Multiply values[lo:hi] by balanced binary splitting.
+
+    The general form of product_range() for factors that do not form a
+    range, such as prime powers.
+
+    Time complexity: O(M(r) log k) for k factors and an r-bit result, where
+        M is the multiplication cost
+    Space complexity: O(r) bits, O(log k) stack depth
+
+    Args:
+        values: Factors, indexable
+        lo: First index multiplied
+        hi: Stop index (exclusive), the end of values if negative
+
+    Returns:
+        The product of the factors (1 for an empty slice)
+    """
+    if hi < 0:
+        hi = len(values)
+    if hi - lo <= _PRODUCT_TREE_LEAF:
+        result = 1
+        for i in range(lo, hi):
+            result *= values[i]
+        return result
+    mid = (lo + hi) >> 1
+    return sequence_product(values, lo, mid) * sequence_product(values, mid, hi)
+
+
+def product_range(a: int, b: int, step: int = 1) -> int:
+    """
+    Multiply the integers of range(a, b, step) by balanced binary splitting.
+
+    Both halves of every split have a similar number of digits, so the big
+    multiplications near the root run in Karatsuba territory. This is the
+    kernel behind the product-tree factorial and the falling, rising and
+    double factorials.
+
+    Time complexity: O(M(r) log k) for k factors and an r-bit result, where
+        M is the multiplication cost
+    Space complexity: O(r) bits, O(log k) stack depth
+
+    Args:
+        a: First factor
+        b: Stop value (exclusive), as for range()
+        step: Stride between factors (non-zero, may be negative)
+
+    Returns:
+        The product of the factors (1 for an empty range)
+
+    Raises:
+        ValueError: If step is zero
+    """
+    return sequence_product(range(a, b, step))
+
+
+def falling(n: int, k: int) -> int:
+    """
+    Falling factorial n (n-1) ... (n-k+1) = n! / (n-k)!.
+
+    Args:
+        n: Starting value (any integer)
+        k: Number of factors
+
+    Returns:
+        The falling factorial (1 when k == 0)
+
+    Raises:
+        ValueError: If k is negative
+    """
+    if k < 0:
+        raise ValueError("Input must be non-negative")
+    return product_range(n, n - k, -1)
+
+
+def rising(x: int, k: int) -> int:
+    """
+    Rising factorial (Pochhammer symbol) x (x+1) ... (x+k-1).
+
+    Args:
+        x: Starting value (any integer)
+        k: Number of factors
+
+    Returns:
+        The rising factorial (1 when k == 0)
+
+    Raises:
+        ValueError: If k is negative
+    """
+    if k < 0:
+        raise ValueError("Input must be non-negative")
+    return product_range(x, x + k)
+
+
+def double_factorial(n: int) -> int:
+    """
+    Double factorial n!! = n (n-2) (n-4) ..., ending at 1 or 2.
+
+    Args:
+        n: Number to calculate the double factorial of (n >= -1)
+
+    Returns:
+        n!! (1 for n = -1 and n = 0)
+
+    Raises:
+        ValueError: If n < -1
+    """
+    if n < -1:
+        raise ValueError("Input must be at least -1")
+    return product_range(n, 0, -2)
+
+
+def factorial_product_tree(n: int) -> int:
+    """
+    Product-tree (binary splitting) implementation of factorial.
+
+    Instead of multiplying one small factor into a growing accumulator,
+    2..n is split into balanced sub-ranges whose products are combined
+    pairwise, keeping operands of similar size.
+
+    Time complexity: O(M(n log n) log n) where M is the multiplication cost
+    Space complexity: O(n log n) bits for the result, O(log n) stack depth
+
+    Args:
+        n: Number to calculate factorial of
+
+    Returns:
+        n! (n factorial)
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    return product_range(2, n + 1)
+
+
+def _swing(m: int, primes: List[int]) -> int:
+    """
+    Odd part of the swinging factorial m! / (floor(m/2)!)^2.
+
+    The exponent of an odd prime p in the swing is the number of odd
+    quotients floor(m / p^i), which gives three cheap cases:
+      - p in (m/2, m]: exponent 1
+      - p in (sqrt(m), m/3]: exponent floor(m/p) mod 2
+      - p <= sqrt(m): sum the parities of all quotients
+    Primes in (m/3, m/2] never divide the swing.
+    """
+    if m < 4:
+        return (1, 1, 1, 3)[m]
+    root = bisect_right(primes, math.isqrt(m))
+    third = bisect_right(primes, m // 3)
+    half = bisect_right(primes, m // 2)
+    top = bisect_right(primes, m)
+
+    factors = primes[half:top]
+    factors.extend(p for p in primes[root:third] if (m // p) & 1)
+    for p in primes[1:root]:
+        power, q = 1, m
+        while q:
+            q //= p
+            if q & 1:
+                power *= p
+        if power > 1:
+            factors.append(power)
+    return sequence_product(factors)
+
+
+def factorial_prime_swing(n: int) -> int:
+    """
+    Luschny's prime-swing implementation of factorial.
+
+    Uses n! = (floor(n/2)!)^2 * swing(n): the odd part of n! is built by
+    repeated squaring of the half-size result times the swing, whose prime
+    factorisation comes directly from sieve_of_eratosthenes. The power of
+    two is applied once at the end as a shift.
+
+    Time complexity: O(M(n log n) log n) where M is the multiplication cost
+    Space complexity: O(n) for the prime list plus the result
+
+    Args:
+        n: Number to calculate factorial of
+
+    Returns:
+        n! (n factorial)
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    if n < 2:
+        return 1
+    primes = sieve_of_eratosthenes(n)
+
+    def odd_factorial(m: int) -> int:
+        if m < 2:
+            return 1
+        return odd_factorial(m // 2) ** 2 * _swing(m, primes)
+
+    # n! contains n - popcount(n) factors of two
+    return odd_factorial(n) << (n - bin(n).count("1"))
+
+
+def _range_product_bytes(lo: int, hi: int) -> bytes:
+    """Worker task: product of [lo, hi) as little-endian bytes."""
+    product = product_range(lo, hi)
+    return product.to_bytes((product.bit_length() + 7) // 8, "little")
+
+
+def factorial_parallel(n: int, workers: Optional[int] = None) -> int:
+    """
+    Multi-process product-tree implementation of factorial.
+
+    2..n is split into one contiguous range per worker process. Each worker
+    computes its partial product and sends it back as raw bytes, which is
+    much cheaper than pickling a huge int, and the parent combines the
+    partials with a balanced merge.
+
+    Time complexity: O(M(n log n) log n / workers) for the partials plus the
+        final merge, which stays on one core
+    Space complexity: O(n log n) bits
+
+    Args:
+        n: Number to calculate factorial of
+        workers: Number of worker processes (defaults to os.cpu_count())
+
+    Returns:
+        n! (n factorial)
+
+    Raises:
+        ValueError: If n is negative or workers is not positive
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Worker count must be positive")
+    if workers == 1 or n < _PARALLEL_MIN_N:
+        return factorial_product_tree(n)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    bounds = [2 + (n - 1) * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(_range_product_bytes, bounds[:-1], bounds[1:])
+        partials = [int.from_bytes(part, "little") for part in parts]
+    return sequence_product(partials)
+
+
+def _convolve_mod(a: List[int], b: List[int], p: int) -> List[int]:
+    """
+    Convolve two coefficient lists modulo p by Kronecker substitution.
+
+    Each list is packed into one big integer with byte-aligned slots wide
+    enough that no coefficient of the product overflows, so the whole
+    convolution is a single CPython big-int multiplication.
+    """
+    width = (2 * p.bit_length() + min(len(a), len(b)).bit_length() + 7) // 8
+
+    def pack(values: List[int]) -> int:
+        return int.from_bytes(b"".join(x.to_bytes(width, "little") for x in values), "little")
+
+    size = len(a) + len(b) - 1
+    raw = (pack(a) * pack(b)).to_bytes(size * width, "little")
+    return [int.from_bytes(raw[i : i + width], "little") % p for i in range(0, size * width, width)]
+
+
+def _shift_samples(values: List[int], m: int, p: int) -> List[int]:
+    """
+    Given h(0), ..., h(d) of a polynomial of degree <= d, return h(m), ..., h(m + d).
+
+    Lagrange interpolation turns the shift into one convolution:
+    h(m + k) = prod_j (m + k - j) * sum_i a_i / (m + k - i) with
+    a_i = h(i) / (i! (d - i)! (-1)^(d - i)). Requires m - d, ..., m + d to be
+    non-zero modulo the prime p.
+    """
+    d = len(values) - 1
+    inv_fact = [1] * (d + 1)
+    fact_d = 1
+    for i in range(2, d + 1):
+        fact_d = fact_d * i % p
+    inv_fact[d] = pow(fact_d, -1, p)
+    for i in range(d, 0, -1):
+        inv_fact[i - 1] = inv_fact[i] * i % p
+    weights = [values[i] * inv_fact[i] % p * inv_fact[d - i] % p for i in range(d + 1)]
+    for i in range(d - 1, -1, -2):
+        weights[i] = -weights[i] % p
+
+    # Batch-invert the 2d + 1 denominators m - d + j through prefix products
+    points = [(m - d + j) % p for j in range(2 * d + 1)]
+    prefix = [1] * (2 * d + 2)
+    for j, point in enumerate(points):
+        prefix[j + 1] = prefix[j] * point % p
+    inv_prefix = [1] * (2 * d + 2)
+    inv_prefix[-1] = pow(prefix[-1], -1, p)
+    for j in range(2 * d, -1, -1):
+        inv_prefix[j] = inv_prefix[j + 1] * points[j] % p
+    inverses = [inv_prefix[j + 1] * prefix[j] % p for j in range(2 * d + 1)]
+
+    sums = _convolve_mod(weights, inverses, p)
+    return [sums[k + d] * prefix[k + d + 1] % p * inv_prefix[k] % p for k in range(d + 1)]
+
+
+def _range_product_mod_sqrt(a: int, b: int, p: int) -> int:
+    """
+    Return (a+1)(a+2)...(b) mod p in O(sqrt(b-a) log(b-a)) big-int work.
+
+    With v = isqrt(b - a), let g_d(x) = prod_{i=1..d} (v x + a + i). The
+    product of g_v(0), ..., g_v(v-1) covers a+1 .. a+v^2. Sample values
+    g_d(0..d) are doubled with g_2d(x) = g_d(x) g_d(x + d/v), where the
+    shifted samples come from _shift_samples, and bumped by one factor for
+    each set bit of v. Requires b - a <= p/2 so no shifted point collides.
+    """
+    v = math.isqrt(b - a)
+    inv_v = pow(v, -1, p)
+    samples = [(a + 1) % p, (v + a + 1) % p]
+    d = 1
+    for bit in bin(v)[3:]:
+        left = samples + _shift_samples(samples, d + 1, p)
+        offset = d * inv_v % p
+        right = _shift_samples(samples, offset, p)
+        right += _shift_samples(samples, (offset + d + 1) % p, p)
+        samples = [left[k] * right[k] % p for k in range(2 * d + 1)]
+        d *= 2
+        if bit == "1":
+            samples = [samples[k] * (v * k + a + d + 1) % p for k in range(d + 1)]
+            extra, base = 1, v * (d + 1) + a
+            for i in range(1, d + 2):
+                extra = extra * (base + i) % p
+            samples.append(extra)
+            d += 1
+
+    result = 1
+    for k in range(v):
+        result = result * samples[k] % p
+    for i in range(a + v * v + 1, b + 1):
+        result = result * i % p
+    return result
+
+
+def _range_product_mod(a: int, b: int, p: int) -> int:
+    """Return (a+1)(a+2)...(b) mod p, choosing the loop or the sqrt method."""
+    if b - a >= _MOD_PRODUCT_SQRT_THRESHOLD:
+        return _range_product_mod_sqrt(a, b, p)
+    result = 1
+    for i in range(a + 1, b + 1):
+        result = result * i % p
+    return result
+
+
+def factorial_mod(n: int, p: int) -> int:
+    """
+    Calculate n! mod p for a prime p without big-int arithmetic on n!.
+
+    Small n use a running product of machine-sized residues. When n > p/2
+    Wilson's theorem, (p-1)! = -1 (mod p), reduces the work to (p-1-n)!.
+    Long ranges use sample-point doubling with polynomial shifts, which
+    needs only O(sqrt(n) log n) operations.
+
+    Time complexity: O(n) for n < 2^15, O(sqrt(n) log n) multiplications beyond
+    Space complexity: O(sqrt(n))
+
+    Args:
+        n: Number to calculate factorial of
+        p: Prime modulus
+
+    Returns:
+        n! mod p
+
+    Raises:
+        ValueError: If n is negative or p is not a valid modulus
+    """
+    return factorial_mod_many([n], p)[0]
+
+
+def factorial_mod_many(ns: Iterable[int], p: int) -> List[int]:
+    """
+    Calculate n! mod p for many n, sharing work between them.
+
+    After Wilson reflection every query is a prefix product up to some
+    m <= p/2. The distinct m are sorted and each gap between consecutive
+    ones is multiplied once, so the total cost is that of the largest
+    query rather than the sum of all of them.
+
+    Time complexity: O(k log k) for k queries plus the products over the gaps
+    Space complexity: O(k + sqrt(max n))
+
+    Args:
+        ns: Numbers to calculate factorials of
+        p: Prime modulus
+
+    Returns:
+        List of n! mod p in the order of ns
+
+    Raises:
+        ValueError: If any n is negative or p is not a valid modulus
+    """
+    if p < 2:
+        raise ValueError("Modulus must be a prime")
+    ns = list(ns)
+    if any(n < 0 for n in ns):
+        raise ValueError("Input must be non-negative")
+
+    # Map each query to a prefix length m and whether it was reflected
+    targets: List[Optional[Tuple[int, bool]]] = []
+    for n in ns:
+        if n >= p:
+            targets.append(None)
+        elif n > p // 2:
+            targets.append((p - 1 - n, True))
+        else:
+            targets.append((n, False))
+
+    prefix = {}
+    position, acc = 0, 1
+    for m in sorted({t[0] for t in targets if t is not None}):
+        acc = acc * _range_product_mod(position, m, p) % p
+        prefix[m] = acc
+        position = m
+
+    results = []
+    for n, target in zip(ns, targets):
+        if target is None:
+            results.append(0)
+            continue
+        m, reflected = target
+        if not reflected:
+            results.append(prefix[m])
+        else:
+            # n! = (-1)^(p-n) / (p-1-n)!  (mod p)
+            value = pow(prefix[m], -1, p)
+            results.append(value if (p - n) % 2 == 0 else (-value) % p)
+    return results
+
+
+def _stirling_log_factorial(x: Any, np: Any) -> Any:
+    """
+    ln(x!) from the Stirling series for a NumPy float64 array with x > 256.
+
+    The 1/(360 x^3) and 1/(1260 x^5) terms fall below double precision of
+    the result once x exceeds 10^4, so they are only added where x is
+    smaller. The first omitted term is below 1/(1680 x^7).
+    """
+    result = np.log(x)
+    result *= x + 0.5
+    result -= x
+    result += _HALF_LOG_2PI
+    inv = np.reciprocal(x)
+    inv *= 1.0 / 12
+    result += inv
+    near = x < 1e4
+    if near.any():
+        inv2 = np.reciprocal(x[near]) ** 2
+        result[near] -= inv2 / x[near] * (1.0 / 360 - inv2 / 1260)
+    return result
+
+
+def log_factorial_table(n: int) -> Any:
+    """
+    Return ln(k!) for every k = 0..n as a float64 array.
+
+    Values up to a small cutoff are cumulative sums of logs; above it the
+    Stirling series is evaluated for the whole range at once. Uses NumPy
+    when available (returning numpy.ndarray) and falls back to math.lgamma
+    and array('d') otherwise.
+
+    Time complexity: O(n), vectorised with NumPy
+    Space complexity: O(n)
+
+    Args:
+        n: Largest k in the table
+
+    Returns:
+        Array of length n + 1 with ln(k!) at index k
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    cutoff = min(n, _LOG_FACTORIAL_CUTOFF)
+    try:
+        import numpy as np
+    except ImportError:
+        table = array("d", bytes(8 * (n + 1)))
+        total = 0.0
+        for k in range(2, cutoff + 1):
+            total += math.log(k)
+            table[k] = total
+        for k in range(cutoff + 1, n + 1):
+            table[k] = math.lgamma(k + 1)
+        return table
+
+    logs = np.empty(n + 1, dtype=np.float64)
+    logs[0] = 0.0
+    logs[1 : cutoff + 1] = np.cumsum(np.log(np.arange(1, cutoff + 1, dtype=np.float64)))
+    if n > cutoff:
+        logs[cutoff + 1 :] = _stirling_log_factorial(
+            np.arange(cutoff + 1, n + 1, dtype=np.float64), np
+        )
+    return logs
+
+
+def log_factorial(ks: Iterable[int]) -> Any:
+    """
+    Return ln(k!) for each k in ks as a float64 array.
+
+    Vectorised counterpart of math.lgamma(k + 1) for arbitrary (unsorted,
+    sparse) k; see log_factorial_table() for a dense 0..n table.
+
+    Time complexity: O(len(ks)), vectorised with NumPy
+    Space complexity: O(len(ks))
+
+    Args:
+        ks: Non-negative integers (any array-like)
+
+    Returns:
+        numpy.ndarray when NumPy is available, otherwise array('d')
+
+    Raises:
+        ValueError: If any k is negative
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        numbers = list(ks)
+        if any(k < 0 for k in numbers):
+            raise ValueError("Input must be non-negative")
+        return array("d", (math.lgamma(k + 1) for k in numbers))
+
+    values = np.asarray(ks, dtype=np.float64)
+    if (values < 0).any():
+        raise ValueError("Input must be non-negative")
+    small = values <= _LOG_FACTORIAL_CUTOFF
+    result = np.empty_like(values)
+    result[small] = log_factorial_table(_LOG_FACTORIAL_CUTOFF)[values[small].astype(np.int64)]
+    result[~small] = _stirling_log_factorial(values[~small], np)
+    return result
+
+
+def valuation(n: int, p: int) -> int:
+    """
+    Exponent of the prime p in n! (Legendre's formula).
+
+    v_p(n!) = floor(n/p) + floor(n/p^2) + ...
+
+    Time complexity: O(log_p n)
+    Space complexity: O(1)
+
+    Args:
+        n: Number whose factorial is inspected
+        p: Prime
+
+    Returns:
+        The largest e such that p^e divides n!
+
+    Raises:
+        ValueError: If n is negative or p < 2
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    if p < 2:
+        raise ValueError("p must be a prime")
+    exponent = 0
+    while n:
+        n //= p
+        exponent += n
+    return exponent
+
+
+def _factorize(m: int) -> List[Tuple[int, int]]:
+    """Prime factorisation of a small integer m >= 2 by trial division."""
+    factors = []
+    d = 2
+    while d * d <= m:
+        if m % d == 0:
+            e = 0
+            while m % d == 0:
+                m //= d
+                e += 1
+            factors.append((d, e))
+        d += 1 if d == 2 else 2
+    if m > 1:
+        factors.append((m, 1))
+    return factors
+
+
+def trailing_zeros(n: int, base: int = 10) -> int:
+    """
+    Number of trailing zeros of n! written in the given base.
+
+    The base is factorised as prod p_i^e_i, and the answer is the smallest
+    v_p(n!) // e over its prime powers.
+
+    Time complexity: O(sqrt(base) + log n)
+    Space complexity: O(log base)
+
+    Args:
+        n: Number whose factorial is inspected
+        base: Radix, at least 2
+
+    Returns:
+        Count of trailing zero digits of n! in that base
+
+    Raises:
+        ValueError: If n is negative or base < 2
+    """
+    if base < 2:
+        raise ValueError("Base must be at least 2")
+    return min(valuation(n, p) // e for p, e in _factorize(base))
+
+
+def last_nonzero_digit(n: int) -> int:
+    """
+    Last non-zero decimal digit of n!.
+
+    Uses D(n) = 2^floor(n/5) * D(floor(n/5)) * D(n mod 5) (mod 10), which
+    unrolls to the product of D over the base-5 digits of n times
+    2^v_5(n!) (mod 10).
+
+    Time complexity: O(log n)
+    Space complexity: O(1)
+
+    Args:
+        n: Number whose factorial is inspected
+
+    Returns:
+        The last non-zero digit of n! (1 through 9)
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    digit, fives = 1, 0
+    while n:
+        digit = digit * _LAST_NONZERO_SMALL[n % 5] % 10
+        n //= 5
+        fives += n
+    if fives:
+        digit = digit * _LAST_DIGIT_POW2[fives % 4] % 10
+    return digit
+
+
+def _fits_int64(value: int) -> bool:
+    """Whether value is representable as a NumPy int64."""
+    return -(1 << 63) <= value < 1 << 63
+
+
+def _int64_array(values: List[int]) -> Any:
+    """Return values as a NumPy int64 array, or None if NumPy or int64 won't do."""
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    if values and not (_fits_int64(min(values)) and _fits_int64(max(values))):
+        return None
+    return np.array(values, dtype=np.int64)
+
+
+def valuation_many(ns: Iterable[int], p: int) -> Any:
+    """
+    Vectorised valuation(): exponent of the prime p in n! for each n.
+
+    Args:
+        ns: Numbers whose factorials are inspected
+        p: Prime
+
+    Returns:
+        numpy int64 array when NumPy is available and the inputs and p fit
+        in int64, otherwise a list
+
+    Raises:
+        ValueError: If any n is negative or p < 2
+    """
+    if p < 2:
+        raise ValueError("p must be a prime")
+    values = list(ns)
+    if any(n < 0 for n in values):
+        raise ValueError("Input must be non-negative")
+    # The arrays are divided by p, so p has to fit in int64 as well
+    quotients = _int64_array(values) if _fits_int64(p) else None
+    if quotients is None:
+        return [valuation(n, p) for n in values]
+    total = quotients * 0
+    while quotients.any():
+        quotients //= p
+        total += quotients
+    return total
+
+
+def trailing_zeros_many(ns: Iterable[int], base: int = 10) -> Any:
+    """
+    Vectorised trailing_zeros() for each n.
+
+    Args:
+        ns: Numbers whose factorials are inspected
+        base: Radix, at least 2
+
+    Returns:
+        numpy int64 array when NumPy is available and the inputs and the
+        prime factors of base fit in int64, otherwise a list
+
+    Raises:
+        ValueError: If any n is negative or base < 2
+    """
+    if base < 2:
+        raise ValueError("Base must be at least 2")
+    values = list(ns)
+    factors = _factorize(base)
+    if not all(_fits_int64(p) for p, _ in factors):
+        # valuation_many() would still answer the small factors with arrays
+        if any(n < 0 for n in values):
+            raise ValueError("Input must be non-negative")
+        return [min(valuation(n, p) // e for p, e in factors) for n in values]
+    exact: Optional[List[int]] = None
+    vectorised: Any = None
+    for p, e in factors:
+        counts = valuation_many(values, p)
+        if isinstance(counts, list):
+            counts = [c // e for c in counts]
+            exact = counts if exact is None else [min(a, b) for a, b in zip(exact, counts)]
+        else:
+            counts //= e
+            vectorised = counts if vectorised is None else vectorised.clip(max=counts)
+    return exact if vectorised is None else vectorised
+
+
+def last_nonzero_digit_many(ns: Iterable[int]) -> Any:
+    """
+    Vectorised last_nonzero_digit() for each n.
+
+    Args:
+        ns: Numbers whose factorials are inspected
+
+    Returns:
+        numpy int64 array when NumPy is available and the inputs fit in
+        int64, otherwise a list
+
+    Raises:
+        ValueError: If any n is negative
+    """
+    values = list(ns)
+    if any(n < 0 for n in values):
+        raise ValueError("Input must be non-negative")
+    quotients = _int64_array(values)
+    if quotients is None:
+        return [last_nonzero_digit(n) for n in values]
+    small = _int64_array(list(_LAST_NONZERO_SMALL))
+    digits = quotients * 0 + 1
+    fives = quotients * 0
+    while quotients.any():
+        digits = digits * small[quotients % 5] % 10
+        quotients //= 5
+        fives += quotients
+    pow2 = _int64_array(list(_LAST_DIGIT_POW2))[fives % 4]
+    pow2[fives == 0] = 1
+    return digits * pow2 % 10
+
+
+def _decimal_pi() -> "Decimal":
+    """Compute pi to the current decimal context precision."""
+    from decimal import Decimal, localcontext
+
+    with localcontext() as ctx:
+        ctx.prec += 2
+        three = Decimal(3)
+        last, t, total, n, na, d, da = Decimal(0), three, three, 1, 0, 0, 24
+        while total != last:
+            last = total
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = (t * n) / d
+            total += t
+    return +total
+
+
+def _factorial_log10(n: int, guard: int) -> "Decimal":
+    """
+    Return log10(n!) from Stirling's series with `guard` fractional digits.
+
+    ln(n!) = (n + 1/2) ln n - n + ln(2 pi)/2 + sum B_2k / (2k (2k-1) n^(2k-1))
+
+    With n >= _EXACT_DIGITS_LIMIT the truncation error of the ten-term
+    series is far below 10^-40.
+    """
+    from decimal import Decimal, localcontext
+
+    with localcontext() as ctx:
+        ctx.prec = 2 * len(str(n)) + guard
+        x = Decimal(n)
+        ln_x = x.ln()
+        result = (x + Decimal("0.5")) * ln_x - x + (2 * _decimal_pi()).ln() / 2
+        power = x
+        for k, (numerator, denominator) in enumerate(_BERNOULLI, start=1):
+            denominator *= 2 * k * (2 * k - 1)
+            result += Decimal(numerator) / (Decimal(denominator) * power)
+            power *= x * x
+        return result / Decimal(10).ln()
+
+
+def factorial_digit_count(n: int) -> int:
     """
-    Benchmark different factorial implementations.
+    Count the decimal digits of n! without computing n!.
+
+    Uses Stirling's series in extended precision for large n and falls
+    back to exact computation for small n.
+
+    Time complexity: O(log n)
+    Space complexity: O(log n)
+
+    Args:
+        n: Number whose factorial is measured
+
+    Returns:
+        Number of decimal digits of n!
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    if n < _EXACT_DIGITS_LIMIT:
+        return len(str(math.factorial(n)))
+    return int(_factorial_log10(n, 20)) + 1
+
+
+def factorial_leading_digits(n: int, k: int = 15) -> int:
+    """
+    Return the leading k decimal digits of n! without computing n!.
+
+    Time complexity: O(log n + k)
+    Space complexity: O(log n + k)
+
+    Args:
+        n: Number whose factorial is inspected
+        k: Number of leading digits to return
+
+    Returns:
+        The first k digits of n! as an integer (all of n! if it is shorter)
+
+    Raises:
+        ValueError: If n is negative or k is not positive
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    if k < 1:
+        raise ValueError("Digit count must be positive")
+    if n < _EXACT_DIGITS_LIMIT:
+        return int(str(math.factorial(n))[:k])
+    from decimal import Decimal, localcontext
+
+    log10 = _factorial_log10(n, k + 20)
+    with localcontext() as ctx:
+        ctx.prec = 2 * len(str(n)) + k + 20
+        fraction = log10 - int(log10)
+        return int(Decimal(10) ** (fraction + k - 1))
+
+
+def factorial_trailing_digits(n: int, k: int = 15) -> int:
+    """
+    Return the trailing k decimal digits of n!, i.e. n! mod 10^k.
+
+    Once n! contains k factors of 5 (and therefore at least k factors of 2)
+    the answer is 0, so at most about 5k modular multiplications are done.
+
+    Time complexity: O(min(n, k) + log n)
+    Space complexity: O(k)
+
+    Args:
+        n: Number whose factorial is inspected
+        k: Number of trailing digits to return
+
+    Returns:
+        n! mod 10^k
+
+    Raises:
+        ValueError: If n is negative or k is not positive
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    if k < 1:
+        raise ValueError("Digit count must be positive")
+    if valuation(n, 5) >= k:
+        return 0
+    modulus = 10**k
+    result = 1
+    for i in range(2, n + 1):
+        result = result * i % modulus
+    return result
+
+
+def benchmark_factorial(n: int) -> List["Measurement"]:
+    """
+    Benchmark the registered factorial implementations.
+
+    Implementations whose declared range excludes n (the recursive and
+    memoized versions above the recursion limit) are skipped.
 
     Args:
         n: Number to calculate factorial of
+
+    Returns:
+        The measurements, also printed as a table
     """
+    from algorithms.bench import format_table, run
+
     print(f"Benchmarking factorial implementations for n={n}")
+    results = run(["factorial"], sizes=[n])
+    print(format_table(results))
+    return results
 
-    # Recursive
-    start = time.time()
-    result = factorial_recursive(n)
-    end = time.time()
-    print(f"Recursive:      {result} (Time: {end - start:.6f}s)")
-
-    # Tail recursive
-    start = time.time()
-    result = factorial_tail_recursive(n)
-    end = time.time()
-    print(f"Tail Recursive: {result} (Time: {end - start:.6f}s)")
-
-    # Memoized
-    start = time.time()
-    result = factorial_memoized(n)
-    end = time.time()
-    print(f"Memoized:       {result} (Time: {end - start:.6f}s)")
-
-    # Iterative
-    start = time.time()
-    result = factorial_iterative(n)
-    end = time.time()
-    print(f"Iterative:      {result} (Time: {end - start:.6f}s)")
-
-    # Math module
-    start = time.time()
-    result = factorial_math(n)
-    end = time.time()
-    print(f"Math Module:    {result} (Time: {end - start:.6f}s)")
+
+def benchmark_factorial_scaling(max_n: int = 10**6) -> List["Measurement"]:
+    """
+    Show how the fast factorial implementations scale with n.
+
+    Comparing the pure Python product-tree and prime-swing versions with
+    math.factorial shows how close pure Python gets to the C implementation.
+
+    Times each implementation at n = 100, 1000, ... up to max_n. The
+    iterative version is only run until a call takes more than a second.
+
+    Args:
+        max_n: Largest n to time
+
+    Returns:
+        The measurements, also printed as a table
+    """
+    from algorithms.bench import format_table, run
+
+    print(f"Factorial scaling up to n={max_n}")
+    sizes = [10**k for k in range(2, len(str(max_n)))]
+    results = run(
+        ["factorial"],
+        sizes=sizes,
+        names=[
+            "factorial_iterative",
+            "factorial_product_tree",
+            "factorial_prime_swing",
+            "factorial_math",
+        ],
+        min_repeat=1,
+    )
+    print(format_table(sorted(results, key=lambda m: m.n)))
+    return results
+
+
+def benchmark_factorial_parallel(
+    ns: Sequence[int] = (10**6, 10**7), max_workers: Optional[int] = None
+) -> None:
+    """
+    Benchmark factorial_parallel speedup against the number of workers.
+
+    Worker counts double from 1 up to max_workers; speedup is relative to
+    the single-process product tree.
+
+    Args:
+        ns: Values of n to benchmark
+        max_workers: Largest worker count (defaults to os.cpu_count())
+    """
+    from algorithms.bench import format_time, measure
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    counts = []
+    workers = 1
+    while workers <= max_workers:
+        counts.append(workers)
+        workers *= 2
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+
+    for n in ns:
+        print(f"Parallel factorial speedup for n={n}")
+        baseline = measure(factorial_product_tree, n, min_repeat=1).median
+        print(f"{'workers':>8} {'time':>12} {'speedup':>8}")
+        for workers in counts:
+            timing = measure(partial(factorial_parallel, workers=workers), n, min_repeat=1)
+            speedup = baseline / timing.median
+            print(f"{workers:>8} {format_time(timing.median):>12} {speedup:>7.2f}x")
 
 
 if __name__ == "__main__":
-    # Test for a moderate value
-    value = 20
-    print(f"Factorial of {value}:")
-    print(f"Result: {factorial_iterative(value)}")
+    from algorithms import profiling
+    from algorithms.output import to_decimal
+
+    with profiling.from_argv("factorial"):
+        # Test for a moderate value
+        value = 20
+        print(f"Factorial of {value}:")
+        print(f"Result: {to_decimal(factorial_iterative(value))}")
 
-    # Benchmark
-    benchmark_factorial(value)
+        # Benchmark
+        benchmark_factorial(value)
+        benchmark_factorial_scaling()
@@ -5,9 +5,19 @@ Implementations of the Fibonacci sequence
 This module provides various implementations of the Fibonacci sequence
 to demonstrate different approaches and their performance characteristics.
 """
-import time
 from functools import lru_cache
-from typing import Generator
+from typing import TYPE_CHECKING, Generator, List, Tuple
+
+# decimal is imported by the digit helpers that use it, to keep it out of
+# the import time of the module
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+    from algorithms.bench import Measurement
+
+# Below this index F(n) is cheap enough to compute exactly; above it the
+# log-scale helpers switch to Binet's formula.
+_EXACT_DIGITS_LIMIT = 1000
 
 
 def fib_recursive(n: int) -> int:
@@ -84,6 +94,38 @@ def fib_iterative(n: int) -> int:
     return b
 
 
+def fib_fast_doubling(n: int) -> int:
+    """
+    Fast-doubling implementation of Fibonacci.
+
+    Uses F(2k) = F(k) (2 F(k+1) - F(k)) and F(2k+1) = F(k)^2 + F(k+1)^2,
+    walking the bits of n from the most significant end.
+
+    Time complexity: O(log n) big-int multiplications
+    Space complexity: O(n) bits for the result
+
+    Args:
+        n: Position in the Fibonacci sequence (0-indexed)
+
+    Returns:
+        The nth Fibonacci number
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a
+
+
 def fib_generator(n: int) -> Generator[int, None, None]:
     """
     Generator implementation of Fibonacci sequence.
@@ -113,47 +155,172 @@ def fib_generator(n: int) -> Generator[int, None, None]:
         yield b
 
 
-def benchmark_fibonacci(n: int) -> None:
+def _fib_pair_mod(n: int, m: int) -> Tuple[int, int]:
+    """
+    Return (F(n) mod m, F(n+1) mod m) using fast doubling.
+
+    Time complexity: O(log n) multiplications of numbers below m
+    Space complexity: O(1)
+    """
+    a, b = 0, 1 % m
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % m
+        d = (a * a + b * b) % m
+        if bit == "1":
+            a, b = d, (c + d) % m
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fib_mod(n: int, m: int) -> int:
+    """
+    Calculate F(n) mod m without building F(n).
+
+    Time complexity: O(log n)
+    Space complexity: O(1)
+
+    Args:
+        n: Position in the Fibonacci sequence (0-indexed)
+        m: Modulus (positive)
+
+    Returns:
+        The nth Fibonacci number reduced modulo m
+
+    Raises:
+        ValueError: If n is negative or m is not positive
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    if m < 1:
+        raise ValueError("Modulus must be positive")
+    return _fib_pair_mod(n, m)[0]
+
+
+def _fib_log10(n: int, guard: int) -> "Decimal":
+    """
+    Return log10(F(n)) from Binet's formula with `guard` fractional digits.
+
+    For n >= _EXACT_DIGITS_LIMIT the relative contribution of the (1-phi)^n
+    term is below 10^-400, so log10(F(n)) = n*log10(phi) - log10(sqrt(5)).
     """
-    Benchmark different Fibonacci implementations.
+    from decimal import Decimal, localcontext
+
+    with localcontext() as ctx:
+        ctx.prec = len(str(n)) + guard
+        sqrt5 = Decimal(5).sqrt()
+        phi = (1 + sqrt5) / 2
+        return n * phi.log10() - sqrt5.log10()
+
+
+def fib_digit_count(n: int) -> int:
+    """
+    Count the decimal digits of F(n) without computing F(n).
+
+    Uses Binet's formula in extended precision for large n and falls back
+    to exact computation for small n.
+
+    Time complexity: O(log n)
+    Space complexity: O(log n)
+
+    Args:
+        n: Position in the Fibonacci sequence (0-indexed)
+
+    Returns:
+        Number of decimal digits of the nth Fibonacci number
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    if n < _EXACT_DIGITS_LIMIT:
+        return len(str(fib_iterative(n)))
+    return int(_fib_log10(n, 20)) + 1
+
+
+def fib_leading_digits(n: int, k: int = 15) -> int:
+    """
+    Return the leading k decimal digits of F(n) without computing F(n).
+
+    Time complexity: O(log n + k)
+    Space complexity: O(log n + k)
+
+    Args:
+        n: Position in the Fibonacci sequence (0-indexed)
+        k: Number of leading digits to return
+
+    Returns:
+        The first k digits of F(n) as an integer (all of F(n) if it is shorter)
+
+    Raises:
+        ValueError: If n is negative or k is not positive
+    """
+    if n < 0:
+        raise ValueError("Input must be non-negative")
+    if k < 1:
+        raise ValueError("Digit count must be positive")
+    if n < _EXACT_DIGITS_LIMIT:
+        return int(str(fib_iterative(n))[:k])
+    from decimal import Decimal, localcontext
+
+    log10 = _fib_log10(n, k + 20)
+    with localcontext() as ctx:
+        ctx.prec = len(str(n)) + k + 20
+        fraction = log10 - int(log10)
+        return int(Decimal(10) ** (fraction + k - 1))
+
+
+def fib_trailing_digits(n: int, k: int = 15) -> int:
+    """
+    Return the trailing k decimal digits of F(n), i.e. F(n) mod 10^k.
+
+    Time complexity: O(log n)
+    Space complexity: O(k)
+
+    Args:
+        n: Position in the Fibonacci sequence (0-indexed)
+        k: Number of trailing digits to return
+
+    Returns:
+        F(n) mod 10^k
+
+    Raises:
+        ValueError: If n is negative or k is not positive
+    """
+    if k < 1:
+        raise ValueError("Digit count must be positive")
+    return fib_mod(n, 10**k)
+
+
+def benchmark_fibonacci(n: int) -> List["Measurement"]:
+    """
+    Benchmark the registered Fibonacci implementations.
+
+    Implementations whose declared range excludes n (the exponential
+    recursive version above n=30) are skipped.
 
     Args:
         n: Position in the Fibonacci sequence to calculate
+
+    Returns:
+        The measurements, also printed as a table
     """
-    print(f"Benchmarking Fibonacci implementations for n={n}")
+    from algorithms.bench import format_table, run
 
-    # Only benchmark recursive for small values due to exponential growth
-    if n <= 30:
-        start = time.time()
-        result = fib_recursive(n)
-        end = time.time()
-        print(f"Recursive: {result} (Time: {end - start:.6f}s)")
-    else:
-        print("Recursive implementation skipped for large n (would take too long)")
-
-    # Memoized version
-    start = time.time()
-    result = fib_memoized(n)
-    end = time.time()
-    print(f"Memoized:  {result} (Time: {end - start:.6f}s)")
-
-    # Iterative version
-    start = time.time()
-    result = fib_iterative(n)
-    end = time.time()
-    print(f"Iterative: {result} (Time: {end - start:.6f}s)")
-
-    # Generator version (just time to generate full sequence)
-    start = time.time()
-    result = list(fib_generator(n))[-1]
-    end = time.time()
-    print(f"Generator: {result} (Time: {end - start:.6f}s)")
+    print(f"Benchmarking Fibonacci implementations for n={n}")
+    results = run(["fib"], sizes=[n])
+    print(format_table(results))
+    return results
 
 
 if __name__ == "__main__":
-    # Test small value
-    print("First 10 Fibonacci numbers:")
-    print(list(fib_generator(9)))
+    from algorithms import profiling
+
+    with profiling.from_argv("fibonacci"):
+        # Test small value
+        print("First 10 Fibonacci numbers:")
+        print(list(fib_generator(9)))
 
-    # Benchmark
-    benchmark_fibonacci(35)
+        # Benchmark
+        benchmark_fibonacci(35)
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Golden reference data for verifying large results without a reference run
+
+Checking a sieve up to 10^9 or F(10^6) normally means recomputing the
+result with a slower implementation. The fixtures in data/golden.json make
+that a single pass over the output instead. They hold:
+
+- pi(x) at powers of ten, and the prime count of every segment
+  [k S, (k + 1) S) up to a limit
+- the SHA-256 digest of every segment's primes, each packed as an
+  8-byte little-endian integer
+- F(n) and n! modulo several 61-bit primes at a set of checkpoints
+
+The generator computes all of this independently of the implementations
+under test. It streams a bytearray sieve segment by segment, and uses
+modular fast doubling and plain modular products.
+
+    python -m algorithms.golden verify segmented_sieve 100000000
+    python -m algorithms.golden generate            # rewrite the fixtures
+
+A verification reads each prime or residue once, so it costs O(output).
+"""
+import argparse
+import hashlib
+import json
+import math
+import sys
+from array import array
+from dataclasses import dataclass, field
+from importlib import resources
+from itertools import compress
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, cast
+
+from algorithms.registry import get
+
+GOLDEN_VERSION = 1
+
+DEFAULT_PRIME_LIMIT = 10**9
+DEFAULT_SEGMENT = 10**6
+FIB_CHECKPOINTS = [10**k for k in range(1, 9)] + [12345, 2**20, 999999]
+FACTORIAL_CHECKPOINTS = [10**k for k in range(1, 7)] + [12345, 2**16, 99991]
+
+# Number of 61-bit prime moduli for the residues
+_MODULI = 3
+
+
+def fixture_path() -> Path:
+    """Return the location of the packaged fixture file."""
+    return Path(str(resources.files("algorithms") / "data" / "golden.json"))
+
+
+def _pack(primes: Sequence[int]) -> bytes:
+    """Pack primes as 8-byte little-endian integers."""
+    packed = array("Q", primes)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _is_probable_prime(n: int) -> bool:
+    """Miller-Rabin with the first 13 prime bases, exact below 3.3e24."""
+    if n < 2:
+        return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    if n in bases:
+        return True
+    if any(n % p == 0 for p in bases):
+        return False
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _moduli(count: int = _MODULI) -> List[int]:
+    """Return the count largest primes below 2^61."""
+    found: List[int] = []
+    candidate = (1 << 61) - 1
+    while len(found) < count:
+        if _is_probable_prime(candidate):
+            found.append(candidate)
+        candidate -= 2
+    return found
+
+
+def _prime_segments(limit: int, size: int) -> Iterator[Tuple[int, List[int]]]:
+    """Yield (start, primes in [start, start + size)) for every segment below limit."""
+    root = math.isqrt(limit)
+    small = bytearray([1]) * (root + 1)
+    small[0:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(root) + 1):
+        if small[i]:
+            small[i * i :: i] = bytes(len(range(i * i, root + 1, i)))
+    base = [i for i in range(2, root + 1) if small[i]]
+    for lo in range(0, limit, size):
+        hi = min(lo + size, limit)
+        segment = bytearray([1]) * (hi - lo)
+        for p in base:
+            if p * p >= hi:
+                break
+            start = max(p * p, (lo + p - 1) // p * p)
+            if start < hi:
+                segment[start - lo :: p] = bytes(len(range(start - lo, hi - lo, p)))
+        for i in range(lo, min(2, hi)):
+            segment[i - lo] = 0
+        yield lo, list(compress(range(lo, hi), segment))
+
+
+def _fib_mod(n: int, m: int) -> int:
+    """F(n) mod m by fast doubling."""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % m
+        d = (a * a + b * b) % m
+        a, b = (d, (c + d) % m) if bit == "1" else (c, d)
+    return a
+
+
+def _factorial_mods(checkpoints: Sequence[int], moduli: Sequence[int]) -> Dict[int, List[int]]:
+    """n! mod each modulus at every checkpoint, from one running product."""
+    targets = sorted(set(checkpoints))
+    values = [1] * len(moduli)
+    result = {}
+    k = 1
+    for n in targets:
+        while k <= n:
+            values = [v * k % m for v, m in zip(values, moduli)]
+            k += 1
+        result[n] = list(values)
+    return result
+
+
+def generate(
+    prime_limit: int = DEFAULT_PRIME_LIMIT, segment: int = DEFAULT_SEGMENT
+) -> Dict[str, Any]:
+    """
+    Compute the golden data.
+
+    Args:
+        prime_limit: Primes below this are digested; a multiple of segment
+        segment: Segment length
+
+    Returns:
+        The fixture document
+    """
+    if prime_limit % segment:
+        raise ValueError("prime_limit must be a multiple of segment")
+    powers = [10**k for k in range(1, len(str(prime_limit)))]
+    pi: Dict[str, int] = {}
+    counts: List[int] = []
+    digests: List[str] = []
+    total = 0
+    for lo, primes in _prime_segments(prime_limit, segment):
+        for x in powers:
+            if lo < x <= lo + segment:
+                pi[str(x)] = total + sum(1 for p in primes if p <= x)
+        total += len(primes)
+        counts.append(len(primes))
+        digests.append(hashlib.sha256(_pack(primes)).hexdigest())
+    moduli = _moduli()
+    return {
+        "version": GOLDEN_VERSION,
+        "moduli": moduli,
+        "primes": {
+            "limit": prime_limit,
+            "segment": segment,
+            "pi": pi,
+            "counts": counts,
+            "sha256": digests,
+        },
+        "fib": {str(n): [_fib_mod(n, m) for m in moduli] for n in sorted(FIB_CHECKPOINTS)},
+        "factorial": {
+            str(n): residues
+            for n, residues in _factorial_mods(FACTORIAL_CHECKPOINTS, moduli).items()
+        },
+    }
+
+
+_fixtures: Optional[Dict[str, Any]] = None
+
+
+def load(path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Read the fixture document, caching the packaged one.
+
+    Raises:
+        ValueError: If the file has another format version
+    """
+    global _fixtures
+    if path is None and _fixtures is not None:
+        return _fixtures
+    with open(path or fixture_path()) as f:
+        data: Dict[str, Any] = json.load(f)
+    if data.get("version") != GOLDEN_VERSION:
+        raise ValueError(f"Golden data version {data.get('version')}, expected {GOLDEN_VERSION}")
+    if path is None:
+        _fixtures = data
+    return data
+
+
+@dataclass
+class Verification:
+    """
+    Outcome of checking one result against the fixtures.
+
+    Attributes:
+        subject: What was checked, e.g. "segmented_sieve(100000000)"
+        checked: Number of fixture entries compared
+        covered: Largest argument the fixtures could vouch for
+        errors: Mismatches found, empty if the result agrees
+    """
+
+    subject: str
+    checked: int = 0
+    covered: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the result agreed with every fixture it was compared with."""
+        return not self.errors and self.checked > 0
+
+
+def verify_primes(
+    primes: Iterable[int], n: int, fixtures: Optional[Dict[str, Any]] = None
+) -> Verification:
+    """
+    Check the primes up to n against the fixtures in one pass.
+
+    Every segment that lies entirely at or below n is compared by count
+    and digest, and every pi(10^k) with 10^k <= n by count. The stream
+    must be strictly increasing; it is not kept in memory.
+
+    Args:
+        primes: The primes up to n, in increasing order
+        n: Upper limit the primes were computed for
+        fixtures: Fixture document, the packaged one if None
+
+    Returns:
+        The verification
+    """
+    data = (fixtures or load())["primes"]
+    size, counts, digests = data["segment"], data["counts"], data["sha256"]
+    pi = sorted((int(x), count) for x, count in data["pi"].items() if int(x) <= n)
+    result = Verification(f"primes up to {n}", covered=min(n, data["limit"] - 1))
+    complete = min((n + 1) // size, len(counts))
+    buffer: List[int] = []
+    index = total = 0
+    previous = -1
+    checkpoint = 0
+
+    def close_segment() -> None:
+        if index < complete:
+            span = f"segment [{index * size}, {(index + 1) * size})"
+            if len(buffer) != counts[index]:
+                result.errors.append(f"{span}: {len(buffer)} primes, expected {counts[index]}")
+            elif hashlib.sha256(_pack(buffer)).hexdigest() != digests[index]:
+                result.errors.append(f"{span}: digest differs")
+            result.checked += 1
+
+    def pass_checkpoints(limit: float) -> None:
+        nonlocal checkpoint
+        while checkpoint < len(pi) and pi[checkpoint][0] < limit:
+            x, expected = pi[checkpoint]
+            if total != expected:
+                result.errors.append(f"pi({x}) = {total}, expected {expected}")
+            result.checked += 1
+            checkpoint += 1
+
+    for p in primes:
+        if p <= previous or p > n:
+            result.errors.append(f"{p} out of order or above {n} after {previous}")
+            return result
+        previous = p
+        pass_checkpoints(p)
+        while p >= (index + 1) * size:
+            close_segment()
+            buffer = []
+            index += 1
+        if index < complete:
+            buffer.append(p)
+        total += 1
+    pass_checkpoints(math.inf)
+    while index < complete:
+        close_segment()
+        buffer = []
+        index += 1
+    return result
+
+
+def _verify_residues(
+    problem: str, n: int, value: int, fixtures: Optional[Dict[str, Any]]
+) -> Verification:
+    data = fixtures or load()
+    result = Verification(f"{problem}({n})", covered=n)
+    expected = data[problem].get(str(n))
+    if expected is None:
+        result.errors.append(f"no golden {problem} residues for n={n}")
+        return result
+    for m, residue in zip(data["moduli"], expected):
+        if value % m != residue:
+            result.errors.append(f"{problem}({n}) mod {m} = {value % m}, expected {residue}")
+        result.checked += 1
+    return result
+
+
+def verify_fib(n: int, value: int, fixtures: Optional[Dict[str, Any]] = None) -> Verification:
+    """
+    Check F(n) against the golden residues.
+
+    Args:
+        n: A checkpoint in the fixtures
+        value: The claimed F(n)
+        fixtures: Fixture document, the packaged one if None
+
+    Returns:
+        The verification, with an error if n is not a checkpoint
+    """
+    return _verify_residues("fib", n, value, fixtures)
+
+
+def verify_factorial(n: int, value: int, fixtures: Optional[Dict[str, Any]] = None) -> Verification:
+    """
+    Check n! against the golden residues.
+
+    Args:
+        n: A checkpoint in the fixtures
+        value: The claimed n!
+        fixtures: Fixture document, the packaged one if None
+
+    Returns:
+        The verification, with an error if n is not a checkpoint
+    """
+    return _verify_residues("factorial", n, value, fixtures)
+
+
+def verify(name: str, n: int, fixtures: Optional[Dict[str, Any]] = None) -> Verification:
+    """
+    Run a registered implementation at n and check its result.
+
+    Primality tests are checked on every integer up to n against the
+    fixture prime counts, which costs n calls.
+
+    Args:
+        name: Registered implementation name
+        n: Argument
+        fixtures: Fixture document, the packaged one if None
+
+    Returns:
+        The verification
+    """
+    impl = get(name)
+    func = impl.resolve()
+    if impl.problem == "fib":
+        result = verify_fib(n, cast(int, func(n)), fixtures)
+    elif impl.problem == "factorial":
+        result = verify_factorial(n, cast(int, func(n)), fixtures)
+    elif impl.problem == "primes":
+        result = verify_primes(cast(List[int], func(n)), n, fixtures)
+    else:
+        result = verify_primes((k for k in range(2, n + 1) if func(k)), n, fixtures)
+    result.subject = f"{name}({n})"
+    return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point: verify an implementation or regenerate the fixtures."""
+    parser = argparse.ArgumentParser(
+        prog="python -m algorithms.golden", description="Golden reference data"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    check = commands.add_parser("verify", help="run an implementation and check its result")
+    check.add_argument("impl", help="registered implementation name")
+    check.add_argument("n", type=int)
+    make = commands.add_parser("generate", help="recompute the fixture file")
+    make.add_argument("--prime-limit", type=float, default=DEFAULT_PRIME_LIMIT)
+    make.add_argument("--segment", type=int, default=DEFAULT_SEGMENT)
+    make.add_argument("--out", type=Path, default=None, help="output (default: packaged file)")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        out = args.out or fixture_path()
+        data = generate(int(args.prime_limit), args.segment)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(data, indent=1) + "\n")
+        print(f"Wrote {out}")
+        return 0
+
+    result = verify(args.impl, args.n)
+    status = "ok" if result.ok else "FAILED"
+    print(f"{result.subject}: {status}, {result.checked} fixture entries checked")
+    if result.covered < args.n:
+        print(f"  fixtures only cover arguments up to {result.covered}")
+    for error in result.errors:
+        print(f"  {error}")
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":
+    from algorithms import profiling
+
+    with profiling.from_argv("golden") as argv:
+        sys.exit(main(argv))
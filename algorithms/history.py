@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Benchmark history store
+
+Every benchmark report recorded here is appended to a SQLite database. Each
+run is keyed by the commit it measured and a fingerprint of the machine,
+and holds one row of samples per (implementation, n). The store lives at
+$ALGORITHMS_HISTORY, falling back to benchmark_results/history.sqlite.
+
+Record a report and show the trends with:
+
+    python -m algorithms.bench --json latest.json
+    python -m algorithms.history record latest.json
+    python -m algorithms.history report [--impl segmented_sieve] [--svg trends.svg]
+
+A trend only compares runs made on one machine, so the timings are not
+scaled by the calibration. The report lists changepoints: the first
+commit after which an implementation stayed slower (or faster) by more
+than the threshold. Splits are found by binary segmentation on the log
+of the run medians. Each split is confirmed with a Mann-Whitney test on
+the pooled repetitions of either side.
+"""
+import argparse
+import hashlib
+import html
+import json
+import math
+import os
+import sqlite3
+import statistics
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from algorithms.bench import format_time
+from algorithms.compare import DEFAULT_ALPHA, DEFAULT_THRESHOLD, mann_whitney_greater
+from algorithms.registry import implementations
+
+HISTORY_ENV = "ALGORITHMS_HISTORY"
+SCHEMA_VERSION = 1
+
+# Runs needed on each side of a changepoint, so a single noisy night is not
+# reported as a regression
+DEFAULT_MIN_SEGMENT = 2
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+ASCII_SPARK_CHARS = "_.-~^"
+
+# Environment fields that identify a machine; the commit and time do not
+_FINGERPRINT_KEYS = ("machine", "cpu", "cpus", "implementation", "python")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    commit_sha TEXT,
+    dirty INTEGER,
+    timestamp TEXT,
+    machine TEXT NOT NULL,
+    environment TEXT NOT NULL,
+    calibration_ns REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    problem TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    loops INTEGER NOT NULL,
+    median_ns REAL NOT NULL,
+    samples_ns TEXT NOT NULL,
+    PRIMARY KEY (run_id, name, n)
+);
+CREATE INDEX IF NOT EXISTS results_series ON results (name, n);
+CREATE INDEX IF NOT EXISTS runs_machine ON runs (machine);
+"""
+
+
+def history_path() -> Path:
+    """Return the database record() appends to."""
+    override = os.environ.get(HISTORY_ENV)
+    if override:
+        return Path(override)
+    return Path("benchmark_results") / "history.sqlite"
+
+
+def fingerprint(env: Dict[str, Any]) -> str:
+    """
+    Identify the machine a report was measured on.
+
+    Args:
+        env: The "environment" section of a report
+
+    Returns:
+        Short hash of the CPU, core count and interpreter
+    """
+    key = json.dumps({k: env.get(k) for k in _FINGERPRINT_KEYS}, sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()[:12]
+
+
+def connect(path: Optional[Path] = None) -> sqlite3.Connection:
+    """
+    Open the history database, creating its tables if needed.
+
+    Raises:
+        ValueError: If the database was written by a newer schema
+    """
+    path = Path(path or history_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version > SCHEMA_VERSION:
+        conn.close()
+        raise ValueError(f"{path} has schema version {version}, newer than {SCHEMA_VERSION}")
+    conn.executescript(_SCHEMA)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def record(report: Dict[str, Any], path: Optional[Path] = None) -> int:
+    """
+    Append a benchmark report to the history.
+
+    Args:
+        report: Output of algorithms.bench.report()
+        path: Database file, history_path() by default
+
+    Returns:
+        The id of the new run
+
+    Raises:
+        RuntimeError: If the database does not report the new run's id
+    """
+    env = report.get("environment", {})
+    conn = connect(path)
+    try:
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (commit_sha, dirty, timestamp, machine, environment, "
+                "calibration_ns) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    env.get("commit"),
+                    env.get("dirty"),
+                    env.get("timestamp"),
+                    fingerprint(env),
+                    json.dumps(env, sort_keys=True),
+                    report.get("calibration_ns"),
+                ),
+            )
+            run_id = cursor.lastrowid
+            if run_id is None:
+                raise RuntimeError(f"{path or history_path()} returned no id for the new run")
+            conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        r["name"],
+                        r.get("problem", ""),
+                        r["n"],
+                        r["loops"],
+                        r["median_ns"],
+                        json.dumps(r["samples_ns"]),
+                    )
+                    for r in report["results"]
+                ],
+            )
+    finally:
+        conn.close()
+    return run_id
+
+
+@dataclass
+class Point:
+    """
+    One run of one (implementation, n) pair.
+
+    Attributes:
+        run_id: Run the point belongs to, increasing with time
+        commit: Commit measured, with "+" appended for a dirty tree
+        timestamp: When the run was made
+        median_ns: Median time per call, in nanoseconds
+        samples: Time per call of every repetition, in nanoseconds
+    """
+
+    run_id: int
+    commit: str
+    timestamp: str
+    median_ns: float
+    samples: List[float]
+
+
+Series = Dict[Tuple[str, int], List[Point]]
+
+
+def latest_machine(path: Optional[Path] = None) -> Optional[str]:
+    """Return the fingerprint of the most recent run, None if there is none."""
+    conn = connect(path)
+    try:
+        row = conn.execute("SELECT machine FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def load(
+    names: Optional[Sequence[str]] = None,
+    problems: Optional[Sequence[str]] = None,
+    machine: Optional[str] = None,
+    path: Optional[Path] = None,
+) -> Series:
+    """
+    Read the runs of one machine as time series.
+
+    Args:
+        names: Implementations to include, all if None
+        problems: Problems to include, all if None
+        machine: Fingerprint to read, that of the most recent run if None
+        path: Database file, history_path() by default
+
+    Returns:
+        Points per (implementation, n), oldest first
+    """
+    machine = machine or latest_machine(path)
+    query = (
+        "SELECT r.name, r.n, runs.id, runs.commit_sha, runs.dirty, runs.timestamp, "
+        "r.median_ns, r.samples_ns FROM results r JOIN runs ON runs.id = r.run_id "
+        "WHERE runs.machine = ?"
+    )
+    params: List[Any] = [machine]
+    for column, values in (("r.name", names), ("r.problem", problems)):
+        if values:
+            query += f" AND {column} IN ({', '.join('?' * len(values))})"
+            params.extend(values)
+    query += " ORDER BY runs.id"
+    conn = connect(path)
+    try:
+        rows = conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+    series: Series = {}
+    for name, n, run_id, commit, dirty, timestamp, median, samples in rows:
+        label = (commit or "unknown")[:10] + ("+" if dirty else "")
+        series.setdefault((name, n), []).append(
+            Point(run_id, label, timestamp or "", median, json.loads(samples))
+        )
+    # Registry order, so the table reads like the bench output
+    order = {impl.name: i for i, impl in enumerate(implementations())}
+    keys = sorted(series, key=lambda key: (order.get(key[0], len(order)), key))
+    return {key: series[key] for key in keys}
+
+
+@dataclass
+class Changepoint:
+    """
+    A lasting shift in the timings of one (implementation, n) pair.
+
+    Attributes:
+        name: Implementation name
+        n: Argument
+        index: Position in the series of the first run after the shift
+        commit: Commit of that run
+        before_ns: Median of the run medians before the shift
+        after_ns: Median of the run medians from the shift on
+        p_value: One-sided Mann-Whitney p-value of the pooled samples
+        verdict: "regressed" or "improved"
+    """
+
+    name: str
+    n: int
+    index: int
+    commit: str
+    before_ns: float
+    after_ns: float
+    p_value: float
+    verdict: str
+
+    @property
+    def change(self) -> float:
+        """Relative change, e.g. 0.25 for 25% slower."""
+        return self.after_ns / self.before_ns - 1
+
+
+def changepoints(
+    name: str,
+    n: int,
+    points: Sequence[Point],
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+    min_segment: int = DEFAULT_MIN_SEGMENT,
+) -> List[Changepoint]:
+    """
+    Find the runs at which a time series shifted for good.
+
+    Binary segmentation: the split of a segment that most reduces the
+    squared error of the log medians is kept if the medians on either side
+    differ by more than threshold and the pooled samples differ at level
+    alpha. Both halves are then searched again.
+
+    Args:
+        name: Implementation name
+        n: Argument
+        points: Runs, oldest first
+        threshold: Relative change a shift must exceed
+        alpha: Significance level of the Mann-Whitney test
+        min_segment: Fewest runs allowed on either side of a split
+
+    Returns:
+        Changepoints in series order
+    """
+    logs = [math.log(p.median_ns) for p in points]
+    found: List[Changepoint] = []
+
+    def cost(lo: int, hi: int) -> float:
+        values = logs[lo:hi]
+        mean = sum(values) / len(values)
+        return sum((v - mean) ** 2 for v in values)
+
+    def search(lo: int, hi: int) -> None:
+        splits = range(lo + min_segment, hi - min_segment + 1)
+        if not splits:
+            return
+        k = min(splits, key=lambda s: cost(lo, s) + cost(s, hi))
+        before = statistics.median(p.median_ns for p in points[lo:k])
+        after = statistics.median(p.median_ns for p in points[k:hi])
+        left = [t for p in points[lo:k] for t in p.samples]
+        right = [t for p in points[k:hi] for t in p.samples]
+        if after > before * (1 + threshold):
+            p_value, verdict = mann_whitney_greater(left, right), "regressed"
+        elif after * (1 + threshold) < before:
+            p_value, verdict = mann_whitney_greater(right, left), "improved"
+        else:
+            return
+        if p_value >= alpha:
+            return
+        search(lo, k)
+        found.append(Changepoint(name, n, k, points[k].commit, before, after, p_value, verdict))
+        search(k, hi)
+
+    search(0, len(points))
+    return found
+
+
+def find_changepoints(series: Series, **options: Any) -> List[Changepoint]:
+    """Run changepoints() over every series, passing options through."""
+    found = []
+    for (name, n), points in series.items():
+        found.extend(changepoints(name, n, points, **options))
+    return found
+
+
+def sparkline(values: Sequence[float], chars: str = SPARK_CHARS) -> str:
+    """
+    Draw values as a one-line chart on a log scale.
+
+    Args:
+        values: Positive values, oldest first
+        chars: Glyphs from lowest to highest
+
+    Returns:
+        One glyph per value
+    """
+    logs = [math.log(v) for v in values]
+    lo, hi = min(logs, default=0.0), max(logs, default=0.0)
+    if hi - lo < 1e-12:
+        return chars[len(chars) // 2] * len(values)
+    top = len(chars) - 1
+    return "".join(chars[round((v - lo) / (hi - lo) * top)] for v in logs)
+
+
+def format_trends(
+    series: Series,
+    found: Sequence[Changepoint] = (),
+    width: int = 30,
+    ascii_only: bool = False,
+) -> str:
+    """
+    Format one trend row per (implementation, n) and the changepoints.
+
+    Args:
+        series: Output of load()
+        found: Changepoints to list below the table
+        width: Most recent runs drawn in each sparkline
+        ascii_only: Draw sparklines with ASCII characters
+
+    Returns:
+        Text table
+    """
+    chars = ASCII_SPARK_CHARS if ascii_only else SPARK_CHARS
+    lines = [
+        f"{'implementation':<26} {'n':>12} {'runs':>5} {'first':>12} {'last':>12} "
+        f"{'change':>8}  trend"
+    ]
+    for (name, n), points in series.items():
+        first, last = points[0].median_ns, points[-1].median_ns
+        trend = sparkline([p.median_ns for p in points[-width:]], chars)
+        lines.append(
+            f"{name:<26} {n:>12} {len(points):>5} {format_time(first):>12} "
+            f"{format_time(last):>12} {last / first - 1:>+8.1%}  {trend}"
+        )
+    if found:
+        lines.append("")
+        lines.append("Changepoints:")
+        for c in found:
+            lines.append(
+                f"  {c.name} n={c.n}: {c.verdict} {c.change:+.1%} at {c.commit} "
+                f"({format_time(c.before_ns)} -> {format_time(c.after_ns)}, p={c.p_value:.2g})"
+            )
+    return "\n".join(lines)
+
+
+def plot_trends_svg(
+    series: Series,
+    found: Sequence[Changepoint] = (),
+    width: int = 720,
+    row_height: int = 28,
+) -> str:
+    """
+    Draw one sparkline per (implementation, n) as an SVG document.
+
+    Each line is scaled to its own range on a log axis. Changepoints are
+    marked with a circle, red for regressions and green for improvements.
+
+    Args:
+        series: Output of load()
+        found: Changepoints to mark
+        width: Image width in pixels
+        row_height: Height of each row in pixels
+
+    Returns:
+        SVG source
+    """
+    left, right = 260, 100
+    plot_w = width - left - right
+    height = row_height * max(len(series), 1) + 10
+    marks = {(c.name, c.n, c.index): c.verdict for c in found}
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        'font-family="sans-serif" font-size="12">'
+    ]
+    for row, ((name, n), points) in enumerate(series.items()):
+        top = 5 + row * row_height
+        logs = [math.log(p.median_ns) for p in points]
+        lo, hi = min(logs), max(logs)
+        span = hi - lo or 1.0
+        step = plot_w / max(len(points) - 1, 1)
+
+        def xy(i: int) -> Tuple[float, float]:
+            return left + i * step, top + 4 + (hi - logs[i]) / span * (row_height - 8)
+
+        parts.append(
+            f'<text x="{left - 8}" y="{top + row_height / 2 + 4}" text-anchor="end">'
+            f"{html.escape(f'{name} n={n}')}</text>"
+        )
+        path = " ".join("%.1f,%.1f" % xy(i) for i in range(len(points)))
+        parts.append(f'<polyline points="{path}" fill="none" stroke="#1f77b4" stroke-width="1.5"/>')
+        for i in range(len(points)):
+            verdict = marks.get((name, n, i))
+            if verdict:
+                x, y = xy(i)
+                color = "#d62728" if verdict == "regressed" else "#2ca02c"
+                parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3.5" fill="{color}"/>')
+        parts.append(
+            f'<text x="{width - right + 8}" y="{top + row_height / 2 + 4}">'
+            f"{format_time(points[-1].median_ns)}</text>"
+        )
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point: record reports or show trends."""
+    parser = argparse.ArgumentParser(
+        prog="python -m algorithms.history", description="Benchmark history and trends"
+    )
+    parser.add_argument("--db", type=Path, help=f"database file (default: {history_path()})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("record", help="append JSON reports from algorithms.bench")
+    add.add_argument("reports", nargs="+", type=Path)
+    show = commands.add_parser("report", help="print trends and changepoints")
+    show.add_argument("--impl", action="append", help="implementation to show")
+    show.add_argument("--problem", action="append", help="problem to show")
+    show.add_argument("--machine", help="machine fingerprint (default: that of the last run)")
+    show.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    show.add_argument("--alpha", type=float, default=DEFAULT_ALPHA)
+    show.add_argument("--min-segment", type=int, default=DEFAULT_MIN_SEGMENT)
+    show.add_argument("--ascii", action="store_true", help="ASCII-only sparklines")
+    show.add_argument("--svg", metavar="PATH", help="also write the sparklines as SVG")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        for report_path in args.reports:
+            run_id = record(json.loads(report_path.read_text()), args.db)
+            print(f"Recorded {report_path} as run {run_id}")
+        return 0
+
+    series = load(args.impl, args.problem, args.machine, args.db)
+    if not series:
+        print("No runs recorded", file=sys.stderr)
+        return 1
+    found = find_changepoints(
+        series, threshold=args.threshold, alpha=args.alpha, min_segment=args.min_segment
+    )
+    print(format_trends(series, found, ascii_only=args.ascii))
+    if args.svg:
+        Path(args.svg).write_text(plot_trends_svg(series, found) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    from algorithms import profiling
+
+    with profiling.from_argv("history") as argv:
+        sys.exit(main(argv))
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Opt-in call counters and latency histograms for the registered implementations
+
+enable() replaces each registered function on its module with a wrapper.
+The wrapper counts calls and errors and adds every call's duration to a
+histogram with power-of-two nanosecond buckets. disable() puts the
+original functions back, so while instrumentation is off there is no
+wrapper and no overhead at all. Setting $ALGORITHMS_INSTRUMENT before the
+package is imported enables it: "1" for every implementation, or a
+comma-separated list of implementation names.
+
+Only calls that look the function up on its module are seen. That covers
+Implementation.resolve(), and so the dispatcher and the tooling, but not
+names bound earlier with "from algorithms.x import f". An implementation
+that recurses through its own module attribute, such as fib_recursive,
+would send every inner call through the wrapper too. The wrapper calls a
+copy of such a function instead, whose own name is bound to the copy, so
+only the outermost call is counted and the recursion runs at full speed.
+A memoized copy gets a cache of its own while instrumentation is on.
+
+    from algorithms import instrument
+    instrument.enable()
+    ...
+    print(instrument.to_prometheus())
+"""
+import functools
+import json
+import os
+import threading
+import time
+import types
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from algorithms.registry import get, implementations
+
+INSTRUMENT_ENV = "ALGORITHMS_INSTRUMENT"
+
+# Bucket i holds durations d with 2^(i-1) <= d < 2^i nanoseconds, which
+# covers any duration perf_counter_ns can return
+BUCKETS = 64
+
+
+class _Shard:
+    """Counters written by a single thread, so updates need no lock."""
+
+    __slots__ = ("active", "calls", "errors", "total_ns", "buckets")
+
+    def __init__(self) -> None:
+        self.active = False
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.buckets = [0] * BUCKETS
+
+
+@dataclass
+class Stats:
+    """
+    Counters of one instrumented implementation.
+
+    Each thread that calls the implementation writes to its own shard;
+    reads add the shards up.
+
+    Attributes:
+        name: Implementation name
+        problem: Problem it solves
+    """
+
+    name: str
+    problem: str
+    shards: List[_Shard] = field(default_factory=list, repr=False)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def shard(self) -> _Shard:
+        """Register and return a new shard for the calling thread."""
+        shard = _Shard()
+        with self.lock:
+            self.shards.append(shard)
+        return shard
+
+    def totals(self) -> Tuple[int, int, int, List[int]]:
+        """Return calls, errors, total nanoseconds and bucket counts over all shards."""
+        with self.lock:
+            shards = list(self.shards)
+        buckets = [0] * BUCKETS
+        calls = errors = total = 0
+        for shard in shards:
+            calls += shard.calls
+            errors += shard.errors
+            total += shard.total_ns
+            buckets = [a + b for a, b in zip(buckets, shard.buckets)]
+        return calls, errors, total, buckets
+
+    @property
+    def calls(self) -> int:
+        """Completed outermost calls, including those that raised."""
+        return self.totals()[0]
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a duration quantile, in nanoseconds, from the histogram.
+
+        Returns the upper bound of the bucket holding the quantile, so the
+        estimate is at most a factor of two high.
+        """
+        calls, _, _, buckets = self.totals()
+        seen = 0
+        for i, count in enumerate(buckets):
+            seen += count
+            if count and seen >= q * calls:
+                return float(1 << i)
+        return 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot."""
+        calls, errors, total, buckets = self.totals()
+        return {
+            "name": self.name,
+            "problem": self.problem,
+            "calls": calls,
+            "errors": errors,
+            "total_ns": total,
+            "p50_ns": self.quantile(0.5),
+            "p99_ns": self.quantile(0.99),
+            # Upper bound in nanoseconds -> count, empty buckets left out
+            "buckets": {str(1 << i): c for i, c in enumerate(buckets) if c},
+        }
+
+
+_stats: Dict[str, Stats] = {}
+_originals: Dict[str, Callable[..., Any]] = {}
+
+
+class _Globals(Dict[str, Any]):
+    """Globals of a function copy: a few names of its own, the module's for the rest."""
+
+    def __init__(self, module: Dict[str, Any]) -> None:
+        super().__init__()
+        self.module = module
+
+    def __missing__(self, key: str) -> Any:
+        return self.module[key]
+
+
+def _rebound(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Return a copy of func whose recursive calls stay inside the copy.
+
+    func is returned as it is unless it calls itself through its module
+    attribute. An lru_cache function is copied with a new cache of the same
+    parameters.
+    """
+    cache_parameters = getattr(func, "cache_parameters", None)
+    plain = func.__wrapped__ if cache_parameters else func  # type: ignore[attr-defined]
+    code = getattr(plain, "__code__", None)
+    if code is None or func.__name__ not in code.co_names:
+        return func
+    names = _Globals(plain.__globals__)
+    copy = types.FunctionType(code, names, plain.__name__, plain.__defaults__, plain.__closure__)
+    copy.__kwdefaults__ = plain.__kwdefaults__
+    functools.update_wrapper(copy, plain)
+    bound = functools.lru_cache(**cache_parameters())(copy) if cache_parameters else copy
+    names[func.__name__] = bound
+    return bound
+
+
+def _wrap(func: Callable[..., Any], stats: Stats) -> Callable[..., Any]:
+    """Return a wrapper of func that records outermost calls into stats."""
+    local = threading.local()
+    clock = time.perf_counter_ns
+    target = _rebound(func)
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            shard = local.shard
+        except AttributeError:
+            shard = local.shard = stats.shard()
+        if shard.active:
+            return target(*args, **kwargs)
+        shard.active = True
+        start = clock()
+        try:
+            return target(*args, **kwargs)
+        except BaseException:
+            shard.errors += 1
+            raise
+        finally:
+            elapsed = clock() - start
+            shard.active = False
+            shard.calls += 1
+            shard.total_ns += elapsed
+            shard.buckets[elapsed.bit_length()] += 1
+
+    # lru_cache methods are not in __dict__, so functools.wraps misses them
+    for attr in ("cache_clear", "cache_info"):
+        if hasattr(target, attr):
+            setattr(wrapper, attr, getattr(target, attr))
+    return wrapper
+
+
+def enable(names: Optional[Iterable[str]] = None) -> None:
+    """
+    Wrap registered implementations.
+
+    Counters of implementations that were instrumented before are kept.
+
+    Args:
+        names: Implementations to wrap, every registered one if None
+    """
+    impls = implementations() if names is None else [get(name) for name in names]
+    for impl in impls:
+        if impl.name in _originals:
+            continue
+        module = __import__(impl.module, fromlist=[impl.name])
+        func = getattr(module, impl.name)
+        stats = _stats.setdefault(impl.name, Stats(impl.name, impl.problem))
+        _originals[impl.name] = func
+        setattr(module, impl.name, _wrap(func, stats))
+
+
+def enable_from_env() -> None:
+    """Enable the implementations selected by $ALGORITHMS_INSTRUMENT, if it is set."""
+    value = os.environ.get(INSTRUMENT_ENV, "").strip()
+    if value in ("", "0"):
+        return
+    enable(None if value == "1" else [v.strip() for v in value.split(",") if v.strip()])
+
+
+def disable(names: Optional[Iterable[str]] = None) -> None:
+    """
+    Put original functions back; the counters are kept.
+
+    Args:
+        names: Implementations to unwrap, every wrapped one if None
+    """
+    for name in list(_originals) if names is None else names:
+        func = _originals.pop(name, None)
+        if func is not None:
+            impl = get(name)
+            setattr(__import__(impl.module, fromlist=[name]), name, func)
+
+
+def enabled(name: Optional[str] = None) -> bool:
+    """Whether an implementation, or any implementation if name is None, is wrapped."""
+    return bool(_originals) if name is None else name in _originals
+
+
+def reset() -> None:
+    """Zero every counter."""
+    for stats in _stats.values():
+        with stats.lock:
+            for shard in stats.shards:
+                shard.calls = shard.errors = shard.total_ns = 0
+                shard.buckets = [0] * BUCKETS
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Return the counters of every implementation that has been called.
+
+    Returns:
+        Stats.to_dict() output per implementation name
+    """
+    return {name: s.to_dict() for name, s in _stats.items() if s.calls}
+
+
+def to_json(indent: Optional[int] = 2) -> str:
+    """Return snapshot() as a JSON document."""
+    return json.dumps(snapshot(), indent=indent)
+
+
+def to_prometheus(prefix: str = "algorithms") -> str:
+    """
+    Return the counters in the Prometheus text exposition format.
+
+    Emits a calls counter, an errors counter and a duration histogram in
+    seconds, labelled by implementation and problem.
+
+    Args:
+        prefix: Metric name prefix
+
+    Returns:
+        Exposition text ending in a newline
+    """
+    calls = [
+        f"# HELP {prefix}_calls_total Calls of each algorithm implementation.",
+        f"# TYPE {prefix}_calls_total counter",
+    ]
+    errors = [
+        f"# HELP {prefix}_errors_total Calls that raised an exception.",
+        f"# TYPE {prefix}_errors_total counter",
+    ]
+    durations = [
+        f"# HELP {prefix}_call_duration_seconds Duration of each call.",
+        f"# TYPE {prefix}_call_duration_seconds histogram",
+    ]
+    for name, s in _stats.items():
+        count, failed, total, buckets = s.totals()
+        if not count:
+            continue
+        labels = f'implementation="{name}",problem="{s.problem}"'
+        calls.append(f"{prefix}_calls_total{{{labels}}} {count}")
+        errors.append(f"{prefix}_errors_total{{{labels}}} {failed}")
+        cumulative = 0
+        for i, bucket in enumerate(buckets):
+            cumulative += bucket
+            # Only buckets from the first call to the slowest one carry information
+            if cumulative:
+                durations.append(
+                    f'{prefix}_call_duration_seconds_bucket{{{labels},le="{(1 << i) / 1e9:.9g}"}} '
+                    f"{cumulative}"
+                )
+            if cumulative == count:
+                break
+        durations.append(f'{prefix}_call_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+        durations.append(f"{prefix}_call_duration_seconds_sum{{{labels}}} {total / 1e9:.9g}")
+        durations.append(f"{prefix}_call_duration_seconds_count{{{labels}}} {count}")
+    return "\n".join(calls + errors + durations) + "\n"
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Output helpers for very large integer results
+
+CPython's int to str conversion is quadratic and refuses integers with more
+than sys.get_int_max_str_digits() digits, so printing results such as
+factorial_math(10**5) can take longer than computing them. This module
+provides divide-and-conquer decimal conversion, chunked streaming writes to
+files or sockets, and linear-time hexadecimal, base64 and raw binary forms.
+"""
+import base64
+import io
+from functools import lru_cache
+from typing import IO, Any, Iterator, Union
+
+try:
+    import _decimal  # noqa: F401  (C accelerator: subquadratic multiplication)
+    import decimal
+
+    _HAVE_FAST_DECIMAL = True
+    _EXACT_CONTEXT = decimal.Context(
+        prec=decimal.MAX_PREC,
+        Emax=decimal.MAX_EMAX,
+        Emin=decimal.MIN_EMIN,
+        traps=[decimal.Inexact, decimal.Overflow],
+    )
+except ImportError:
+    _HAVE_FAST_DECIMAL = False
+
+# Integers below this many bits are converted with the built-in str(); the
+# limit keeps every piece well inside the default int max str digits (4300).
+_BASE_CASE_BITS = 8192
+
+# Default number of characters written per chunk when streaming
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+FORMATS = ("decimal", "hex", "base64", "binary")
+
+
+@lru_cache(maxsize=128)
+def _decimal_pow2(k: int) -> "decimal.Decimal":
+    """Return 2**k as an exact Decimal, cached across conversions."""
+    with decimal.localcontext(_EXACT_CONTEXT):
+        return decimal.Decimal(2) ** k
+
+
+@lru_cache(maxsize=128)
+def _pow10(k: int) -> int:
+    """Return 10**k, cached across conversions."""
+    return int(10**k)
+
+
+def _to_decimal_object(n: int) -> "decimal.Decimal":
+    """
+    Convert a non-negative int to an exact Decimal by binary splitting.
+
+    n = hi * 2**w + lo, where both halves are converted recursively and the
+    recombination uses libmpdec's number-theoretic-transform multiplication.
+    """
+
+    def convert(value: int, width: int) -> "decimal.Decimal":
+        if width <= _BASE_CASE_BITS:
+            return decimal.Decimal(value)
+        half = width >> 1
+        hi = value >> half
+        lo = value - (hi << half)
+        return convert(lo, half) + convert(hi, width - half) * _decimal_pow2(half)
+
+    with decimal.localcontext(_EXACT_CONTEXT):
+        return convert(n, n.bit_length())
+
+
+def _to_decimal_pure(n: int, width: int = 0) -> str:
+    """
+    Convert a non-negative int to decimal by splitting on powers of ten.
+
+    Used when the C decimal module is unavailable. `width` zero-pads the
+    result, which is needed for every piece except the most significant.
+    """
+    if n.bit_length() <= _BASE_CASE_BITS:
+        return str(n).zfill(width)
+    digits = max(width, int(n.bit_length() * 0.30102999566398120) + 1)
+    k = 1 << ((digits >> 1).bit_length() - 1)
+    hi, lo = divmod(n, _pow10(k))
+    return _to_decimal_pure(hi, max(width - k, 0)) + _to_decimal_pure(lo, k)
+
+
+def to_decimal(n: int) -> str:
+    """
+    Convert an integer of any size to its decimal string.
+
+    Unlike str(), this ignores the int max str digits limit and runs in
+    subquadratic time when the C decimal module is available.
+
+    Time complexity: O(M(n) log n) where M is the multiplication cost
+    Space complexity: O(n)
+
+    Args:
+        n: Integer to convert
+
+    Returns:
+        Decimal representation of n
+    """
+    if n < 0:
+        return "-" + to_decimal(-n)
+    if n.bit_length() <= _BASE_CASE_BITS:
+        return str(n)
+    if _HAVE_FAST_DECIMAL:
+        return str(_to_decimal_object(n))
+    return _to_decimal_pure(n)
+
+
+def to_hex(n: int) -> str:
+    """
+    Convert an integer to a hexadecimal string (linear time, no digit limit).
+
+    Args:
+        n: Integer to convert
+
+    Returns:
+        Hexadecimal representation of n with a 0x prefix
+    """
+    return hex(n)
+
+
+def to_bytes(n: int) -> bytes:
+    """
+    Convert an integer to raw big-endian two's complement bytes.
+
+    Args:
+        n: Integer to convert
+
+    Returns:
+        Minimal-length signed big-endian byte string
+    """
+    return n.to_bytes(n.bit_length() // 8 + 1, "big", signed=True)
+
+
+def from_bytes(data: bytes) -> int:
+    """
+    Inverse of to_bytes().
+
+    Args:
+        data: Signed big-endian byte string
+
+    Returns:
+        The decoded integer
+    """
+    return int.from_bytes(data, "big", signed=True)
+
+
+def to_base64(n: int) -> str:
+    """
+    Convert an integer to base64 of its raw bytes (see to_bytes()).
+
+    Args:
+        n: Integer to convert
+
+    Returns:
+        ASCII base64 text
+    """
+    return base64.b64encode(to_bytes(n)).decode("ascii")
+
+
+def format_int(n: int, fmt: str = "decimal") -> str:
+    """
+    Format an integer as text in one of the supported formats.
+
+    Args:
+        n: Integer to format
+        fmt: One of "decimal", "hex", "base64" or "binary" (hex of raw bytes)
+
+    Returns:
+        Text representation of n
+
+    Raises:
+        ValueError: If fmt is not a supported format
+    """
+    if fmt == "decimal":
+        return to_decimal(n)
+    if fmt == "hex":
+        return to_hex(n)
+    if fmt == "base64":
+        return to_base64(n)
+    if fmt == "binary":
+        return to_bytes(n).hex()
+    raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+def summarize_int(n: int, edge_digits: int = 20) -> str:
+    """
+    Return a short decimal preview of a large integer.
+
+    Only the leading and trailing digits are shown, followed by the digit
+    count, e.g. "40238726007709377354...00000000000000000000 (2568 digits)".
+
+    Args:
+        n: Integer to summarize
+        edge_digits: Number of digits shown at each end
+
+    Returns:
+        The full decimal string if it is short, otherwise a preview
+    """
+    text = to_decimal(n)
+    digits = len(text) - (text[0] == "-")
+    if len(text) <= 2 * edge_digits + 3:
+        return text
+    return f"{text[:edge_digits]}...{text[-edge_digits:]} ({digits} digits)"
+
+
+def iter_decimal(n: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield the decimal representation of n in chunks of chunk_size characters.
+
+    Args:
+        n: Integer to convert
+        chunk_size: Maximum number of characters per chunk
+
+    Yields:
+        Consecutive slices of the decimal string
+    """
+    text = to_decimal(n)
+    for start in range(0, len(text), chunk_size):
+        yield text[start : start + chunk_size]
+
+
+def write_int(
+    n: int,
+    stream: Union[IO[Any], Any],
+    fmt: str = "decimal",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Stream an integer to a text file, binary file or socket in chunks.
+
+    Text streams receive str chunks; binary streams and sockets (anything
+    with sendall()) receive bytes. With fmt="binary" the raw bytes from
+    to_bytes() are written, which requires a binary stream or socket.
+
+    Args:
+        n: Integer to write
+        stream: Destination file object or socket
+        fmt: One of "decimal", "hex", "base64" or "binary"
+        chunk_size: Maximum number of characters or bytes per write
+
+    Returns:
+        Number of characters or bytes written
+
+    Raises:
+        ValueError: If fmt is unknown or raw bytes are sent to a text stream
+    """
+    send = getattr(stream, "sendall", None) or stream.write
+    is_text = isinstance(stream, io.TextIOBase)
+
+    if fmt == "binary":
+        if is_text:
+            raise ValueError("Raw binary output needs a binary stream or socket")
+        payload: Union[str, bytes] = to_bytes(n)
+        chunks: Iterator[Union[str, bytes]] = (
+            payload[i : i + chunk_size] for i in range(0, len(payload), chunk_size)
+        )
+    elif fmt == "decimal":
+        chunks = iter_decimal(n, chunk_size)
+    else:
+        text = format_int(n, fmt)
+        chunks = (text[i : i + chunk_size] for i in range(0, len(text), chunk_size))
+
+    written = 0
+    for chunk in chunks:
+        if not is_text and isinstance(chunk, str):
+            chunk = chunk.encode("ascii")
+        send(chunk)
+        written += len(chunk)
+    return written
@@ -6,8 +6,10 @@ This module provides various implementations of prime number algorithms
 to demonstrate different approaches and their performance characteristics.
 """
 import math
-import time
-from typing import List
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    from algorithms.bench import Measurement
 
 
 def is_prime_naive(n: int) -> bool:
@@ -67,6 +69,49 @@ def is_prime_optimized(n: int) -> bool:
     return True
 
 
+# Witnesses that make Miller-Rabin deterministic for n < 3.3 * 10^24
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def is_prime_miller_rabin(n: int) -> bool:
+    """
+    Miller-Rabin primality test with fixed witnesses.
+
+    Deterministic for n < 3.3 * 10^24; above that it is a strong probable
+    prime test to 13 bases.
+
+    Time complexity: O(log^3 n) with schoolbook multiplication
+    Space complexity: O(log n)
+
+    Args:
+        n: Number to check for primality
+
+    Returns:
+        True if n is prime, False otherwise
+    """
+    if n < 2:
+        return False
+    for p in _MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
 def primes_up_to(n: int) -> List[int]:
     """
     Generate a list of all primes up to n using trial division.
@@ -159,51 +204,36 @@ def segmented_sieve(n: int, segment_size: int = 10000) -> List[int]:
     return primes
 
 
-def benchmark_prime_algorithms(n: int) -> None:
+def benchmark_prime_algorithms(n: int) -> List["Measurement"]:
     """
-    Benchmark different prime number algorithms.
+    Benchmark the registered prime algorithms.
+
+    Primality tests are timed on the first prime at or above n - 1, their
+    worst case; prime generation on all primes up to n. Implementations
+    whose declared range excludes the argument are skipped.
 
     Args:
         n: Upper limit for prime number generation
-    """
-    print(f"Benchmarking prime number algorithms up to n={n}")
-
-    # Check if a specific number is prime
-    test_value = n - 1
 
-    start = time.time()
-    result = is_prime_naive(test_value)
-    end = time.time()
-    print(f"is_prime_naive({test_value}): {result} (Time: {end - start:.6f}s)")
-
-    start = time.time()
-    result = is_prime_optimized(test_value)
-    end = time.time()
-    print(f"is_prime_optimized({test_value}): {result} (Time: {end - start:.6f}s)")
-
-    # Generate primes up to n
-    if n <= 100000:  # Only run for smaller values
-        start = time.time()
-        primes_list = primes_up_to(n)
-        end = time.time()
-        print(f"primes_up_to({n}): Found {len(primes_list)} primes (Time: {end - start:.6f}s)")
-
-    start = time.time()
-    sieve_list = sieve_of_eratosthenes(n)
-    end = time.time()
-    print(f"sieve_of_eratosthenes({n}): Found {len(sieve_list)} primes (Time: {end - start:.6f}s)")
+    Returns:
+        The measurements, also printed as a table
+    """
+    from algorithms.bench import format_table, run
 
-    start = time.time()
-    segmented_list = segmented_sieve(n)
-    end = time.time()
-    print(f"segmented_sieve({n}): Found {len(segmented_list)} primes (Time: {end - start:.6f}s)")
+    print(f"Benchmarking prime number algorithms up to n={n}")
+    results = run(["is_prime"], sizes=[n - 1]) + run(["primes"], sizes=[n])
+    print(format_table(results))
+    return results
 
 
 if __name__ == "__main__":
-    # Display primes up to 50
-    limit = 50
-    print(f"Primes up to {limit}:")
-    print(sieve_of_eratosthenes(limit))
+    from algorithms import profiling
+
+    with profiling.from_argv("primes"):
+        # Display primes up to 50
+        limit = 50
+        print(f"Primes up to {limit}:")
+        print(sieve_of_eratosthenes(limit))
 
-    # Benchmark
-    benchmark_prime_algorithms(1000000)
+        # Benchmark
+        benchmark_prime_algorithms(1000000)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Profiling mode shared by the command line entry points
+
+Every entry point accepts
+
+    --profile {cprofile,sample,sample-wall}
+    --profile-output PATH
+    --profile-interval SECONDS
+
+or the same settings from $ALGORITHMS_PROFILE, $ALGORITHMS_PROFILE_OUTPUT
+and $ALGORITHMS_PROFILE_INTERVAL; the options win over the environment.
+
+cprofile traces every call deterministically and writes a pstats file,
+which ``python -m pstats`` or snakeviz can open. sample interrupts the
+program every interval of CPU time with signal.setitimer and counts the
+stacks it finds; sample-wall does the same on wall-clock time, which also
+sees time spent waiting, for example on an MCP server. Both write
+collapsed stacks, one "outer;...;inner count" line per stack, which
+flamegraph.pl, speedscope and inferno render as flame graphs. Sampling
+costs little but only sees the main thread.
+
+An entry point wraps its body like this:
+
+    if __name__ == "__main__":
+        with profiling.from_argv("bench") as argv:
+            sys.exit(main(argv))
+"""
+import argparse
+import contextlib
+import cProfile
+import os
+import signal
+import sys
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+PROFILE_ENV = "ALGORITHMS_PROFILE"
+OUTPUT_ENV = "ALGORITHMS_PROFILE_OUTPUT"
+INTERVAL_ENV = "ALGORITHMS_PROFILE_INTERVAL"
+
+MODES = ("cprofile", "sample", "sample-wall")
+
+# 200 samples per second of CPU time: enough for a flame graph of a run
+# that lasts a few seconds, and well under 1% overhead
+DEFAULT_INTERVAL = 0.005
+
+
+class Sampler:
+    """
+    Statistical profiler driven by an interval timer.
+
+    Each timer signal walks the interrupted stack and counts it. Signals are
+    delivered to the main thread only, so other threads are not seen.
+
+    Attributes:
+        interval: Seconds between samples
+        wall: Sample on wall-clock time instead of CPU time
+        counts: Samples per collapsed stack
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, wall: bool = False) -> None:
+        if not hasattr(signal, "setitimer"):
+            raise ValueError("Sampling needs signal.setitimer, which this platform lacks")
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive")
+        self.interval = interval
+        self.wall = wall
+        self.counts: Counter = Counter()
+        self._labels: Dict[CodeType, str] = {}
+        self._timer = signal.ITIMER_REAL if wall else signal.ITIMER_PROF
+        self._signal = signal.SIGALRM if wall else signal.SIGPROF
+        self._previous: Union[Callable[[int, Optional[FrameType]], Any], int, None] = None
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _handle(self, signum: int, frame: Optional[FrameType]) -> None:
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        self.counts[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        """Install the signal handler and start the timer."""
+        self._previous = signal.signal(self._signal, self._handle)
+        signal.setitimer(self._timer, self.interval, self.interval)
+
+    def stop(self) -> None:
+        """Stop the timer and put the previous signal handler back."""
+        signal.setitimer(self._timer, 0)
+        signal.signal(self._signal, self._previous)
+
+    @property
+    def samples(self) -> int:
+        """Number of samples taken."""
+        return sum(self.counts.values())
+
+    def collapsed(self) -> str:
+        """Return the samples as collapsed stacks, most frequent first."""
+        lines = [f"{stack} {count}" for stack, count in self.counts.most_common()]
+        return "".join(line + "\n" for line in lines)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the profiling options to an argument parser."""
+    group = parser.add_argument_group("profiling")
+    group.add_argument(
+        "--profile", choices=MODES, help=f"profile the run (default: ${PROFILE_ENV})"
+    )
+    group.add_argument("--profile-output", metavar="PATH", help="where to write the profile")
+    group.add_argument(
+        "--profile-interval",
+        type=float,
+        metavar="SECONDS",
+        help=f"sampling interval (default: {DEFAULT_INTERVAL})",
+    )
+
+
+def default_output(name: str, mode: str) -> str:
+    """Return the file a profile of an entry point is written to by default."""
+    return f"{name}.pstats" if mode == "cprofile" else f"{name}.collapsed"
+
+
+@contextlib.contextmanager
+def profiled(
+    name: str,
+    mode: Optional[str] = None,
+    output: Optional[str] = None,
+    interval: Optional[float] = None,
+) -> Iterator[None]:
+    """
+    Profile the body of the with statement.
+
+    Settings that are None are taken from the environment. Without a mode
+    from either place this does nothing. The profile is written when the
+    body ends, also when it raises or calls sys.exit().
+
+    Args:
+        name: Entry point name, used for the default output file
+        mode: One of MODES
+        output: Path of the pstats or collapsed-stack file
+        interval: Sampling interval in seconds
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    mode = mode or os.environ.get(PROFILE_ENV) or None
+    if mode is None:
+        yield
+        return
+    if mode not in MODES:
+        raise ValueError(f"Unknown profiling mode {mode!r}, expected one of {', '.join(MODES)}")
+    output = output or os.environ.get(OUTPUT_ENV) or default_output(name, mode)
+    if interval is None:
+        interval = float(os.environ.get(INTERVAL_ENV) or DEFAULT_INTERVAL)
+
+    if mode == "cprofile":
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(output)
+            print(f"Profile written to {output}", file=sys.stderr)
+    else:
+        sampler = Sampler(interval, wall=mode == "sample-wall")
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            with open(output, "w") as f:
+                f.write(sampler.collapsed())
+            print(f"Profile written to {output} ({sampler.samples} samples)", file=sys.stderr)
+
+
+@contextlib.contextmanager
+def from_argv(name: str, argv: Optional[Sequence[str]] = None) -> Iterator[List[str]]:
+    """
+    Profile an entry point according to its command line and environment.
+
+    The profiling options are removed from the command line, so the entry
+    point's own parser never sees them.
+
+    Args:
+        name: Entry point name, used for the default output file
+        argv: Command line arguments, sys.argv[1:] by default
+
+    Yields:
+        The remaining arguments
+    """
+    # No abbreviations, which could swallow the entry point's own options
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    add_arguments(parser)
+    args, rest = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    with profiled(name, args.profile, args.profile_output, args.profile_interval):
+        yield rest
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Registry of algorithm implementations
+
+Every implementation in the algorithms package is described here once: the
+problem it solves, the range of arguments it handles, and its documented
+complexity. The dispatcher, the benchmark harness and the other tooling
+read this table instead of hardcoding function names.
+
+Implementations are recorded by module and function name and only imported
+when first resolved, so importing the registry stays cheap.
+"""
+import importlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+PROBLEMS = ("fib", "factorial", "primes", "is_prime")
+
+
+@dataclass(frozen=True)
+class Implementation:
+    """
+    One implementation of a problem.
+
+    Attributes:
+        name: Function name, unique across the registry
+        module: Dotted path of the module defining the function
+        problem: One of PROBLEMS
+        complexity: Time complexity in the argument n, counting big-integer
+            arithmetic at its bit cost (docstrings count operations, so an
+            O(n) loop of n-bit additions is O(n^2) here). Checked against
+            measurements by the scaling mode of algorithms.bench.
+        space: Peak memory in the argument n, counted in bits of the
+            integers held like complexity; checked by the memory-scaling
+            mode of algorithms.bench
+        min_n: Smallest argument the implementation accepts
+        max_n: Largest argument it handles (recursion depth, memory or a
+            running time that is not worth waiting for), None if unbounded
+    """
+
+    name: str
+    module: str
+    problem: str
+    complexity: str
+    space: str = "O(1)"
+    min_n: int = 0
+    max_n: Optional[int] = None
+
+    @property
+    def qualname(self) -> str:
+        """Fully qualified function name."""
+        return f"{self.module}.{self.name}"
+
+    def resolve(self) -> Callable[[int], object]:
+        """
+        Import the module and return the function.
+
+        The lookup happens on every call rather than being cached, so any
+        wrapper installed on the module attribute is picked up.
+        """
+        func: Callable[[int], object] = getattr(importlib.import_module(self.module), self.name)
+        return func
+
+    def supports(self, n: int) -> bool:
+        """Whether n lies inside the declared range."""
+        return n >= self.min_n and (self.max_n is None or n <= self.max_n)
+
+
+_REGISTRY: Dict[str, Implementation] = {}
+
+
+def register(impl: Implementation) -> Implementation:
+    """
+    Add an implementation to the registry.
+
+    Within a problem, implementations are kept in registration order, which
+    should run from the asymptotically slowest to the fastest; the
+    dispatcher falls back to the last one that supports an argument.
+
+    Args:
+        impl: Implementation to add
+
+    Returns:
+        The implementation, unchanged
+
+    Raises:
+        ValueError: If the problem is unknown or the name is taken
+    """
+    if impl.problem not in PROBLEMS:
+        raise ValueError(f"Unknown problem {impl.problem!r}; expected one of {', '.join(PROBLEMS)}")
+    if impl.name in _REGISTRY:
+        raise ValueError(f"Implementation {impl.name!r} is already registered")
+    _REGISTRY[impl.name] = impl
+    return impl
+
+
+def get(name: str) -> Implementation:
+    """
+    Look up an implementation by function name.
+
+    Raises:
+        KeyError: If no implementation has that name
+    """
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"No registered implementation named {name!r}") from None
+
+
+def implementations(problem: Optional[str] = None) -> List[Implementation]:
+    """
+    Return the registered implementations, optionally for one problem.
+
+    Args:
+        problem: One of PROBLEMS, or None for every implementation
+
+    Returns:
+        Implementations in registration order
+    """
+    return [impl for impl in _REGISTRY.values() if problem is None or impl.problem == problem]
+
+
+_FIB = "algorithms.fibonacci"
+_FACTORIAL = "algorithms.factorial"
+_PRIMES = "algorithms.primes"
+
+# Multiplying out an O(n log n)-bit factorial with balanced products costs
+# M(n log n), and CPython multiplies large ints with Karatsuba
+_FAST_FACTORIAL = "O(n^1.585 log^1.585 n)"
+
+# Ceilings come from the recursion limit, exponential running time or the
+# memory of an n-element list; the rest are unbounded.
+for _impl in (
+    Implementation("fib_recursive", _FIB, "fib", "O(phi^n)", "O(n)", max_n=30),
+    Implementation("fib_memoized", _FIB, "fib", "O(n^2)", "O(n^2)", max_n=400),
+    Implementation("fib_iterative", _FIB, "fib", "O(n^2)", "O(n)"),
+    Implementation("fib_fast_doubling", _FIB, "fib", "O(n^1.585)", "O(n)"),
+    Implementation(
+        "factorial_recursive", _FACTORIAL, "factorial", "O(n^2 log n)", "O(n log n)", max_n=900
+    ),
+    # Every frame keeps its own partial product alive
+    Implementation(
+        "factorial_tail_recursive",
+        _FACTORIAL,
+        "factorial",
+        "O(n^2 log n)",
+        "O(n^2 log n)",
+        max_n=900,
+    ),
+    Implementation(
+        "factorial_memoized", _FACTORIAL, "factorial", "O(n^2 log n)", "O(n^2 log n)", max_n=900
+    ),
+    Implementation("factorial_iterative", _FACTORIAL, "factorial", "O(n^2 log n)", "O(n log n)"),
+    Implementation(
+        "factorial_product_tree", _FACTORIAL, "factorial", _FAST_FACTORIAL, "O(n log n)"
+    ),
+    Implementation("factorial_parallel", _FACTORIAL, "factorial", _FAST_FACTORIAL, "O(n log n)"),
+    Implementation("factorial_math", _FACTORIAL, "factorial", _FAST_FACTORIAL, "O(n log n)"),
+    Implementation("factorial_prime_swing", _FACTORIAL, "factorial", _FAST_FACTORIAL, "O(n log n)"),
+    Implementation("is_prime_naive", _PRIMES, "is_prime", "O(n)", max_n=10**7),
+    Implementation("is_prime_optimized", _PRIMES, "is_prime", "O(sqrt(n))", max_n=10**14),
+    Implementation("is_prime_miller_rabin", _PRIMES, "is_prime", "O(log^3 n)", "O(log n)"),
+    # The returned list of n / log n primes dominates both of these
+    Implementation("primes_up_to", _PRIMES, "primes", "O(n sqrt(n))", "O(n / log n)", max_n=10**6),
+    Implementation(
+        "sieve_of_eratosthenes",
+        _PRIMES,
+        "primes",
+        "O(n log log n)",
+        "O(n)",
+        min_n=1,
+        max_n=5 * 10**7,
+    ),
+    Implementation("segmented_sieve", _PRIMES, "primes", "O(n log log n)", "O(n / log n)", min_n=2),
+):
+    register(_impl)
+del _impl
@@ -1,5 +1,12 @@
 #!/usr/bin/env bash
-# Benchmark Python algorithms
+# Benchmark Python algorithms and compare the run against a stored baseline
+#
+# Usage: scripts/benchmark.sh [--update-baseline] [extra algorithms.compare options]
+#
+# Every run is appended to the history database ($HISTORY). The first run
+# (or --update-baseline) saves the results as the baseline; later runs exit
+# non-zero when an implementation regressed. Changes to calls timed only
+# once, too few runs to test, are printed as warnings instead.
 
 set -e
 
@@ -15,47 +22,40 @@ echo -e "${BLUE}Algorithm Benchmarks${NC}"
 echo -e "${BLUE}=====================================${NC}\n"
 
 # Configuration
-RUN_PYTHON_URL="http://localhost:${MCP_RUNPYTHON_PORT:-3001}"
 OUTPUT_DIR="benchmark_results"
+BASELINE="${BASELINE:-$OUTPUT_DIR/baseline.json}"
+LATEST="$OUTPUT_DIR/latest.json"
+export ALGORITHMS_HISTORY="${HISTORY:-$OUTPUT_DIR/history.sqlite}"
+PYTHON="${PYTHON:-python3}"
+
+UPDATE_BASELINE=0
+if [ "$1" = "--update-baseline" ]; then
+    UPDATE_BASELINE=1
+    shift
+fi
 
 # Create output directory
 mkdir -p "$OUTPUT_DIR"
 
-# Function to benchmark an algorithm
-benchmark_algorithm() {
-    local algorithm=$1
-    local code_file="algorithms/${algorithm}.py"
-    
-    if [ ! -f "$code_file" ]; then
-        echo -e "${RED}Error: File $code_file not found${NC}"
-        return 1
-    fi
-    
-    echo -e "${BLUE}Benchmarking $algorithm implementation...${NC}"
-    
-    # Execute the code using the MCP server
-    curl -s -X POST "$RUN_PYTHON_URL/execute" \
-        -H "Content-Type: application/json" \
-        -d "{
-            \"name\": \"run\",
-            \"parameters\": {
-                \"code\": $(cat "$code_file" | jq -Rs .)
-            }
-        }" | jq '.result' > "$OUTPUT_DIR/${algorithm}_benchmark.txt"
-    
-    echo -e "${GREEN}Benchmark results saved to $OUTPUT_DIR/${algorithm}_benchmark.txt${NC}"
-    
-    # Display the results
-    echo -e "${YELLOW}Results:${NC}"
-    cat "$OUTPUT_DIR/${algorithm}_benchmark.txt"
-    echo
-}
-
 # Run benchmarks for all algorithms
 echo -e "${BLUE}Running benchmarks for all algorithms...${NC}"
-
-benchmark_algorithm "fibonacci"
-benchmark_algorithm "factorial"
-benchmark_algorithm "primes"
-
-echo -e "${GREEN}All benchmarks complete!${NC}"
+"$PYTHON" -m algorithms.bench --instrument-overhead --json "$LATEST"
+echo -e "${GREEN}Benchmark results saved to $LATEST${NC}"
+"$PYTHON" -m algorithms.history record "$LATEST"
+echo -e "${YELLOW}Trends: $PYTHON -m algorithms.history report${NC}\n"
+
+if [ "$UPDATE_BASELINE" = 1 ] || [ ! -f "$BASELINE" ]; then
+    cp "$LATEST" "$BASELINE"
+    echo -e "${YELLOW}Saved this run as the baseline: $BASELINE${NC}"
+    echo -e "${GREEN}All benchmarks complete!${NC}"
+    exit 0
+fi
+
+# Compare against the baseline
+echo -e "${BLUE}Comparing with baseline $BASELINE...${NC}"
+if "$PYTHON" -m algorithms.compare "$BASELINE" "$LATEST" "$@"; then
+    echo -e "\n${GREEN}No regressions. All benchmarks complete!${NC}"
+else
+    echo -e "\n${RED}Performance regression against $BASELINE${NC}"
+    exit 1
+fi
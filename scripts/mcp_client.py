@@ -57,4 +57,10 @@ async def main() -> None:
 
 if __name__ == "__main__":
     import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    from repo_root import add_to_path
+
+    add_to_path()
+    from algorithms import profiling
+
+    with profiling.from_argv("mcp_client"):
+        asyncio.run(main())
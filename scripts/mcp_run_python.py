@@ -13,8 +13,9 @@ code = """
 import sys
 sys.path.append('.')
 from algorithms.factorial import factorial_iterative
+from algorithms.output import to_decimal
 
-result = factorial_iterative(5)
+result = to_decimal(factorial_iterative(5))
 print(f"Factorial of 5 is {result}")
 result
 """
@@ -60,4 +61,10 @@ async def main() -> None:
 
 if __name__ == "__main__":
     import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    from repo_root import add_to_path
+
+    add_to_path()
+    from algorithms import profiling
+
+    with profiling.from_argv("mcp_run_python"):
+        asyncio.run(main())
@@ -66,4 +66,10 @@ async def main() -> None:
                 print("\n❌ MCP Python runner example failed!")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    from repo_root import add_to_path
+
+    add_to_path()
+    from algorithms import profiling
+
+    with profiling.from_argv("mcp_simple_example"):
+        asyncio.run(main())
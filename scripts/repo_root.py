@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Module for importing the algorithms package from the scripts.
+
+Running a script puts the scripts directory, not the repository root, on
+sys.path, so the scripts call add_to_path() before importing algorithms.
+"""
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def add_to_path() -> None:
+    """
+    Append the repository root to sys.path, once.
+    """
+    root = str(REPO_ROOT)
+    if root not in sys.path:
+        sys.path.append(root)
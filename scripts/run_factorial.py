@@ -10,24 +10,29 @@ from pathlib import Path
 
 # Add scripts directory to path to import inline_script_metadata
 sys.path.append(str(Path(__file__).parent))
-from inline_script_metadata import run_with_metadata
+from inline_script_metadata import run_with_metadata  # noqa: E402
+from repo_root import add_to_path  # noqa: E402
+
+add_to_path()
+from algorithms import profiling  # noqa: E402
 
 # Python code that will be executed
-code = """
+code = '''
 import sys
 sys.path.append('.')
 from algorithms.factorial import factorial_iterative, factorial_recursive
+from algorithms.output import to_decimal
 
 def test_factorial(n: int) -> None:
     """
     Test factorial implementations with a given input.
-    
+
     Args:
         n: Number to calculate factorial of
     """
     print(f"Testing factorial with n={n}")
-    print(f"Iterative approach: {n}! = {factorial_iterative(n)}")
-    print(f"Recursive approach: {n}! = {factorial_recursive(n)}")
+    print(f"Iterative approach: {n}! = {to_decimal(factorial_iterative(n))}")
+    print(f"Recursive approach: {n}! = {to_decimal(factorial_recursive(n))}")
     print()
 
 # Test with different inputs
@@ -36,8 +41,9 @@ for i in range(5, 11):
 
 # Return the result for n=10
 factorial_iterative(10)
-"""
+'''
 
 # Run the code without additional dependencies
-result = run_with_metadata(code)
-print("\nResult processed successfully!")
\ No newline at end of file
+with profiling.from_argv("run_factorial"):
+    result = run_with_metadata(code)
+print("\nResult processed successfully!")
@@ -12,14 +12,6 @@ from typing import Any, Dict
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
-# Get code from command line arguments
-if len(sys.argv) < 2:
-    print("Usage: run_python_code.py <python_code>")
-    sys.exit(1)
-
-# Join all arguments as the code to run
-code = " ".join(sys.argv[1:])
-
 # Configure server parameters
 server_params = StdioServerParameters(
     command='deno',
@@ -34,11 +26,14 @@ server_params = StdioServerParameters(
     ],
 )
 
-async def main() -> None:
+async def main(code: str) -> None:
     """
     Main function that executes the provided Python code using MCP Python runner.
     
     Connects to the MCP server, runs the code, and prints the result.
+
+    Args:
+        code: Python code to run
     """
     async with stdio_client(server_params) as (read, write):
         async with ClientSession(read, write) as session:
@@ -60,4 +55,18 @@ async def main() -> None:
                 print(response_text)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    from repo_root import add_to_path
+
+    add_to_path()
+    from algorithms import profiling
+
+    # Get code from command line arguments
+    if len(sys.argv) < 2:
+        print("Usage: run_python_code.py <python_code>")
+        sys.exit(1)
+
+    # The arguments are the code itself, so profiling is configured only
+    # through $ALGORITHMS_PROFILE and the other environment variables
+    with profiling.profiled("run_python_code"):
+        # Join all arguments as the code to run
+        asyncio.run(main(" ".join(sys.argv[1:])))
@@ -0,0 +1,123 @@
+"""
+Shared fixtures for the test suite
+
+Tests marked perf run implementations at production sizes against explicit
+budgets. They are deselected by default; run them with
+
+    pytest -m perf
+
+Time budgets are written for a reference machine and multiplied by the
+ratio of this machine's calibration time (algorithms.bench.calibration_ns)
+to the reference one, or by $ALGORITHMS_PERF_FACTOR when set. Memory
+budgets are not scaled. Every check records its measured-to-budget ratio,
+which is listed at the end of the run.
+"""
+
+import os
+from typing import List, Tuple
+
+import pytest
+
+PERF_FACTOR_ENV = "ALGORITHMS_PERF_FACTOR"
+
+# calibration_ns() on the machine the budgets were written for
+REFERENCE_CALIBRATION_NS = 1_300_000
+
+_ratios: List[Tuple[str, str, float]] = []
+
+
+class Budget:
+    """
+    Checks a call against time and memory budgets.
+
+    Attributes:
+        factor: Multiplier applied to time budgets on this machine
+    """
+
+    def __init__(self, factor: float) -> None:
+        self.factor = factor
+
+    def _check(self, label: str, kind: str, measured: float, limit: float, text: str) -> float:
+        ratio = measured / limit
+        _ratios.append((label, kind, ratio))
+        if ratio > 1:
+            pytest.fail(f"{label}: {text}, {ratio:.2f}x its {kind} budget", pytrace=False)
+        return ratio
+
+    def time(self, name: str, n: int, seconds: float) -> float:
+        """
+        Time a registered implementation at n and compare the median with a budget.
+
+        Args:
+            name: Registered implementation name
+            n: Argument
+            seconds: Budget on the reference machine
+
+        Returns:
+            Measured-to-budget ratio
+        """
+        from algorithms.bench import format_time, measure
+        from algorithms.registry import get
+
+        result = measure(get(name).resolve(), n, name=name, min_time=0.1, min_repeat=3)
+        limit = seconds * 1e9 * self.factor
+        text = (
+            f"median {format_time(result.median)} against {format_time(limit)} "
+            f"(calibration factor {self.factor:.2f})"
+        )
+        return self._check(f"{name}({n})", "time", result.median, limit, text)
+
+    def memory(self, name: str, n: int, limit: int, rss: bool = False) -> float:
+        """
+        Measure the peak memory of a registered implementation at n against a budget.
+
+        Args:
+            name: Registered implementation name
+            n: Argument
+            limit: Budget in bytes
+            rss: Measure peak RSS growth in a fresh subprocess instead of
+                tracing allocations, which is far faster for calls that
+                make millions of small objects
+
+        Returns:
+            Measured-to-budget ratio
+        """
+        from algorithms.bench import _rss_delta, format_bytes, measure_memory
+        from algorithms.registry import get
+
+        if rss:
+            peak = _rss_delta(get(name), n, timeout=600)
+            if peak is None:
+                pytest.skip("RSS cannot be measured here")
+            kind = "RSS growth"
+        else:
+            peak = measure_memory(get(name), n, rss=False).peak_bytes
+            kind = "traced peak"
+        text = f"{kind} {format_bytes(peak)} against {format_bytes(limit)}"
+        return self._check(f"{name}({n})", "memory", peak, limit, text)
+
+
+@pytest.fixture(scope="session")
+def perf_factor() -> float:
+    """Ratio of this machine's calibration time to the reference machine's."""
+    override = os.environ.get(PERF_FACTOR_ENV)
+    if override:
+        return float(override)
+    from algorithms.bench import calibration_ns
+
+    return calibration_ns() / REFERENCE_CALIBRATION_NS
+
+
+@pytest.fixture
+def budget(perf_factor: float) -> Budget:
+    """Budget checker scaled for this machine."""
+    return Budget(perf_factor)
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter) -> None:
+    """List the measured-to-budget ratio of every perf check that ran."""
+    if not _ratios:
+        return
+    terminalreporter.section("perf budgets")
+    for label, kind, ratio in _ratios:
+        terminalreporter.write_line(f"{label:<44} {kind:<7} {ratio:6.2f}x of budget")
@@ -0,0 +1,87 @@
+"""
+Tests for the process-pool batch API
+"""
+
+from array import array
+from typing import Any, List, Tuple, Union
+
+import pytest
+
+from algorithms import batch
+from algorithms.fibonacci import fib_iterative
+from algorithms.primes import is_prime_optimized
+
+
+def test_pack_round_trip() -> None:
+    """Test that each chunk form decodes to the values it encoded."""
+    cases: List[Tuple[Union[List[Any], range, array], str]] = [
+        ([True, False, True], "?"),
+        ([0, -5, 2**63 - 1], "q"),
+        ([2**64, 1], ""),
+        ([[2, 3], [5]], ""),
+        (range(3, 30, 4), "range"),
+        (array("l", [7, 8]), "l"),
+    ]
+    for values, kind in cases:
+        packed = batch._pack(values)
+        assert packed[0] == kind
+        assert list(batch._unpack(packed)) == list(values)
+
+
+def test_ordered_results_match_serial() -> None:
+    """Test in-order results over the worker pool."""
+    inputs = range(5000)
+    expected = [is_prime_optimized(n) for n in inputs]
+    result = list(batch.map("is_prime_optimized", inputs, workers=2, chunksize=300))
+    assert result == expected
+    assert all(type(r) is bool for r in result)
+
+
+def test_unordered_pairs_cover_every_input() -> None:
+    """Test that unordered mode yields each (index, result) exactly once."""
+    inputs = array("q", range(1000, 4000))
+    pairs = list(batch.map("is_prime_optimized", inputs, workers=2, chunksize=250, ordered=False))
+    assert sorted(i for i, _ in pairs) == list(range(len(inputs)))
+    assert all(result == is_prime_optimized(inputs[i]) for i, result in pairs)
+
+
+def test_big_integer_results_and_generators() -> None:
+    """Test a generator of inputs whose results do not fit in 64 bits."""
+    inputs = (3 * n for n in range(400))
+    result = list(batch.map("fib_iterative", inputs, workers=2, chunksize=37))
+    assert result == [fib_iterative(3 * n) for n in range(400)]
+
+
+def test_auto_chunks_after_serial_probe(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that auto chunking hands the rest of the inputs to the pool."""
+    monkeypatch.setattr(batch, "_SERIAL_SECONDS", 0.0)
+    for inputs in (range(2000), iter(range(2000))):
+        result = list(batch.map("is_prime_optimized", inputs, workers=2))
+        assert result == [is_prime_optimized(n) for n in range(2000)]
+
+
+def test_small_batch_stays_in_process(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a batch finished during the probe never starts a pool."""
+
+    def no_pool(*args: object, **kwargs: object) -> None:
+        raise AssertionError("pool started")
+
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", no_pool)
+    assert list(batch.map("fib_iterative", [10, 20, 30])) == [55, 6765, 832040]
+    assert list(batch.map("fib_iterative", [10, 20], ordered=False)) == [(0, 55), (1, 6765)]
+
+
+def test_worker_errors_propagate() -> None:
+    """Test that an exception in a worker reaches the caller."""
+    with pytest.raises(ValueError, match="non-negative"):
+        list(batch.map("fib_iterative", [5] * 20 + [-1], workers=2, chunksize=4))
+
+
+def test_invalid_arguments() -> None:
+    """Test that bad names and settings fail before any work starts."""
+    with pytest.raises(KeyError):
+        batch.map("no_such_impl", [1])
+    with pytest.raises(ValueError):
+        batch.map("fib_iterative", [1], workers=0)
+    with pytest.raises(ValueError):
+        batch.map("fib_iterative", [1], chunksize="big")
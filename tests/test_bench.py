@@ -0,0 +1,170 @@
+"""
+Tests for the benchmark harness
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from algorithms import bench, registry
+from algorithms.bench import Measurement, format_time, measure, report, run
+
+
+def test_measure_statistics() -> None:
+    """Test that fast calls are looped and summarized."""
+    result = measure(sum, range(100), min_time=0.02)
+    assert result.name == "sum"
+    assert result.loops > 1
+    assert bench.DEFAULT_MIN_REPEAT <= len(result.samples) <= bench.DEFAULT_MAX_REPEAT
+    assert 0 < result.minimum <= result.median
+    q1, q3 = result.quartiles
+    assert q1 <= result.median <= q3
+    assert result.iqr == q3 - q1
+
+
+def test_measure_clears_memoized_cache() -> None:
+    """Test that memoized functions are timed cold, one call per sample."""
+    calls = []
+
+    @lru_cache(maxsize=None)
+    def square(n: int) -> int:
+        calls.append(n)
+        return n * n
+
+    result = measure(square, 7, min_time=0.001, min_repeat=3, max_repeat=3)
+    assert result.loops == 1
+    assert len(calls) == 1 + 3
+
+
+def test_measure_slow_function_single_sample() -> None:
+    """Test that a call slower than the budget is not repeated."""
+    calls: List[int] = []
+    result = measure(calls.append, 1, min_time=0.0)
+    assert result.samples and len(result.samples) == 1
+    assert len(calls) == 1
+
+
+def test_measure_restores_gc() -> None:
+    """Test that the garbage collector is switched back on."""
+    import gc
+
+    measure(len, "x", min_time=0.001)
+    assert gc.isenabled()
+
+
+def test_argument_uses_primes_for_primality() -> None:
+    """Test that primality tests are timed on their worst case."""
+    assert bench.argument("is_prime", 100) == 101
+    assert bench.argument("fib", 100) == 100
+
+
+def test_run_respects_names_and_ranges() -> None:
+    """Test that only selected, in-range implementations are timed."""
+    results = run(["fib"], sizes=[20, 50], names=["fib_recursive", "fib_iterative"], min_time=0.001)
+    pairs = [(m.name, m.n) for m in results]
+    assert pairs == [("fib_recursive", 20), ("fib_iterative", 20), ("fib_iterative", 50)]
+    assert all(m.problem == "fib" for m in results)
+
+
+def test_report_round_trip(tmp_path: Path) -> None:
+    """Test the JSON report contents."""
+    results = run(["is_prime"], sizes=[1000], names=["is_prime_optimized"], min_time=0.001)
+    data = json.loads(json.dumps(report(results)))
+    assert data["version"] == bench.REPORT_VERSION
+    for key in ("python", "platform", "cpu", "cpus", "commit", "timestamp"):
+        assert key in data["environment"]
+    restored = Measurement.from_dict(data["results"][0])
+    assert restored.name == "is_prime_optimized"
+    assert restored.n == 1009
+    assert restored.median == results[0].median
+
+
+def test_main_writes_json(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Test the command line entry point."""
+    path = tmp_path / "out.json"
+    args = ["--problem", "fib", "--impl", "fib_fast_doubling", "--sizes", "10", "1000"]
+    assert bench.main(args + ["--min-time", "0.001", "--json", str(path)]) == 0
+    data = json.loads(path.read_text())
+    assert [r["n"] for r in data["results"]] == [10, 1000]
+    assert "fib_fast_doubling" in capsys.readouterr().out
+
+
+def test_format_time() -> None:
+    """Test unit selection for durations."""
+    assert format_time(12.0) == "12.0 ns"
+    assert format_time(1500.0) == "1.500 us"
+    assert format_time(2.5e6) == "2.500 ms"
+    assert format_time(3e9) == "3.000 s"
+
+
+def test_benchmark_wrapper_returns_measurements(capsys: pytest.CaptureFixture) -> None:
+    """Test that the module benchmark functions report through the harness."""
+    from algorithms.fibonacci import benchmark_fibonacci
+
+    results = benchmark_fibonacci(35)
+    names = [m.name for m in results]
+    assert "fib_recursive" not in names
+    assert "fib_fast_doubling" in names
+    assert "fib_fast_doubling" in capsys.readouterr().out
+
+
+def test_measure_memory_sieve() -> None:
+    """Test traced and RSS memory of a sieve, whose flag list dominates."""
+    n = 200000
+    result = bench.measure_memory(registry.get("sieve_of_eratosthenes"), n)
+    # One pointer per flag, plus the list of primes still referenced at the end
+    assert result.peak_bytes >= 8 * n
+    assert 0 < result.net_bytes < result.peak_bytes
+    if result.rss_delta_bytes is not None:
+        assert result.rss_delta_bytes >= 0
+    assert bench.MemoryMeasurement.from_dict(result.to_dict()) == result
+
+
+def test_memory_scaling_projects_limit() -> None:
+    """Test the space fit and its projection to a memory limit."""
+    memory, fits = bench.memory_scaling(
+        ["primes"], names=["sieve_of_eratosthenes"], sizes=[10**5, 3 * 10**5, 10**6], rss=False
+    )
+    assert [m.n for m in memory] == [10**5, 3 * 10**5, 10**6]
+    (fit,) = fits
+    assert fit.unit == "bytes"
+    assert fit.status == "ok"
+    # About ten bytes per n, so a gibibyte is reached near 10^8
+    limit_n = fit.solve(bench.DEFAULT_MEMORY_LIMIT)
+    assert limit_n is not None and 10**7 < limit_n < 10**9
+    assert "sieve_of_eratosthenes" in bench.format_memory_fits(fits)
+    data = bench.report([], memory=memory, memory_fits=fits)
+    assert data["memory_scaling"][0]["n_at_limit"] == fit.solve(bench.DEFAULT_MEMORY_LIMIT)
+
+
+def test_plot_memory_svg() -> None:
+    """Test that the memory plot is well-formed SVG with one line per implementation."""
+    import xml.etree.ElementTree as ET
+
+    memory = [
+        bench.MemoryMeasurement("a", n, 10 * n, n, None, 0.0) for n in (10**3, 10**4, 10**5)
+    ] + [bench.MemoryMeasurement("b", n, n, n, None, 0.0) for n in (10**3, 10**4)]
+    root = ET.fromstring(bench.plot_memory_svg(memory))
+    lines = root.findall("{http://www.w3.org/2000/svg}polyline")
+    assert len(lines) == 2
+
+
+def test_main_memory_report(tmp_path: Path) -> None:
+    """Test that --memory adds memory results to the JSON report."""
+    path = tmp_path / "out.json"
+    args = ["--impl", "fib_iterative", "--sizes", "1000", "--min-time", "0.001"]
+    assert bench.main(args + ["--memory", "--no-rss", "--json", str(path)]) == 0
+    data = json.loads(path.read_text())
+    assert data["memory"][0]["name"] == "fib_iterative"
+    assert data["memory"][0]["rss_delta_bytes"] is None
+
+
+@pytest.mark.parametrize(
+    "text, expected", [("1G", 1 << 30), ("512MiB", 512 << 20), ("64k", 64 << 10), ("100", 100)]
+)
+def test_parse_bytes(text: str, expected: int) -> None:
+    """Test memory limit parsing."""
+    assert bench._parse_bytes(text) == expected
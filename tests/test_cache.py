@@ -0,0 +1,184 @@
+"""
+Tests for the persistent memo store
+"""
+
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from algorithms import cache, dispatch
+from algorithms.cache import Store
+
+
+def _hammer(path: str, worker: int) -> List[int]:
+    """Process task: write and read back a shared set of keys."""
+    store = Store(Path(path))
+    seen = []
+    for i in range(30):
+        key = str(i % 10)
+        store.put("square", 1, key, int(key) ** 2 + 10**40)
+        hit, value = store.get("square", 1, key)
+        assert hit
+        seen.append(value)
+    return seen
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Store:
+    """Empty store in a temporary directory."""
+    return Store(tmp_path / "cache.sqlite")
+
+
+def test_encode_round_trip() -> None:
+    """Test raw integer bytes, booleans and compressed integer lists."""
+    values = [0, -1, 255, -256, 3**5000, -(7**999), True, False, [], [2, 3, 5, 7], [-3, 10**12]]
+    for value in values:
+        encoded = cache.encode(value)
+        assert encoded is not None
+        decoded = cache.decode(*encoded)
+        assert decoded == value and type(decoded) is type(value)
+    # Raw bytes: 7925 bits and a sign bit in 991 bytes
+    assert cache.encode(3**5000) == ("int", (3**5000).to_bytes(991, "little", signed=True))
+    assert cache.encode("text") is None
+    assert cache.encode([2**70]) is None
+    with pytest.raises(ValueError):
+        cache.decode("ints", b"not zlib")
+
+
+def test_hit_and_miss(store: Store) -> None:
+    """Test that a stored value is returned and other keys miss."""
+    assert store.get("f", 1, "[10]") == (False, None)
+    assert store.put("f", 1, "[10]", list(range(0, 10**5, 7)))
+    assert store.get("f", 1, "[10]") == (True, list(range(0, 10**5, 7)))
+    assert store.get("f", 1, "[11]") == (False, None)
+    assert not store.put("f", 1, "[12]", {"not": "stored"})
+
+
+def test_version_mismatch_invalidates(store: Store) -> None:
+    """Test that an entry of another version is dropped."""
+    store.put("f", 1, "k", 42)
+    assert store.get("f", 2, "k") == (False, None)
+    assert store.get("f", 1, "k") == (False, None)
+
+
+def test_corrupt_entry_invalidated(store: Store) -> None:
+    """Test that a checksum or encoding mismatch deletes the entry."""
+    store.put("f", 1, "crc", 10**30)
+    store.put("f", 1, "kind", 10**30)
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("UPDATE entries SET data = x'00ff' WHERE key = 'crc'")
+        conn.execute("UPDATE entries SET kind = 'pickle' WHERE key = 'kind'")
+    assert store.get("f", 1, "crc") == (False, None)
+    assert store.get("f", 1, "kind") == (False, None)
+    assert store.stats() == {}
+
+
+def test_lru_eviction(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the least recently used entries go once the cap is exceeded."""
+    monkeypatch.setattr(cache, "_TOUCH_SECONDS", 0.0)
+    store = Store(tmp_path / "small.sqlite", max_bytes=2500)
+    value = 2**8000 - 1  # 1001 bytes
+    store.put("f", 1, "a", value)
+    store.put("f", 1, "b", value)
+    assert store.get("f", 1, "a")[0]
+    store.put("f", 1, "c", value)
+    assert store.get("f", 1, "a")[0] and store.get("f", 1, "c")[0]
+    assert not store.get("f", 1, "b")[0]
+    assert not store.put("f", 1, "huge", 2**30000)
+    assert store.stats()["f"] == {"entries": 2, "bytes": 2002}
+
+
+def test_hits_do_not_write(store: Store) -> None:
+    """Test that a hit on a recently used entry needs no write lock."""
+    store.put("f", 1, "k", 10**30)
+    with sqlite3.connect(store.path, isolation_level=None) as writer:
+        writer.execute("BEGIN IMMEDIATE")
+        start = time.perf_counter()
+        assert store.get("f", 1, "k") == (True, 10**30)
+        assert time.perf_counter() - start < 5
+        writer.execute("ROLLBACK")
+
+
+def test_concurrent_processes(tmp_path: Path) -> None:
+    """Test several processes reading and writing one store."""
+    path = str(tmp_path / "shared.sqlite")
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(_hammer, [path] * 4, range(4)))
+    for seen in results:
+        assert seen == [(i % 10) ** 2 + 10**40 for i in range(30)]
+    assert Store(Path(path)).stats()["square"]["entries"] == 10
+
+
+def test_decorator_off_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that without $ALGORITHMS_CACHE the function is always called."""
+    monkeypatch.delenv(cache.CACHE_ENV, raising=False)
+    calls = []
+
+    @cache.persistent()
+    def square(n: int) -> int:
+        calls.append(n)
+        return n * n
+
+    assert square(5) == square(5) == 25
+    assert calls == [5, 5]
+
+
+def test_decorator_uses_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test lookups, the min_n bypass and that errors are not stored."""
+    monkeypatch.setenv(cache.CACHE_ENV, str(tmp_path / "memo.sqlite"))
+    calls = []
+
+    @cache.persistent(min_n=10)
+    def square(n: int) -> int:
+        calls.append(n)
+        if n == 13:
+            raise ValueError("unlucky")
+        return n * n
+
+    assert [square(12), square(12), square(3), square(3)] == [144, 144, 9, 9]
+    assert calls == [12, 3, 3]
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            square(13)
+    assert calls[-2:] == [13, 13]
+    store = cache.store()
+    assert store is not None
+    assert store.stats()[f"{__name__}.test_decorator_uses_store.<locals>.square"] == {
+        "entries": 1,
+        "bytes": 2,
+    }
+
+
+def test_unreadable_store_falls_back(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a file that is not a database only costs a warning."""
+    path = tmp_path / "garbage.sqlite"
+    path.write_bytes(b"this is not a database" * 100)
+    monkeypatch.setenv(cache.CACHE_ENV, str(path))
+
+    @cache.persistent()
+    def double(n: int) -> int:
+        return 2 * n
+
+    with pytest.warns(RuntimeWarning, match="unavailable"):
+        assert double(21) == 42
+
+
+def test_dispatch_results_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that large dispatcher results land in the store and come back equal."""
+    monkeypatch.setenv(cache.CACHE_ENV, str(tmp_path / "dispatch.sqlite"))
+    expected = (dispatch.fib(10**5), dispatch.primes(2 * 10**5), dispatch.factorial(10**4))
+    again = (dispatch.fib(10**5), dispatch.primes(2 * 10**5), dispatch.factorial(10**4))
+    assert again == expected
+    dispatch.fib(10)
+    store = cache.store()
+    assert store is not None
+    stats = store.stats()
+    assert set(stats) == {f"algorithms.dispatch.{f}" for f in ("fib", "factorial", "primes")}
+    assert all(entry["entries"] == 1 for entry in stats.values())
+    assert cache.main(["stats"]) == 0
+    assert cache.main(["clear", "--func", "algorithms.dispatch.fib"]) == 0
+    assert "algorithms.dispatch.fib" not in store.stats()
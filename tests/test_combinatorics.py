@@ -0,0 +1,151 @@
+"""
+Tests for combinatorics helpers
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+from algorithms.combinatorics import FactorialTable, binomial, log_binomial, multinomial
+
+
+MOD = 1_000_000_007
+
+
+def test_binomial_small() -> None:
+    """Test exact binomials against math.comb for every small argument."""
+    for n in range(60):
+        for k in range(-1, n + 2):
+            expected = math.comb(n, k) if 0 <= k <= n else 0
+            assert binomial(n, k) == expected
+
+
+def test_binomial_large() -> None:
+    """Test an exact binomial with a result of tens of thousands of digits."""
+    assert binomial(100000, 31415) == math.comb(100000, 31415)
+    with pytest.raises(ValueError, match="non-negative"):
+        binomial(-1, 0)
+
+
+@pytest.mark.parametrize(
+    "ks",
+    [(), (5,), (0, 0), (3, 4, 5), (0, 7, 0, 2), (1000, 2000, 3000, 4000)],
+)
+def test_multinomial(ks: tuple) -> None:
+    """Test exact multinomials against a factorial quotient."""
+    expected = math.factorial(sum(ks))
+    for k in ks:
+        expected //= math.factorial(k)
+    assert multinomial(*ks) == expected
+
+
+def test_multinomial_rejects_negative() -> None:
+    """Test that negative group sizes are rejected."""
+    with pytest.raises(ValueError, match="non-negative"):
+        multinomial(3, -1)
+
+
+@pytest.mark.parametrize("hide_numpy", [False, True])
+def test_log_binomial(hide_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test log-binomials with and without NumPy."""
+    if hide_numpy:
+        monkeypatch.setitem(sys.modules, "numpy", None)
+    else:
+        pytest.importorskip("numpy")
+    ns = [10, 10, 1000, 10**6, 5]
+    ks = [3, 11, 500, 123456, -1]
+    result = list(log_binomial(ns, ks))
+    assert result[0] == pytest.approx(math.log(120))
+    assert result[1] == -math.inf
+    assert result[2] == pytest.approx(math.log(math.comb(1000, 500)), rel=1e-13)
+    expected = math.lgamma(10**6 + 1) - math.lgamma(123457) - math.lgamma(10**6 - 123456 + 1)
+    assert result[3] == pytest.approx(expected, rel=1e-13)
+    assert result[4] == -math.inf
+    with pytest.raises(ValueError, match="non-negative"):
+        log_binomial([-1], [0])
+
+
+def test_log_binomial_broadcasts() -> None:
+    """Test that a scalar n broadcasts against an array of k with NumPy."""
+    np = pytest.importorskip("numpy")
+    result = log_binomial(np.array(100), np.arange(4))
+    expected = [math.log(math.comb(100, k)) for k in range(4)]
+    assert list(result) == pytest.approx(expected)
+
+
+@pytest.fixture(scope="module")
+def table() -> FactorialTable:
+    """A table large enough for the direct-lookup tests."""
+    return FactorialTable(2000, MOD)
+
+
+@pytest.mark.parametrize("n, k", [(0, 0), (1, 0), (10, 3), (100, 50), (2000, 1000), (2000, 2000)])
+def test_factorial_table_binom(table: FactorialTable, n: int, k: int) -> None:
+    """Test binomials inside the table against math.comb."""
+    assert table.binom(n, k) == math.comb(n, k) % MOD
+
+
+def test_factorial_table_out_of_range_k(table: FactorialTable) -> None:
+    """Test that impossible selections count as zero."""
+    assert table.binom(10, -1) == 0
+    assert table.binom(10, 11) == 0
+    assert table.perm(10, 11) == 0
+
+
+def test_factorial_table_perm_and_multinomial(table: FactorialTable) -> None:
+    """Test permutations and multinomials against exact values."""
+    assert table.perm(100, 7) == math.perm(100, 7) % MOD
+    expected = math.factorial(60) // (
+        math.factorial(10) * math.factorial(20) * math.factorial(30)
+    )
+    assert table.multinomial(10, 20, 30) == expected % MOD
+    assert table.multinomial() == 1
+
+
+def test_factorial_table_beyond_limit(table: FactorialTable) -> None:
+    """Test that large n without Lucas support is rejected."""
+    assert not table.lucas
+    with pytest.raises(ValueError, match="exceeds the table limit"):
+        table.binom(2001, 5)
+
+
+@pytest.mark.parametrize("p", [2, 3, 7, 13])
+def test_factorial_table_lucas(p: int) -> None:
+    """Test Lucas' theorem for n far beyond a small prime."""
+    small = FactorialTable(10**6, p)
+    assert small.lucas
+    assert small.limit == p - 1
+    for n in range(0, 120, 7):
+        for k in range(0, n + 1, 3):
+            assert small.binom(n, k) == math.comb(n, k) % p
+            assert small.perm(n, k) == math.perm(n, k) % p
+    assert small.multinomial(20, 30, 11) == math.comb(61, 20) * math.comb(41, 30) % p
+
+
+def test_factorial_table_rejects_composite_modulus() -> None:
+    """Test that non-invertible factorials are reported."""
+    with pytest.raises(ValueError, match="not invertible"):
+        FactorialTable(10, 12)
+    with pytest.raises(ValueError, match="non-negative"):
+        FactorialTable(-1, MOD)
+
+
+def test_factorial_table_mmap_round_trip(table: FactorialTable, tmp_path: Path) -> None:
+    """Test saving a table and mapping it back."""
+    path = tmp_path / "table.bin"
+    table.save(path)
+    with FactorialTable.load(path) as mapped:
+        assert mapped.mod == MOD
+        assert mapped.limit == table.limit
+        assert mapped.binom(2000, 777) == table.binom(2000, 777)
+        assert mapped.factorial(1500) == math.factorial(1500) % MOD
+
+
+def test_factorial_table_load_rejects_other_files(tmp_path: Path) -> None:
+    """Test that arbitrary files are not mistaken for tables."""
+    path = tmp_path / "junk.bin"
+    path.write_bytes(b"not a table at all, just some bytes")
+    with pytest.raises(ValueError, match="not a factorial table"):
+        FactorialTable.load(path)
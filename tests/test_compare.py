@@ -0,0 +1,152 @@
+"""
+Tests for the benchmark regression gate
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+from algorithms import compare
+from algorithms.compare import mann_whitney_greater
+
+
+def _report(
+    samples: Dict[str, List[float]], calibration: Optional[float] = 1000.0
+) -> Dict[str, object]:
+    """Build a minimal report with one entry per implementation at n=100."""
+    data: Dict[str, object] = {
+        "version": 1,
+        "results": [
+            {"name": name, "problem": "", "n": 100, "loops": 1, "samples_ns": values}
+            for name, values in samples.items()
+        ],
+    }
+    if calibration is not None:
+        data["calibration_ns"] = calibration
+    return data
+
+
+def _noise(center: float, count: int = 30, seed: int = 0) -> List[float]:
+    rng = random.Random(seed)
+    return [center * rng.uniform(0.97, 1.03) for _ in range(count)]
+
+
+def test_mann_whitney_separates_shifted_samples() -> None:
+    """Test that a clear shift is significant in one direction only."""
+    low, high = _noise(100, seed=1), _noise(150, seed=2)
+    assert mann_whitney_greater(low, high) < 1e-6
+    assert mann_whitney_greater(high, low) > 0.99
+
+
+def test_mann_whitney_identical_samples() -> None:
+    """Test that fully tied samples are never significant."""
+    assert mann_whitney_greater([5.0] * 10, [5.0] * 10) == 1.0
+    same = _noise(100, seed=3)
+    assert 0.3 < mann_whitney_greater(same, same) <= 1.0
+
+
+def test_compare_verdicts() -> None:
+    """Test regressed, improved, same, new and missing verdicts."""
+    baseline = _report(
+        {"slow": _noise(100), "fast": _noise(100), "steady": _noise(100), "gone": _noise(100)}
+    )
+    current = _report(
+        {
+            "slow": _noise(150, seed=4),
+            "fast": _noise(60, seed=5),
+            "steady": _noise(101, seed=6),
+            "added": _noise(100),
+        }
+    )
+    comparisons, factor = compare.compare(baseline, current)
+    verdicts = {c.name: c.verdict for c in comparisons}
+    assert factor == 1.0
+    assert verdicts == {
+        "slow": "regressed",
+        "fast": "improved",
+        "steady": "same",
+        "gone": "missing",
+        "added": "new",
+    }
+    slow = next(c for c in comparisons if c.name == "slow")
+    assert slow.change == pytest.approx(0.5, abs=0.05)
+
+
+def test_compare_normalizes_machine_speed() -> None:
+    """Test that a uniformly slower machine is not reported as a regression."""
+    baseline = _report({"impl": _noise(100)}, calibration=1000.0)
+    current = _report({"impl": _noise(200, seed=7)}, calibration=2000.0)
+    comparisons, factor = compare.compare(baseline, current)
+    assert factor == 2.0
+    assert comparisons[0].verdict == "same"
+    comparisons, _ = compare.compare(baseline, current, normalize=False)
+    assert comparisons[0].verdict == "regressed"
+
+
+def test_compare_unconfirmed_without_enough_samples() -> None:
+    """Test that a change the test cannot confirm is reported but does not fail."""
+    baseline = _report({"impl": [100.0, 101.0], "fast": [100.0]})
+    current = _report({"impl": [130.0, 131.0], "fast": [50.0]})
+    comparisons, _ = compare.compare(baseline, current, threshold=0.1)
+    assert [c.verdict for c in comparisons] == ["unconfirmed", "unconfirmed"]
+    comparisons, _ = compare.compare(baseline, current, threshold=0.5)
+    assert [c.verdict for c in comparisons] == ["same", "unconfirmed"]
+
+
+def test_main_single_runs_warn(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Test that a single-sample slowdown is a warning, not a failed gate."""
+    base_file = tmp_path / "baseline.json"
+    new_file = tmp_path / "new.json"
+    base_file.write_text(json.dumps(_report({"impl": [100.0]})))
+    new_file.write_text(json.dumps(_report({"impl": [125.0]})))
+    assert compare.main([str(base_file), str(new_file)]) == 0
+    out = capsys.readouterr()
+    assert "unconfirmed" in out.out
+    assert "impl(100) changed by +25.0%" in out.err
+
+
+def test_compare_ignores_noise_above_threshold() -> None:
+    """Test that a median shift the test cannot confirm is not a regression."""
+    rng = random.Random(8)
+    wide = [rng.uniform(50, 250) for _ in range(20)]
+    baseline = _report({"impl": wide})
+    current = _report({"impl": [v * 1.15 for v in reversed(wide)]})
+    comparisons, _ = compare.compare(baseline, current, threshold=0.1)
+    assert comparisons[0].verdict == "same"
+
+
+def test_main_exit_status(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Test that the command exits 1 on a regression and prints the table."""
+    base_file = tmp_path / "baseline.json"
+    new_file = tmp_path / "new.json"
+    base_file.write_text(json.dumps(_report({"impl": _noise(100)})))
+    new_file.write_text(json.dumps(_report({"impl": _noise(100, seed=9)})))
+    assert compare.main([str(base_file), str(new_file)]) == 0
+    new_file.write_text(json.dumps(_report({"impl": _noise(200, seed=9)})))
+    assert compare.main([str(base_file), str(new_file)]) == 1
+    out = capsys.readouterr()
+    assert "regressed" in out.out
+    assert "implementation" in out.out
+
+
+def test_main_warns_without_calibration(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Test that a baseline without calibration is compared unnormalized."""
+    base_file = tmp_path / "baseline.json"
+    base_file.write_text(json.dumps(_report({"impl": _noise(100)}, calibration=None)))
+    assert compare.main([str(base_file), str(base_file)]) == 0
+    assert "not normalized" in capsys.readouterr().err
+
+
+def test_main_reruns_baseline(tmp_path: Path) -> None:
+    """Test that omitting the new report benchmarks the baseline's pairs again."""
+    base_file = tmp_path / "baseline.json"
+    saved = tmp_path / "latest.json"
+    entry = {"name": "fib_iterative", "problem": "fib", "n": 50, "loops": 1, "samples_ns": [1.0]}
+    base_file.write_text(json.dumps({"version": 1, "results": [entry]}))
+    compare.main([str(base_file), "--min-time", "0.01", "--no-normalize", "--json", str(saved)])
+    rerun = json.loads(saved.read_text())
+    assert [(r["name"], r["n"]) for r in rerun["results"]] == [("fib_iterative", 50)]
+    assert rerun["calibration_ns"] > 0
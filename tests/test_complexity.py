@@ -0,0 +1,123 @@
+"""
+Tests for empirical complexity fitting
+"""
+
+import dataclasses
+import math
+
+import pytest
+
+from algorithms import bench, registry
+from algorithms.complexity import Complexity, fit_complexity, format_fits, parse_complexity
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("O(1)", Complexity()),
+        ("O(n)", Complexity(power=1)),
+        ("O(n^2 log n)", Complexity(power=2, log_power=1)),
+        ("O(sqrt(n))", Complexity(power=0.5)),
+        ("O(n sqrt(n))", Complexity(power=1.5)),
+        ("O(n log log n)", Complexity(power=1, loglog_power=1)),
+        ("O(log^3 n)", Complexity(log_power=3)),
+        ("O(n^1.585 log^1.585 n)", Complexity(power=1.585, log_power=1.585)),
+        ("O(2^n)", Complexity(base=2)),
+    ],
+)
+def test_parse_complexity(text: str, expected: Complexity) -> None:
+    """Test parsing of the supported big-O forms."""
+    assert parse_complexity(text) == expected
+
+
+def test_parse_complexity_rejects_unknown() -> None:
+    """Test that unsupported expressions are reported."""
+    with pytest.raises(ValueError, match="Not a big-O"):
+        parse_complexity("n log n")
+    with pytest.raises(ValueError, match="Cannot parse"):
+        parse_complexity("O(n!)")
+
+
+def test_registry_complexities_parse() -> None:
+    """Test that every registered complexity is understood."""
+    for impl in registry.implementations():
+        parse_complexity(impl.complexity)
+
+
+SIZES = [10**k for k in range(2, 8)]
+
+
+@pytest.mark.parametrize(
+    "documented, model, status",
+    [
+        ("O(n log n)", lambda n: 3e-3 * n * math.log(n), "ok"),
+        ("O(n)", lambda n: 1e-6 * n * n, "above"),
+        ("O(n^2)", lambda n: 50.0 * n, "below"),
+        ("O(n log log n)", lambda n: n * math.log(math.log(n)), "ok"),
+        ("O(sqrt(n))", lambda n: 7.0 * math.sqrt(n), "ok"),
+    ],
+)
+def test_fit_polynomial(documented: str, model, status: str) -> None:
+    """Test fits of exact synthetic timings."""
+    fit = fit_complexity("f", documented, SIZES, [model(n) for n in SIZES])
+    assert fit.status == status
+    assert fit.flagged == (status == "above")
+
+
+def test_fit_recovers_exponent_and_log_factor() -> None:
+    """Test that noise-free data gives back the generating class."""
+    times = [n**1.5 * math.log(n) ** 2 for n in SIZES]
+    fit = fit_complexity("f", "O(n^1.5 log^2 n)", SIZES, times)
+    assert fit.fitted is not None
+    assert fit.fitted.power == pytest.approx(1.5, abs=1e-6)
+    assert fit.fitted.log_power == pytest.approx(2, abs=1e-6)
+    assert fit.slope == pytest.approx(fit.expected)
+
+
+def test_fit_exponential() -> None:
+    """Test exponential classes compare bases."""
+    sizes = [10, 15, 20, 25]
+    phi = (1 + math.sqrt(5)) / 2
+    times = [100 * phi**n for n in sizes]
+    assert fit_complexity("f", "O(phi^n)", sizes, times).status == "ok"
+    assert fit_complexity("f", "O(2^n)", sizes, times).status == "below"
+    assert fit_complexity("f", "O(1.2^n)", sizes, times).status == "above"
+
+
+def test_fit_insufficient_data() -> None:
+    """Test that a single size cannot be fitted."""
+    fit = fit_complexity("f", "O(n)", [100], [1.0])
+    assert fit.status == "insufficient"
+    assert not fit.flagged
+    assert "insufficient" in format_fits([fit])
+
+
+def test_scaling_mode_fits_measurements() -> None:
+    """Test a small scaling run through the harness."""
+    measurements, fits = bench.scaling(
+        ["fib"], names=["fib_iterative"], sizes=[2000, 8000, 32000], min_time=0.001
+    )
+    assert [m.n for m in measurements] == [2000, 8000, 32000]
+    assert len(fits) == 1
+    assert fits[0].name == "fib_iterative"
+    assert fits[0].sizes == [2000, 8000, 32000]
+    assert "scaling" in bench.report(measurements, fits)
+
+
+def test_scaling_cli_fails_on_steeper_growth(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the command exits non-zero when a class is exceeded."""
+    understated = dataclasses.replace(registry.get("fib_iterative"), complexity="O(1)")
+    monkeypatch.setattr(bench, "get", lambda name: understated)
+    args = ["--scaling", "--impl", "fib_iterative", "--sizes", "2000", "8000", "32000"]
+    assert bench.main(args + ["--min-time", "0.001"]) == 1
+
+
+def test_fit_predict_and_solve() -> None:
+    """Test extrapolating a fitted curve to a target value."""
+    sizes = [10**k for k in range(3, 7)]
+    fit = fit_complexity("f", "O(n)", sizes, [8.0 * n for n in sizes], unit="bytes")
+    assert fit.predict(10**9) == pytest.approx(8e9, rel=1e-6)
+    assert fit.solve(8e9) == pytest.approx(1e9, rel=1e-6)
+    assert fit.solve(1.0) == 1000
+    assert fit.solve(1e300) is None
+    assert fit.to_dict()["unit"] == "bytes"
@@ -0,0 +1,132 @@
+"""
+Tests for the differential testing engine
+"""
+
+import math
+import os
+import random
+import time
+from typing import List
+
+import pytest
+
+from algorithms import differential, registry
+from algorithms.factorial import _PARALLEL_MIN_N
+from algorithms.primes import sieve_of_eratosthenes
+from algorithms.registry import Implementation
+
+
+def missing_7919(n: int) -> List[int]:
+    """Sieve that loses the 1000th prime."""
+    return [p for p in sieve_of_eratosthenes(n) if p != 7919]
+
+
+def slow_above_100(n: int) -> List[int]:
+    """Correct, but too slow to finish for n above 100."""
+    if n > 100:
+        time.sleep(30)
+    return sieve_of_eratosthenes(n)
+
+
+def _primes_with(name: str) -> List[Implementation]:
+    extra = Implementation(name, __name__, "primes", "O(n)", min_n=1)
+    return registry.implementations("primes") + [extra]
+
+
+def test_generate_covers_strata_and_boundaries() -> None:
+    """Test that arguments span every decade and include the edge cases."""
+    values = differential.generate("primes", 10**6, per_stratum=2, seed=1)
+    assert values == sorted(set(values))
+    assert values == differential.generate("primes", 10**6, per_stratum=2, seed=1)
+    assert 0 in values and max(values) <= 10**6
+    for decade in range(6):
+        assert any(10**decade <= v < 10 ** (decade + 1) for v in values)
+    assert {99, 100, 101, 1023, 1024, 1025} <= set(values)
+    # Arguments whose last segment in segmented_sieve ends exactly at n
+    assert any(v > 10**4 and (v - math.isqrt(v)) % 10000 == 0 for v in values)
+
+
+def test_generate_problem_specific_boundaries() -> None:
+    """Test pseudoprimes for primality and kernel thresholds for factorial."""
+    primality = set(differential.generate("is_prime", 10**18, per_stratum=1, seed=0))
+    assert {561, 2047, 3215031751, 2**31 - 1, 999983**2} <= primality
+    factorial = set(differential.generate("factorial", 3 * 10**4, per_stratum=1, seed=0))
+    assert {19999, 20000, 20001} <= factorial
+
+
+def test_strata_draws_per_decade() -> None:
+    """Test the number and range of stratified draws."""
+    values = differential.strata(10**4, 5, random.Random(0))
+    assert len(values) == 20
+    assert all(1 <= v <= 10**4 for v in values)
+
+
+def test_digest_distinguishes_results() -> None:
+    """Test digests of small and large integers, booleans and lists."""
+    assert differential.digest(True) == "True"
+    assert differential.digest(12) == "12"
+    big = differential.digest(2**100)
+    assert big.startswith("int[101 bits]")
+    assert big != differential.digest(2**100 + 1)
+    assert differential.digest([2, 3, 5]).startswith("list[3]")
+    assert differential.digest([2, 3, 5]) != differential.digest([2, 3, 7])
+
+
+def test_registry_implementations_agree() -> None:
+    """Test that the registered implementations agree on small arguments."""
+    summaries = differential.run(max_n=3000, per_stratum=2, workers=2, seed=3)
+    assert [s.problem for s in summaries] == list(registry.PROBLEMS)
+    for summary in summaries:
+        assert summary.calls > summary.arguments
+        assert summary.disagreements == []
+
+
+def test_disagreement_found_and_minimized() -> None:
+    """Test that a planted bug is reported at the smallest failing argument."""
+    impls = _primes_with("missing_7919")
+    [summary] = differential.run(
+        ["primes"], max_n=10**5, per_stratum=2, workers=2, seed=4, impls=impls
+    )
+    assert len(summary.disagreements) == 1
+    found = summary.disagreements[0]
+    assert found.n == 7919
+    assert found.original_n >= 7919
+    assert ["missing_7919"] in found.outcomes.values()
+    assert "missing_7919 999" in found.detail
+
+
+def test_timeouts_skip_larger_arguments() -> None:
+    """Test that an implementation that times out is skipped above that size."""
+    [summary] = differential.run(
+        ["primes"],
+        max_n=10**4,
+        per_stratum=1,
+        workers=2,
+        timeout=0.5,
+        seed=5,
+        impls=_primes_with("slow_above_100"),
+    )
+    assert summary.disagreements == []
+    assert summary.timeouts["slow_above_100"] > 100
+    assert "slow_above_100 timed out" in differential.format_summaries([summary])
+
+
+def test_main_exit_status() -> None:
+    """Test that the command exits 0 when everything agrees."""
+    assert differential.main(["--problem", "fib", "--max-n", "500", "--workers", "1"]) == 0
+
+
+def test_parallel_factorial_in_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that factorial_parallel can start its own pool inside a worker."""
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    [summary] = differential.run(
+        ["factorial"],
+        max_n=_PARALLEL_MIN_N + 1,
+        per_stratum=0,
+        names=["factorial_iterative", "factorial_parallel"],
+        workers=1,
+        timeout=30,
+        seed=6,
+    )
+    assert summary.timeouts == {}
+    assert summary.disagreements == []
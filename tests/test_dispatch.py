@@ -0,0 +1,117 @@
+"""
+Tests for the implementation registry and the auto-selecting dispatcher
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from algorithms import dispatch
+from algorithms.registry import PROBLEMS, Implementation, get, implementations, register
+
+
+@pytest.fixture
+def calibration_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Point the dispatcher at an empty calibration file location."""
+    path = tmp_path / "calibration.json"
+    monkeypatch.setenv(dispatch.CALIBRATION_ENV, str(path))
+    dispatch.reset()
+    yield path
+    dispatch.reset()
+
+
+def test_registry_covers_every_problem() -> None:
+    """Test that each problem has implementations that resolve to functions."""
+    for problem in PROBLEMS:
+        impls = implementations(problem)
+        assert impls
+        for impl in impls:
+            assert impl.problem == problem
+            assert callable(impl.resolve())
+            assert impl.complexity.startswith("O(")
+
+
+def test_registry_rejects_bad_entries() -> None:
+    """Test that duplicate names and unknown problems are refused."""
+    with pytest.raises(ValueError, match="already registered"):
+        register(Implementation("fib_iterative", "algorithms.fibonacci", "fib", "O(n)"))
+    with pytest.raises(ValueError, match="Unknown problem"):
+        register(Implementation("sort", "algorithms.sorting", "sort", "O(n log n)"))
+    with pytest.raises(KeyError):
+        get("fib_closed_form")
+
+
+@pytest.mark.parametrize("problem", PROBLEMS)
+def test_implementations_agree(problem: str) -> None:
+    """Test that every implementation agrees with the dispatcher inside its range."""
+    entry = getattr(dispatch, problem)
+    for n in [0, 1, 2, 3, 10, 29, 30, 97, 100]:
+        expected = entry(n)
+        for impl in implementations(problem):
+            if impl.supports(n):
+                assert impl.resolve()(n) == expected, impl.name
+
+
+def test_dispatch_entry_points(calibration_file: Path) -> None:
+    """Test the public entry points at sizes that use different engines."""
+    assert dispatch.fib(10) == 55
+    assert dispatch.fib(1000) % 10**10 == 6849228875
+    assert dispatch.factorial(20) == math.factorial(20)
+    assert dispatch.factorial(20000) == math.factorial(20000)
+    assert dispatch.primes(30) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert dispatch.is_prime(97) and not dispatch.is_prime(91)
+    assert dispatch.is_prime(2**61 - 1)
+    assert not dispatch.is_prime(-7)
+
+
+def test_choose_respects_declared_range(calibration_file: Path) -> None:
+    """Test that a plan naming an out-of-range implementation falls back."""
+    dispatch.plans()["fib"] = [(None, "fib_recursive")]
+    assert dispatch.choose("fib", 20).name == "fib_recursive"
+    assert dispatch.choose("fib", 10**5).name == "fib_fast_doubling"
+    assert dispatch.choose("primes", 10**9).name == "segmented_sieve"
+
+
+def test_negative_arguments_raise_from_implementation(calibration_file: Path) -> None:
+    """Test that arguments outside every range still report the usual error."""
+    with pytest.raises(ValueError, match="non-negative"):
+        dispatch.fib(-1)
+    with pytest.raises(ValueError, match="Unknown problem"):
+        dispatch.choose("sort", 10)
+
+
+def test_build_plan_places_crossovers() -> None:
+    """Test compressing per-size winners into plan entries."""
+    winners = [(10, "a"), (100, "a"), (1000, "b"), (10000, "b"), (100000, "c")]
+    assert dispatch._build_plan(winners) == [(316, "a"), (31622, "b"), (None, "c")]
+
+
+def test_calibrate_writes_and_loads_plans(
+    calibration_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a small calibration round trip through the JSON file."""
+    monkeypatch.setitem(dispatch.CALIBRATION_SIZES, "fib", [5, 50, 5000])
+    result = dispatch.calibrate(["fib"], budget=0.001)
+    data = json.loads(calibration_file.read_text())
+    assert data["version"] == dispatch.CALIBRATION_VERSION
+    assert [tuple(entry) for entry in data["plans"]["fib"]] == result["fib"]
+    assert result["factorial"] == dispatch.DEFAULT_PLANS["factorial"]
+    assert dispatch.plans()["fib"] == result["fib"]
+    assert dispatch.fib(5000) == get(result["fib"][-1][1]).resolve()(5000)
+
+
+def test_calibration_from_other_machine_ignored(calibration_file: Path) -> None:
+    """Test that a calibration with a different fingerprint is not used."""
+    calibration_file.write_text(
+        json.dumps(
+            {
+                "version": dispatch.CALIBRATION_VERSION,
+                "machine": {"machine": "elsewhere"},
+                "plans": {"fib": [[None, "fib_iterative"]]},
+            }
+        )
+    )
+    assert dispatch.plans()["fib"] == dispatch.DEFAULT_PLANS["fib"]
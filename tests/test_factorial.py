@@ -2,15 +2,40 @@
 Tests for Factorial implementations
 """
 
+import math
+import sys
+
 import pytest
 from typing import Callable
 
+from algorithms import factorial as factorial_module
 from algorithms.factorial import (
     factorial_recursive,
     factorial_tail_recursive,
     factorial_memoized,
     factorial_iterative,
     factorial_math,
+    factorial_product_tree,
+    factorial_prime_swing,
+    product_range,
+    sequence_product,
+    falling,
+    rising,
+    double_factorial,
+    factorial_parallel,
+    factorial_mod,
+    factorial_mod_many,
+    log_factorial,
+    log_factorial_table,
+    valuation,
+    valuation_many,
+    trailing_zeros,
+    trailing_zeros_many,
+    last_nonzero_digit,
+    last_nonzero_digit_many,
+    factorial_digit_count,
+    factorial_leading_digits,
+    factorial_trailing_digits,
 )
 
 
@@ -110,8 +135,11 @@ def test_factorial_implementations_consistency() -> None:
         memoized = factorial_memoized(n)
         iterative = factorial_iterative(n)
         math_impl = factorial_math(n)
+        product_tree = factorial_product_tree(n)
+        prime_swing = factorial_prime_swing(n)
 
         assert recursive == tail_recursive == memoized == iterative == math_impl
+        assert math_impl == product_tree == prime_swing
 
 
 @pytest.mark.parametrize(
@@ -120,6 +148,8 @@ def test_factorial_implementations_consistency() -> None:
         factorial_memoized,
         factorial_iterative,
         factorial_math,
+        factorial_product_tree,
+        factorial_prime_swing,
     ],
 )
 def test_factorial_large_n(func: Callable[[int], int]) -> None:
@@ -128,3 +158,258 @@ def test_factorial_large_n(func: Callable[[int], int]) -> None:
     n = 20
     expected = 2432902008176640000
     assert func(n) == expected
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 16, 17, 18, 100, 1000, 5000])
+def test_factorial_product_tree(n: int) -> None:
+    """Test product-tree implementation against math.factorial across leaf sizes."""
+    assert factorial_product_tree(n) == factorial_math(n)
+
+
+def test_factorial_product_tree_beyond_recursion_limit() -> None:
+    """Test product-tree implementation where the recursive versions overflow."""
+    assert factorial_product_tree(20000) == factorial_math(20000)
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        factorial_product_tree(-1)
+
+
+@pytest.mark.parametrize(
+    "a, b, step",
+    [(1, 1, 1), (2, 3, 1), (1, 100, 1), (1, 100, 3), (100, 0, -7), (-5, 6, 1), (10, 1, 1)],
+)
+def test_product_range(a: int, b: int, step: int) -> None:
+    """Test the balanced product kernel against math.prod."""
+    assert product_range(a, b, step) == math.prod(range(a, b, step))
+
+
+def test_sequence_product() -> None:
+    """Test the balanced product of arbitrary factors and of a slice."""
+    values = [p**e for p, e in [(2, 40), (3, 7), (5, 1), (7, 300)] * 50]
+    assert sequence_product(values) == math.prod(values)
+    assert sequence_product(values, 3, 77) == math.prod(values[3:77])
+    assert sequence_product([]) == 1
+
+
+def test_falling_and_rising() -> None:
+    """Test falling and rising factorials against exact values."""
+    assert falling(10, 3) == 720
+    assert falling(3, 5) == 0
+    assert falling(-2, 3) == -24
+    assert falling(20000, 7000) == math.perm(20000, 7000)
+    assert rising(3, 4) == 360
+    assert rising(-2, 3) == 0
+    assert rising(1, 500) == factorial_math(500)
+    assert falling(7, 0) == rising(7, 0) == 1
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        falling(5, -1)
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        rising(5, -1)
+
+
+def test_double_factorial() -> None:
+    """Test double factorials for both parities."""
+    assert [double_factorial(n) for n in range(-1, 9)] == [1, 1, 1, 2, 3, 8, 15, 48, 105, 384]
+    assert double_factorial(3001) == math.prod(range(1, 3002, 2))
+    assert double_factorial(3000) == 2**1500 * factorial_math(1500)
+    with pytest.raises(ValueError, match="at least -1"):
+        double_factorial(-2)
+
+
+def test_factorial_prime_swing() -> None:
+    """Test prime-swing implementation against math.factorial."""
+    for n in range(300):
+        assert factorial_prime_swing(n) == factorial_math(n)
+    for n in [1024, 4097, 20000]:
+        assert factorial_prime_swing(n) == factorial_math(n)
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        factorial_prime_swing(-1)
+
+
+@pytest.mark.parametrize("n, workers", [(0, 2), (10, 2), (19999, 3), (50001, 1), (50001, 3)])
+def test_factorial_parallel(n: int, workers: int) -> None:
+    """Test the multi-process factorial, including the single-process fallback."""
+    assert factorial_parallel(n, workers) == factorial_math(n)
+
+
+def test_factorial_parallel_rejects_bad_arguments() -> None:
+    """Test argument validation of the multi-process factorial."""
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        factorial_parallel(-1)
+    with pytest.raises(ValueError, match="Worker count must be positive"):
+        factorial_parallel(10, 0)
+
+
+@pytest.mark.parametrize("p", [2, 3, 7, 13, 101, 1009])
+def test_factorial_mod_small_primes(p: int) -> None:
+    """Test n! mod p on both sides of p/2 and beyond p."""
+    for n in range(3 * p):
+        assert factorial_mod(n, p) == factorial_math(n) % p
+
+
+@pytest.mark.parametrize("p", [1_000_003, 998_244_353, (1 << 61) - 1])
+def test_factorial_mod_long_ranges(p: int) -> None:
+    """Test the sqrt-time path against a plain modular running product."""
+    for n in [40_000, 65_537, 123_457]:
+        expected = 1
+        for i in range(2, n + 1):
+            expected = expected * i % p
+        assert factorial_mod(n, p) == expected
+
+
+def test_factorial_mod_wilson_reflection() -> None:
+    """Test Wilson's theorem and the reflection it enables."""
+    p = 1_000_003
+    assert factorial_mod(p - 1, p) == p - 1
+    assert factorial_mod(p - 2, p) == 1
+    assert factorial_mod(p, p) == 0
+
+
+def test_factorial_mod_many() -> None:
+    """Test that batched queries agree with single queries, in input order."""
+    p = 1_000_003
+    ns = [5, 999_999, 0, 70_000, p + 3, 500_001, 70_000, 123_456]
+    assert factorial_mod_many(ns, p) == [factorial_mod(n, p) for n in ns]
+    assert factorial_mod_many([], p) == []
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        factorial_mod_many([3, -1], p)
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def numpy_mode(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run a test with NumPy (when installed) and with NumPy hidden."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setitem(sys.modules, "numpy", None)
+    return str(request.param)
+
+
+def test_log_factorial_table(numpy_mode: str) -> None:
+    """Test the dense log-factorial table against math.lgamma."""
+    table = log_factorial_table(20000)
+    assert len(table) == 20001
+    for k in list(range(300)) + [9999, 10000, 10001, 20000]:
+        assert table[k] == pytest.approx(math.lgamma(k + 1), rel=1e-14, abs=1e-14)
+
+
+def test_log_factorial(numpy_mode: str) -> None:
+    """Test elementwise log-factorials for unsorted, sparse inputs."""
+    ks = [10**6, 0, 3, 256, 257, 12345]
+    result = list(log_factorial(ks))
+    assert result == pytest.approx([math.lgamma(k + 1) for k in ks], rel=1e-14)
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        log_factorial([1, -2])
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        log_factorial_table(-1)
+
+
+def _exact_trailing_zeros(n: int, base: int) -> int:
+    """Count trailing zeros of n! in a base by repeated division."""
+    value, count = factorial_math(n), 0
+    while value % base == 0:
+        value //= base
+        count += 1
+    return count
+
+
+def _exact_last_nonzero_digit(n: int) -> int:
+    """Strip decimal zeros from n! and return its last digit."""
+    value = factorial_math(n)
+    while value % 10 == 0:
+        value //= 10
+    return value % 10
+
+
+@pytest.mark.parametrize("p", [2, 3, 5, 7, 101])
+def test_valuation(p: int) -> None:
+    """Test Legendre's formula against repeated division of n!."""
+    for n in range(300):
+        assert valuation(n, p) == _exact_trailing_zeros(n, p)
+
+
+@pytest.mark.parametrize("base", [2, 10, 12, 16, 36, 97])
+def test_trailing_zeros(base: int) -> None:
+    """Test trailing zeros of n! in several bases."""
+    for n in range(300):
+        assert trailing_zeros(n, base) == _exact_trailing_zeros(n, base)
+
+
+def test_last_nonzero_digit() -> None:
+    """Test the last non-zero decimal digit of n!."""
+    for n in range(500):
+        assert last_nonzero_digit(n) == _exact_last_nonzero_digit(n)
+
+
+def test_factorial_digit_analysis_huge_n() -> None:
+    """Test questions about n! that are answered without computing it."""
+    assert trailing_zeros(10**12) == 249999999997
+    assert valuation(10**18, 7) == 166666666666666656
+    assert last_nonzero_digit(10**12) == 6
+
+
+def test_factorial_digit_analysis_errors() -> None:
+    """Test argument validation of the digit-analysis helpers."""
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        valuation(-1, 2)
+    with pytest.raises(ValueError, match="prime"):
+        valuation(10, 1)
+    with pytest.raises(ValueError, match="Base must be at least 2"):
+        trailing_zeros(10, 1)
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        last_nonzero_digit_many([1, -1])
+
+
+def test_factorial_digit_analysis_batches(numpy_mode: str) -> None:
+    """Test that batch variants match the scalar functions."""
+    ns = list(range(200)) + [10**12, 10**17]
+    assert list(valuation_many(ns, 3)) == [valuation(n, 3) for n in ns]
+    assert list(trailing_zeros_many(ns, 12)) == [trailing_zeros(n, 12) for n in ns]
+    assert list(last_nonzero_digit_many(ns)) == [last_nonzero_digit(n) for n in ns]
+
+
+def test_factorial_digit_analysis_batches_prime_beyond_int64(
+    numpy_mode: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a prime above 2^63 takes the exact path instead of overflowing int64."""
+    big = 2**64 - 59  # largest prime below 2^64
+    ns = [0, 5, 2**62, 2**63 - 1]  # all fit in int64, so only p forces the fallback
+    assert list(valuation_many(ns, big)) == [0, 0, 0, 0]
+    assert list(valuation_many([big, 3 * big + 1], big)) == [1, 3]
+    # Factorising such a base by trial division would take hours, so it is given
+    monkeypatch.setattr(factorial_module, "_factorize", lambda base: [(2, 3), (big, 1)])
+    result = trailing_zeros_many(ns, 8 * big)
+    assert result == [min(valuation(n, 2) // 3, valuation(n, big)) for n in ns]
+
+
+def test_factorial_digit_analysis_batches_beyond_int64() -> None:
+    """Test that batches with huge n fall back to exact Python integers."""
+    ns = [5, 10**30]
+    assert list(trailing_zeros_many(ns)) == [1, trailing_zeros(10**30)]
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 25, 999, 1000, 1001, 1234, 1500])
+def test_factorial_digit_functions_match_exact(n: int) -> None:
+    """Test log-scale digit helpers against the exact factorial."""
+    digits = str(factorial_math(n))
+    assert factorial_digit_count(n) == len(digits)
+    assert factorial_leading_digits(n) == int(digits[:15])
+    assert factorial_trailing_digits(n, 4) == int(digits) % 10**4
+
+
+def test_factorial_digit_functions_huge_n() -> None:
+    """Test that digit helpers work far beyond what can be computed exactly."""
+    # 10^6! = 8263931688331240062... and has 5565709 digits
+    assert factorial_digit_count(10**6) == 5565709
+    assert factorial_leading_digits(10**6) == 826393168833124
+    assert factorial_trailing_digits(10**6) == 0
+    assert factorial_digit_count(10**18) == 17565705518096748182
+
+
+def test_factorial_digit_functions_reject_negative() -> None:
+    """Test that digit helpers reject negative inputs."""
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        factorial_digit_count(-1)
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        factorial_leading_digits(-1)
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        factorial_trailing_digits(-1)
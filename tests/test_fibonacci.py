@@ -5,7 +5,17 @@ Tests for Fibonacci implementations
 import pytest
 from typing import Callable
 
-from algorithms.fibonacci import fib_recursive, fib_memoized, fib_iterative, fib_generator
+from algorithms.fibonacci import (
+    fib_recursive,
+    fib_memoized,
+    fib_iterative,
+    fib_fast_doubling,
+    fib_generator,
+    fib_mod,
+    fib_digit_count,
+    fib_leading_digits,
+    fib_trailing_digits,
+)
 
 
 # Known Fibonacci numbers for testing
@@ -94,6 +104,7 @@ def test_fib_implementations_consistency() -> None:
     [
         fib_memoized,
         fib_iterative,
+        fib_fast_doubling,
     ],
 )
 def test_fibonacci_large_n(func: Callable[[int], int]) -> None:
@@ -101,3 +112,45 @@ def test_fibonacci_large_n(func: Callable[[int], int]) -> None:
     # Skip recursive implementation for large n as it would be too slow
     n = 35
     assert func(n) == 9227465
+
+
+def test_fib_fast_doubling_matches_iterative() -> None:
+    """Test fast doubling against the iterative implementation."""
+    for n in list(range(200)) + [1000, 4097, 10000]:
+        assert fib_fast_doubling(n) == fib_iterative(n)
+    with pytest.raises(ValueError, match="non-negative"):
+        fib_fast_doubling(-1)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 10, 999, 1000, 1001, 4321, 20000])
+def test_fib_digit_functions_match_exact(n: int) -> None:
+    """Test log-scale digit helpers against the exact Fibonacci number."""
+    digits = str(fib_iterative(n))
+    assert fib_digit_count(n) == len(digits)
+    assert fib_leading_digits(n) == int(digits[:15])
+    assert fib_trailing_digits(n, 6) == int(digits) % 10**6
+
+
+def test_fib_digit_functions_huge_n() -> None:
+    """Test that digit helpers work far beyond what can be computed exactly."""
+    # F(10^18) has 208987640249978734 digits
+    assert fib_digit_count(10**18) == 208987640249978734
+    assert len(str(fib_leading_digits(10**18))) == 15
+    assert fib_trailing_digits(10**18, 3) == fib_mod(10**18, 1000)
+
+
+@pytest.mark.parametrize("m", [1, 2, 10, 97, 10**9 + 7])
+def test_fib_mod(m: int) -> None:
+    """Test modular Fibonacci against the iterative implementation."""
+    for n in range(50):
+        assert fib_mod(n, m) == fib_iterative(n) % m
+
+
+def test_fib_digit_functions_reject_negative() -> None:
+    """Test that digit helpers reject negative positions."""
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        fib_digit_count(-1)
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        fib_leading_digits(-1)
+    with pytest.raises(ValueError, match="Input must be non-negative"):
+        fib_trailing_digits(-1)
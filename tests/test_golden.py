@@ -0,0 +1,114 @@
+"""
+Tests for the golden reference data and its verifier
+"""
+
+import math
+
+import pytest
+
+from algorithms import golden
+from algorithms.factorial import factorial_prime_swing
+from algorithms.fibonacci import fib_fast_doubling
+from algorithms.primes import segmented_sieve, sieve_of_eratosthenes
+
+# Published values of pi(10^k)
+KNOWN_PI = {
+    10: 4,
+    100: 25,
+    1000: 168,
+    10**4: 1229,
+    10**5: 9592,
+    10**6: 78498,
+    10**7: 664579,
+    10**8: 5761455,
+    10**9: 50847534,
+}
+
+
+@pytest.fixture(scope="module")
+def fixtures() -> dict:
+    """The packaged golden data."""
+    return golden.load()
+
+
+def test_packaged_fixtures_match_known_values(fixtures: dict) -> None:
+    """Test the prime counts and moduli of the checked-in file."""
+    data = fixtures["primes"]
+    assert {int(x): count for x, count in data["pi"].items()} == KNOWN_PI
+    assert sum(data["counts"]) == KNOWN_PI[data["limit"]]
+    assert len(data["sha256"]) == data["limit"] // data["segment"]
+    for m in fixtures["moduli"]:
+        assert m.bit_length() == 61
+        assert golden._is_probable_prime(m)
+
+
+def test_generator_reproduces_packaged_prefix(fixtures: dict) -> None:
+    """Test that regenerating a small range gives the same entries."""
+    small = golden.generate(prime_limit=3 * 10**6, segment=fixtures["primes"]["segment"])
+    assert small["moduli"] == fixtures["moduli"]
+    assert small["primes"]["sha256"] == fixtures["primes"]["sha256"][:3]
+    assert small["fib"] == fixtures["fib"]
+    assert small["factorial"] == fixtures["factorial"]
+
+
+def test_residues_match_direct_computation(fixtures: dict) -> None:
+    """Test the residues against full-size values for small checkpoints."""
+    for n in (10, 1000, 12345):
+        assert golden.verify_fib(n, fib_fast_doubling(n), fixtures).ok
+    for n in (10, 1000, 12345):
+        assert golden.verify_factorial(n, math.factorial(n), fixtures).ok
+
+
+@pytest.mark.parametrize("n", [10**6, 2 * 10**6 + 123])
+def test_verify_sieves(fixtures: dict, n: int) -> None:
+    """Test that correct sieve output passes every applicable check."""
+    for func in (sieve_of_eratosthenes, segmented_sieve):
+        result = golden.verify_primes(func(n), n, fixtures)
+        assert result.ok, result.errors
+        # pi checkpoints up to 10^6 plus every complete segment
+        assert result.checked == 6 + (n + 1) // fixtures["primes"]["segment"]
+
+
+def test_verify_primes_detects_errors(fixtures: dict) -> None:
+    """Test missing, extra and out-of-order primes."""
+    primes = segmented_sieve(2 * 10**6)
+    missing = [p for p in primes if p != 1299709]
+    assert "70434 primes, expected 70435" in golden.verify_primes(missing, 2 * 10**6).errors[0]
+    extra = sorted(primes[:100] + [91])
+    errors = golden.verify_primes(extra, 541, fixtures).errors
+    assert errors == ["pi(100) = 26, expected 25"]
+    swapped = [2, 5, 3, 7]
+    assert "out of order" in golden.verify_primes(swapped, 10, fixtures).errors[0]
+    # Changing a prime for another keeps the count but not the digest
+    altered = [p if p != 1299709 else 1299711 for p in primes]
+    assert golden.verify_primes(altered, 2 * 10**6, fixtures).errors == [
+        "segment [1000000, 2000000): digest differs"
+    ]
+
+
+def test_verify_residues_detects_errors(fixtures: dict) -> None:
+    """Test wrong values and arguments without a checkpoint."""
+    wrong = golden.verify_factorial(12345, factorial_prime_swing(12345) + 1, fixtures)
+    assert not wrong.ok and len(wrong.errors) == len(fixtures["moduli"])
+    missing = golden.verify_fib(12, 144, fixtures)
+    assert not missing.ok
+    assert "no golden fib residues" in missing.errors[0]
+
+
+def test_verify_registered_implementations() -> None:
+    """Test verifying each kind of implementation by name."""
+    assert golden.verify("fib_fast_doubling", 10**5).ok
+    assert golden.verify("factorial_math", 10**4).ok
+    assert golden.verify("segmented_sieve", 10**6).ok
+    result = golden.verify("is_prime_optimized", 10**4)
+    assert result.ok and result.subject == "is_prime_optimized(10000)"
+
+
+def test_main(capsys: pytest.CaptureFixture, tmp_path) -> None:
+    """Test the verify and generate commands."""
+    assert golden.main(["verify", "factorial_math", "99991"]) == 0
+    assert "factorial_math(99991): ok" in capsys.readouterr().out
+    out = tmp_path / "golden.json"
+    args = ["generate", "--prime-limit", "1e5", "--segment", "10000", "--out", str(out)]
+    assert golden.main(args) == 0
+    assert golden.load(out)["primes"]["pi"]["10000"] == 1229
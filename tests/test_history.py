@@ -0,0 +1,140 @@
+"""
+Tests for the benchmark history store
+"""
+
+import json
+import random
+import sqlite3
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from algorithms import history
+
+
+def _report(commit: int, medians: Dict[str, float], seed: int = 0, cpu: str = "cpu") -> Dict:
+    """Build a report with noisy samples around the given medians at n=1000."""
+    rng = random.Random(seed)
+    results = []
+    for name, median in medians.items():
+        samples = [median * rng.uniform(0.98, 1.02) for _ in range(15)]
+        results.append(
+            {
+                "name": name,
+                "problem": "primes",
+                "n": 1000,
+                "loops": 1,
+                "median_ns": sorted(samples)[7],
+                "samples_ns": samples,
+            }
+        )
+    return {
+        "version": 1,
+        "environment": {"commit": _commit(commit), "dirty": False, "cpu": cpu, "cpus": 1},
+        "calibration_ns": 1000.0,
+        "results": results,
+    }
+
+
+def _commit(i: int) -> str:
+    return f"{i:04x}" + "f" * 36
+
+
+def _record_series(db: Path, medians: List[float], name: str = "segmented_sieve") -> None:
+    for i, median in enumerate(medians):
+        history.record(_report(i + 1, {name: median}, seed=i), db)
+
+
+def test_record_and_load(tmp_path: Path) -> None:
+    """Test that runs are appended and read back per machine in order."""
+    db = tmp_path / "history.sqlite"
+    _record_series(db, [100.0, 110.0, 120.0])
+    history.record(_report(9, {"segmented_sieve": 1.0}, cpu="other"), db)
+    runs = sqlite3.connect(db).execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    assert runs == 4
+
+    # The default machine is that of the last run
+    assert [len(p) for p in history.load(path=db).values()] == [1]
+    machine = history.fingerprint(_report(1, {})["environment"])
+    series = history.load(machine=machine, path=db)
+    points = series[("segmented_sieve", 1000)]
+    assert [p.commit for p in points] == [_commit(i)[:10] for i in (1, 2, 3)]
+    assert [round(p.median_ns, -1) for p in points] == [100.0, 110.0, 120.0]
+    assert len(points[0].samples) == 15
+
+
+def test_load_filters_and_orders_by_registry(tmp_path: Path) -> None:
+    """Test filtering by implementation and registry ordering."""
+    db = tmp_path / "history.sqlite"
+    history.record(_report(1, {"segmented_sieve": 1.0, "primes_up_to": 2.0}), db)
+    assert list(history.load(path=db)) == [("primes_up_to", 1000), ("segmented_sieve", 1000)]
+    assert list(history.load(names=["segmented_sieve"], path=db)) == [("segmented_sieve", 1000)]
+
+
+def test_newer_schema_rejected(tmp_path: Path) -> None:
+    """Test that a database from a newer version is not modified."""
+    db = tmp_path / "history.sqlite"
+    conn = sqlite3.connect(db)
+    conn.execute(f"PRAGMA user_version = {history.SCHEMA_VERSION + 1}")
+    conn.close()
+    with pytest.raises(ValueError, match="newer"):
+        history.connect(db)
+
+
+def test_changepoint_found_at_regressing_commit(tmp_path: Path) -> None:
+    """Test that a lasting slowdown is attributed to the commit that caused it."""
+    db = tmp_path / "history.sqlite"
+    _record_series(db, [100.0] * 5 + [140.0] * 4)
+    points = history.load(path=db)[("segmented_sieve", 1000)]
+    found = history.changepoints("segmented_sieve", 1000, points)
+    assert len(found) == 1
+    assert found[0].verdict == "regressed"
+    assert found[0].commit == _commit(6)[:10]
+    assert found[0].change == pytest.approx(0.4, abs=0.03)
+
+
+def test_changepoints_ignore_noise_and_single_spikes(tmp_path: Path) -> None:
+    """Test that small drifts and a one-run spike are not flagged."""
+    db = tmp_path / "history.sqlite"
+    _record_series(db, [100.0, 103.0, 98.0, 250.0, 101.0, 99.0, 102.0, 150.0])
+    points = history.load(path=db)[("segmented_sieve", 1000)]
+    assert history.changepoints("segmented_sieve", 1000, points) == []
+
+
+def test_changepoints_multiple_shifts(tmp_path: Path) -> None:
+    """Test that binary segmentation finds a regression and a later fix."""
+    db = tmp_path / "history.sqlite"
+    _record_series(db, [100.0] * 3 + [200.0] * 3 + [100.0] * 3)
+    found = history.find_changepoints(history.load(path=db))
+    assert [(c.index, c.verdict) for c in found] == [(3, "regressed"), (6, "improved")]
+
+
+def test_sparkline() -> None:
+    """Test the text sparkline scaling."""
+    assert history.sparkline([1, 10, 100]) == "▁▅█"
+    assert history.sparkline([5, 5]) == "▅▅"
+    assert history.sparkline([1, 100], history.ASCII_SPARK_CHARS) == "_^"
+
+
+def test_main_record_and_report(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Test the command line: record files, then print trends and an SVG."""
+    db = tmp_path / "history.sqlite"
+    files = []
+    for i, median in enumerate([100.0] * 3 + [150.0] * 3):
+        path = tmp_path / f"run{i}.json"
+        path.write_text(json.dumps(_report(i + 1, {"segmented_sieve": median}, seed=i)))
+        files.append(str(path))
+    assert history.main(["--db", str(db), "record", *files]) == 0
+    svg = tmp_path / "trends.svg"
+    assert history.main(["--db", str(db), "report", "--ascii", "--svg", str(svg)]) == 0
+    out = capsys.readouterr().out
+    assert "segmented_sieve" in out
+    assert f"regressed +49.8% at {_commit(4)[:10]}" in out
+    assert svg.read_text().startswith("<svg")
+    assert 'fill="#d62728"' in svg.read_text()
+
+
+def test_main_report_empty(tmp_path: Path) -> None:
+    """Test that reporting an empty database fails cleanly."""
+    assert history.main(["--db", str(tmp_path / "empty.sqlite"), "report"]) == 1
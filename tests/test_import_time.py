@@ -0,0 +1,106 @@
+"""
+Tests for the import-time budget of the package
+
+Every sandboxed run starts a fresh interpreter, so import cost is paid on
+each one. Budgets are in milliseconds of ``python -X importtime`` on the
+reference machine, scaled by the calibration factor, and each figure is
+the best of a few fresh interpreters. Being wall-clock checks, the
+budgets belong to the perf tier (``pytest -m perf``); the checks on what
+gets imported run by default.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that only some functions need, which importing a module must not pull in
+DEFERRED = ("numpy", "decimal", "fractions", "concurrent.futures", "multiprocessing")
+
+# Cumulative import time budgets, in milliseconds
+BUDGETS = [
+    ("algorithms", 5.0),
+    ("algorithms.primes", 30.0),
+    ("algorithms.fibonacci", 30.0),
+    ("algorithms.factorial", 40.0),
+]
+
+
+def _python(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60,
+    )
+
+
+def _import_ms(module: str, runs: int = 3) -> float:
+    """Best cumulative import time of module over fresh interpreters, in milliseconds."""
+    best = float("inf")
+    for _ in range(runs):
+        stderr = _python(f"import {module}", "-X", "importtime").stderr
+        for line in stderr.splitlines():
+            parts = [p.strip() for p in line.split("|")]
+            if len(parts) == 3 and parts[2] == module:
+                best = min(best, int(parts[1]) / 1000)
+    return best
+
+
+def _loaded(code: str) -> List[str]:
+    """Modules loaded by a fresh interpreter after running code."""
+    out: str = _python(f"import sys\n{code}\nprint(' '.join(sorted(sys.modules)))").stdout
+    return out.split()
+
+
+def test_package_import_loads_nothing() -> None:
+    """Test that importing the package imports none of its submodules."""
+    loaded = _loaded("import algorithms")
+    assert [m for m in loaded if m.startswith("algorithms")] == ["algorithms"]
+    assert "typing" not in set(loaded) - set(_loaded(""))
+
+
+def test_attributes_load_on_first_use() -> None:
+    """Test lazy access to submodules and registered implementations."""
+    loaded = _loaded("import algorithms\nassert algorithms.fib_fast_doubling(10) == 55")
+    assert {"algorithms.fibonacci", "algorithms.registry"} <= set(loaded)
+    assert "algorithms.factorial" not in loaded and "algorithms.bench" not in loaded
+
+
+def test_lazy_attributes_in_process() -> None:
+    """Test the attributes the package exposes and rejects."""
+    import algorithms
+    from algorithms import fibonacci, primes
+
+    assert algorithms.primes is primes
+    assert algorithms.fib_iterative is fibonacci.fib_iterative
+    assert "sieve_of_eratosthenes" in dir(algorithms) and "bench" in dir(algorithms)
+    with pytest.raises(AttributeError):
+        algorithms.no_such_thing
+    with pytest.raises(AttributeError):
+        algorithms._fib_pair_mod
+
+
+@pytest.mark.parametrize("module", [m for m, _ in BUDGETS[1:]])
+def test_optional_dependencies_deferred(module: str) -> None:
+    """Test that heavy optional modules wait for the functions that need them."""
+    baseline = set(_loaded(""))
+    loaded = set(_loaded(f"import {module}")) - baseline
+    for name in DEFERRED:
+        assert name not in loaded, f"importing {module} loads {name}"
+    assert "algorithms.bench" not in loaded
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("module, budget", BUDGETS, ids=[m for m, _ in BUDGETS])
+def test_import_time_budget(perf_factor: float, module: str, budget: float) -> None:
+    """Test that cold imports stay within their budgets."""
+    elapsed = _import_ms(module)
+    limit = budget * max(1.0, perf_factor)
+    assert elapsed <= limit, f"import {module} took {elapsed:.1f} ms, budget {limit:.1f} ms"
@@ -0,0 +1,157 @@
+"""
+Tests for the opt-in instrumentation layer
+"""
+
+import inspect
+import json
+import math
+import re
+import sys
+import threading
+from typing import Iterator
+
+import pytest
+
+from algorithms import bench, factorial, fibonacci, instrument, registry
+
+
+@pytest.fixture(autouse=True)
+def clean() -> Iterator[None]:
+    """Leave every implementation unwrapped and every counter at zero."""
+    instrument.disable()
+    instrument.reset()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def test_disable_restores_original_objects() -> None:
+    """Test that disable() leaves no wrapper behind."""
+    originals = {impl.name: impl.resolve() for impl in registry.implementations()}
+    instrument.enable()
+    assert instrument.enabled()
+    assert fibonacci.fib_iterative is not originals["fib_iterative"]
+    assert inspect.unwrap(fibonacci.fib_iterative) is originals["fib_iterative"]
+    instrument.disable()
+    assert not instrument.enabled()
+    for impl in registry.implementations():
+        assert impl.resolve() is originals[impl.name]
+
+
+def test_enable_selected_names() -> None:
+    """Test that only the named implementations are wrapped and unwrapped."""
+    instrument.enable(["fib_iterative", "fib_fast_doubling"])
+    assert instrument.enabled("fib_iterative")
+    assert not instrument.enabled("fib_memoized")
+    instrument.disable(["fib_iterative"])
+    assert not instrument.enabled("fib_iterative")
+    assert instrument.enabled("fib_fast_doubling")
+
+
+def test_counts_calls_through_resolve() -> None:
+    """Test call counts and durations of calls made through the registry."""
+    instrument.enable(["fib_iterative"])
+    func = registry.get("fib_iterative").resolve()
+    assert [func(n) for n in range(10)] == [0, 1, 1, 2, 3, 5, 8, 13, 21, 34]
+    stats = instrument.snapshot()["fib_iterative"]
+    assert stats["calls"] == 10
+    assert stats["errors"] == 0
+    assert stats["total_ns"] > 0
+    assert sum(stats["buckets"].values()) == 10
+    assert 0 < stats["p50_ns"] <= stats["p99_ns"]
+
+
+def test_enable_covers_recursive_implementations() -> None:
+    """Test that enable() also wraps implementations that call themselves."""
+    instrument.enable()
+    assert all(instrument.enabled(impl.name) for impl in registry.implementations())
+    for name in ("fib_recursive", "fib_memoized"):
+        assert getattr(fibonacci, name)(20) == 6765
+    for name in ("factorial_recursive", "factorial_tail_recursive", "factorial_memoized"):
+        assert getattr(factorial, name)(10) == 3628800
+    stats = instrument.snapshot()
+    assert {name: s["calls"] for name, s in stats.items()} == {
+        "fib_recursive": 1,
+        "fib_memoized": 1,
+        "factorial_recursive": 1,
+        "factorial_tail_recursive": 1,
+        "factorial_memoized": 1,
+    }
+
+
+def test_recursion_bypasses_wrapper() -> None:
+    """Test that inner recursive calls do not go through the wrapper."""
+    original = factorial.factorial_recursive
+    # A wrapper frame per level would double the depth past the recursion limit
+    n = sys.getrecursionlimit() - 200
+    instrument.enable(["factorial_recursive"])
+    assert factorial.factorial_recursive(n) == math.factorial(n)
+    assert instrument.snapshot()["factorial_recursive"]["calls"] == 1
+    assert original.__globals__["factorial_recursive"] is factorial.factorial_recursive
+    instrument.disable()
+    assert factorial.factorial_recursive is original
+
+
+def test_errors_counted_and_raised() -> None:
+    """Test that an exception is counted and propagated."""
+    instrument.enable(["fib_iterative"])
+    with pytest.raises(ValueError):
+        fibonacci.fib_iterative(-1)
+    stats = instrument.snapshot()["fib_iterative"]
+    assert (stats["calls"], stats["errors"]) == (1, 1)
+
+
+def test_cache_methods_forwarded() -> None:
+    """Test that memoized implementations keep cache_clear and cache_info."""
+    instrument.enable(["fib_memoized"])
+    fibonacci.fib_memoized.cache_clear()
+    fibonacci.fib_memoized(50)
+    assert fibonacci.fib_memoized.cache_info().currsize == 51
+    assert instrument.snapshot()["fib_memoized"]["calls"] == 1
+
+
+def test_threads_counted_without_loss() -> None:
+    """Test that concurrent calls from several threads all get counted."""
+    instrument.enable(["fib_iterative"])
+
+    def work() -> None:
+        for _ in range(2000):
+            fibonacci.fib_iterative(20)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert instrument.snapshot()["fib_iterative"]["calls"] == 8000
+
+
+def test_exporters() -> None:
+    """Test the JSON snapshot and the Prometheus exposition text."""
+    instrument.enable(["fib_iterative"])
+    for n in range(5):
+        fibonacci.fib_iterative(n)
+    assert json.loads(instrument.to_json()) == instrument.snapshot()
+
+    text = instrument.to_prometheus()
+    labels = 'implementation="fib_iterative",problem="fib"'
+    assert "# TYPE algorithms_calls_total counter" in text
+    assert "# TYPE algorithms_call_duration_seconds histogram" in text
+    assert f"algorithms_calls_total{{{labels}}} 5" in text
+    assert f'algorithms_call_duration_seconds_bucket{{{labels},le="+Inf"}} 5' in text
+    counts = [int(c) for c in re.findall(r"_bucket\{[^}]*\} (\d+)", text)]
+    assert counts == sorted(counts) and counts[-1] == 5
+    assert "fib_memoized" not in text
+
+
+def test_instrumentation_overhead() -> None:
+    """Test that the benchmark measures all three states and restores the original."""
+    original = fibonacci.fib_iterative
+    [result] = bench.instrumentation_overhead(
+        ["fib"], names=["fib_iterative"], min_time=0.01, min_repeat=3
+    )
+    assert result.n == 10
+    assert min(result.plain, result.enabled, result.disabled) > 0
+    assert fibonacci.fib_iterative is original
+    data = bench.report([], overhead=[result])["instrumentation"][0]
+    assert data["enabled_overhead_ns"] == result.enabled - result.plain
@@ -0,0 +1,123 @@
+"""
+Tests for large integer output helpers
+"""
+
+import io
+import socket
+import sys
+
+import pytest
+
+from algorithms.factorial import factorial_math
+from algorithms.output import (
+    _to_decimal_pure,
+    format_int,
+    from_bytes,
+    iter_decimal,
+    summarize_int,
+    to_base64,
+    to_bytes,
+    to_decimal,
+    write_int,
+)
+
+
+@pytest.fixture
+def unlimited_str_digits():
+    """Lift the int to str digit limit so reference strings can be built."""
+    previous = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    yield
+    sys.set_int_max_str_digits(previous)
+
+
+LARGE_VALUES = [
+    0,
+    7,
+    -42,
+    10**5000,
+    10**5000 - 1,
+    -(3**20000),
+    factorial_math(12000),
+]
+# str() of the larger values would exceed the digit limit, so name ids by size
+LARGE_IDS = [f"{v.bit_length()}bits{'_neg' if v < 0 else ''}" for v in LARGE_VALUES]
+
+
+@pytest.mark.parametrize("n", LARGE_VALUES, ids=LARGE_IDS)
+def test_to_decimal_matches_str(n: int, unlimited_str_digits: None) -> None:
+    """Test decimal conversion against str() with the digit limit lifted."""
+    assert to_decimal(n) == str(n)
+
+
+@pytest.mark.parametrize(
+    "n",
+    [v for v in LARGE_VALUES if v >= 0],
+    ids=[i for v, i in zip(LARGE_VALUES, LARGE_IDS) if v >= 0],
+)
+def test_pure_decimal_fallback(n: int, unlimited_str_digits: None) -> None:
+    """Test the powers-of-ten fallback used without the C decimal module."""
+    assert _to_decimal_pure(n) == str(n)
+
+
+def test_to_decimal_beyond_str_limit() -> None:
+    """Test that conversion works for values str() refuses to convert."""
+    value = 10**10000
+    with pytest.raises(ValueError):
+        str(value)
+    assert to_decimal(value) == "1" + "0" * 10000
+
+
+@pytest.mark.parametrize("n", LARGE_VALUES, ids=LARGE_IDS)
+def test_binary_round_trip(n: int) -> None:
+    """Test raw bytes and base64 round trips."""
+    assert from_bytes(to_bytes(n)) == n
+    assert to_base64(n).isascii()
+
+
+def test_format_int() -> None:
+    """Test the supported text formats."""
+    assert format_int(255) == "255"
+    assert format_int(255, "hex") == "0xff"
+    assert format_int(255, "binary") == "00ff"
+    assert format_int(255, "base64") == "AP8="
+    with pytest.raises(ValueError, match="Unknown format"):
+        format_int(1, "octal")
+
+
+def test_summarize_int() -> None:
+    """Test the abbreviated preview of large values."""
+    assert summarize_int(12345) == "12345"
+    summary = summarize_int(10**100, edge_digits=5)
+    assert summary == "10000...00000 (101 digits)"
+
+
+def test_iter_decimal_chunks() -> None:
+    """Test that chunks reassemble into the full decimal string."""
+    value = factorial_math(3000)
+    chunks = list(iter_decimal(value, chunk_size=1000))
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert "".join(chunks) == to_decimal(value)
+
+
+def test_write_int_text_and_binary_streams() -> None:
+    """Test streaming to text and binary file objects."""
+    value = factorial_math(3000)
+    text = io.StringIO()
+    assert write_int(value, text, chunk_size=512) == len(to_decimal(value))
+    assert text.getvalue() == to_decimal(value)
+
+    binary = io.BytesIO()
+    write_int(value, binary, fmt="binary", chunk_size=512)
+    assert from_bytes(binary.getvalue()) == value
+
+    with pytest.raises(ValueError, match="binary stream"):
+        write_int(value, io.StringIO(), fmt="binary")
+
+
+def test_write_int_socket() -> None:
+    """Test streaming to a socket via sendall()."""
+    left, right = socket.socketpair()
+    with left, right:
+        write_int(2**64, left, fmt="hex")
+        assert right.recv(64) == b"0x10000000000000000"
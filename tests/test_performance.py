@@ -0,0 +1,47 @@
+"""
+Performance tier: production sizes against time and memory budgets
+
+Deselected by default; run with ``pytest -m perf``. Budgets are about three
+times the reference machine's measurements, so a failure means a real
+slowdown rather than noise. See conftest.py for how they are scaled.
+"""
+
+import pytest
+
+from tests.conftest import Budget
+
+pytestmark = pytest.mark.perf
+
+KiB = 1 << 10
+MiB = 1 << 20
+
+# (implementation, n, time budget in seconds, peak memory budget in bytes)
+CASES = [
+    ("sieve_of_eratosthenes", 10**7, 3.0, 160 * MiB),
+    ("segmented_sieve", 10**7, 6.0, 48 * MiB),
+    ("fib_iterative", 10**5, 0.3, 256 * KiB),
+    ("fib_fast_doubling", 10**5, 0.005, 256 * KiB),
+    ("factorial_iterative", 10**4, 0.05, 256 * KiB),
+    ("factorial_product_tree", 10**4, 0.015, 512 * KiB),
+    ("factorial_prime_swing", 10**4, 0.01, 512 * KiB),
+    ("factorial_math", 10**4, 0.008, 512 * KiB),
+    ("is_prime_optimized", 10**12 + 39, 0.08, 16 * KiB),
+    ("is_prime_miller_rabin", 10**18 + 3, 0.0005, 16 * KiB),
+]
+IDS = [f"{name}-{n}" for name, n, _, _ in CASES]
+
+# Tracing millions of small allocations is slower than the call by 30x or
+# more, so these are measured by the RSS growth of a fresh process instead
+RSS_MEASURED = {"sieve_of_eratosthenes", "segmented_sieve"}
+
+
+@pytest.mark.parametrize("name, n, seconds, _", CASES, ids=IDS)
+def test_time_budget(budget: Budget, name: str, n: int, seconds: float, _: int) -> None:
+    """Test that the median call stays within its time budget."""
+    assert budget.time(name, n, seconds) <= 1
+
+
+@pytest.mark.parametrize("name, n, _, limit", CASES, ids=IDS)
+def test_memory_budget(budget: Budget, name: str, n: int, _: float, limit: int) -> None:
+    """Test that peak memory stays within its budget."""
+    assert budget.memory(name, n, limit, rss=name in RSS_MEASURED) <= 1
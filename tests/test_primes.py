@@ -8,6 +8,7 @@ from typing import Callable, List
 from algorithms.primes import (
     is_prime_naive,
     is_prime_optimized,
+    is_prime_miller_rabin,
     primes_up_to,
     sieve_of_eratosthenes,
     segmented_sieve,
@@ -91,6 +92,17 @@ def test_is_prime_optimized(n: int, expected: bool) -> None:
     assert is_prime_optimized(n) == expected
 
 
+def test_is_prime_miller_rabin() -> None:
+    """Test Miller-Rabin against trial division and on hard composites."""
+    for n in range(-10, 20000):
+        assert is_prime_miller_rabin(n) == is_prime_optimized(n)
+    # Strong pseudoprimes to the first few bases, and Carmichael numbers
+    for n in [2047, 1373653, 25326001, 3215031751, 561, 41041, 3825123056546413051]:
+        assert is_prime_miller_rabin(n) is False
+    for n in [2**31 - 1, 2**61 - 1, 2**89 - 1, 1_000_000_007]:
+        assert is_prime_miller_rabin(n) is True
+
+
 def test_primes_up_to() -> None:
     """Test generation of primes up to a limit using trial division."""
     assert primes_up_to(100) == PRIMES_UNDER_100
@@ -0,0 +1,116 @@
+"""
+Tests for the shared profiling mode
+"""
+
+import pstats
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from algorithms import profiling
+from algorithms.primes import sieve_of_eratosthenes
+
+
+def _busy(seconds: float) -> None:
+    """Burn CPU for about the given time."""
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        sieve_of_eratosthenes(2000)
+
+
+def test_no_mode_is_a_no_op(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that nothing is profiled or written without a mode."""
+    monkeypatch.delenv(profiling.PROFILE_ENV, raising=False)
+    monkeypatch.chdir(tmp_path)
+    with profiling.from_argv("quiet", ["--keep", "x"]) as argv:
+        assert argv == ["--keep", "x"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cprofile_writes_pstats(tmp_path: Path) -> None:
+    """Test that cprofile mode writes a loadable pstats file."""
+    output = tmp_path / "run.pstats"
+    argv = ["--problem", "fib", "--profile", "cprofile", "--profile-output", str(output)]
+    with profiling.from_argv("run", argv) as rest:
+        assert rest == ["--problem", "fib"]
+        sieve_of_eratosthenes(1000)
+    stats = pstats.Stats(str(output))
+    assert "sieve_of_eratosthenes" in stats.get_stats_profile().func_profiles
+
+
+def test_profile_written_on_exit(tmp_path: Path) -> None:
+    """Test that the profile is written when the body calls sys.exit()."""
+    output = tmp_path / "exit.pstats"
+    with pytest.raises(SystemExit):
+        with profiling.profiled("exit", "cprofile", str(output)):
+            sys.exit(3)
+    assert output.stat().st_size > 0
+
+
+def test_sampling_collapsed_stacks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that sample mode, chosen by the environment, writes collapsed stacks."""
+    output = tmp_path / "run.collapsed"
+    monkeypatch.setenv(profiling.PROFILE_ENV, "sample")
+    monkeypatch.setenv(profiling.OUTPUT_ENV, str(output))
+    monkeypatch.setenv(profiling.INTERVAL_ENV, "0.001")
+    with profiling.from_argv("run", []):
+        _busy(0.2)
+    lines = output.read_text().splitlines()
+    assert lines
+    total = 0
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        total += int(count)
+        assert ";" in stack
+    assert total >= 20
+    assert any("_busy (test_profiling.py:" in line for line in lines)
+    assert any("sieve_of_eratosthenes (primes.py:" in line for line in lines)
+
+
+def test_sampler_restores_handler() -> None:
+    """Test that stopping the sampler puts the previous signal handler back."""
+    before = signal.getsignal(signal.SIGPROF)
+    sampler = profiling.Sampler(0.001)
+    sampler.start()
+    _busy(0.05)
+    sampler.stop()
+    assert signal.getsignal(signal.SIGPROF) is before
+    assert sampler.samples > 0
+
+
+def test_invalid_settings() -> None:
+    """Test that unknown modes and bad intervals are rejected."""
+    with pytest.raises(ValueError):
+        with profiling.profiled("bad", "perf"):
+            pass
+    with pytest.raises(ValueError):
+        profiling.Sampler(0)
+
+
+def test_entry_point_profile_option(tmp_path: Path) -> None:
+    """Test --profile on a module entry point, outside its own options."""
+    output = tmp_path / "differential.pstats"
+    command = [
+        sys.executable,
+        "-m",
+        "algorithms.differential",
+        "--problem",
+        "fib",
+        "--max-n",
+        "50",
+        "--workers",
+        "1",
+        "--profile",
+        "cprofile",
+        "--profile-output",
+        str(output),
+    ]
+    root = Path(__file__).resolve().parent.parent
+    done = subprocess.run(command, cwd=root, capture_output=True, text=True, timeout=120)
+    assert done.returncode == 0, done.stderr
+    assert f"Profile written to {output}" in done.stderr
+    assert pstats.Stats(str(output)).get_stats_profile().func_profiles
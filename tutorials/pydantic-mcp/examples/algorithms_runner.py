@@ -23,9 +23,13 @@ def run_local_algorithm(algorithm_name, function_name, *args):
 import sys
 sys.path.append('.')
 from algorithms.{algorithm_name} import {function_name}
+from algorithms.output import to_decimal
 
 # Run the algorithm
 result = {function_name}({args_str})
+if isinstance(result, int) and not isinstance(result, bool):
+    # Huge ints exceed str()'s digit limit; return the text form instead
+    result = to_decimal(result)
 print(f"Result of {function_name}({args_str}) = {{result}}")
 
 # Return the result